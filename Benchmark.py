@@ -0,0 +1,296 @@
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import time
+from constants.enums import ExitCodes
+from solvers.ComputerSolver import ComputerSolver
+from solvers.Solver import np
+from utils.GameMetrics import GameMetrics
+from utils.PartitionScorer import PartitionScorer
+from utils.Validator import Validator
+
+
+class Benchmark:
+    """Times both algorithms, with and without multiple processes, over a grid of code lengths and numbers of colours,
+    so the ranges in ComputerSolver can be checked and regressions can be found by comparing against a saved baseline.
+
+    Format of arguments:
+    python Benchmark.py OutputFile [--baseline BaselineFile] [--grid CodeLength:NumberOfColours,...] [--secrets NumberOfSecrets]
+                        [--seed Seed] [--tolerance Tolerance] [--scorers PartitionScorer,...]
+
+    Each configuration (algorithm, code length, number of colours, use_multiple_processes and the PartitionScorer of
+    Donald Knuth's algorithm) is run in a new process so its peak memory can be measured. Every configuration of a grid
+    point plays the same sampled secrets. Only the minimax scorer is run unless --scorers is given.
+
+    The OutputFile is JSON with the host, the settings and a result for every configuration containing:
+    total_time -- the seconds taken to solve every secret
+    guess_times -- the mean seconds taken by each guess number (the first guess, the second guess, ...)
+    max_guess_time -- the most seconds taken by a single guess
+    guesses -- the number of secrets solved in each number of guesses
+    mean_guesses, max_guesses -- the mean and most guesses taken to solve a secret
+    peg_evaluations -- the number of times the pegs of a guess and a code were found, or None when multiple processes
+                       are used (the evaluations of worker processes are not counted)
+    peak_memory_kb -- the peak resident memory of the process (and its worker processes) in kilobytes, or None if it cannot be
+                      measured on this platform (see GameMetrics.get_peak_memory_kb)
+    """
+
+    # Donald Knuth's algorithm is only run for grid points with at most this many codes, since it is too slow for more
+    MAX_KNUTH_CODES = 15625
+
+    DEFAULT_GRID = [(3, 4), (3, 6), (4, 4), (4, 6), (5, 5), (5, 6), (6, 6), (5, 8), (7, 7)]
+    DEFAULT_SECRETS = 10
+    DEFAULT_SEED = 0
+    DEFAULT_TOLERANCE = 0.2  # the fraction a time or memory can increase by before it is reported as a regression
+    MIN_TIME_CHANGE = 0.01  # the seconds a time must increase by before it is reported, since shorter times are mostly noise
+
+    def __init__(self) -> None:
+        if len(sys.argv) == 3 and sys.argv[1] == "--configuration":
+            self.run_configuration(json.loads(sys.argv[2]))
+            sys.exit(ExitCodes.SUCCESS.value)
+
+        self.process_args()
+        self.run()
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        args = sys.argv[1:]
+        if len(args) == 0 or len(args) % 2 == 0:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        self.output_file_name = args[0]
+        options = dict(zip(args[1::2], args[2::2]))
+
+        self.baseline_file_name = options.pop("--baseline", None)
+        try:
+            self.grid = self.parse_grid(options.pop("--grid")) if "--grid" in options else self.DEFAULT_GRID
+            self.num_of_secrets = int(options.pop("--secrets", self.DEFAULT_SECRETS))
+            self.seed = int(options.pop("--seed", self.DEFAULT_SEED))
+            self.tolerance = float(options.pop("--tolerance", self.DEFAULT_TOLERANCE))
+        except ValueError:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        self.partition_scorers = options.pop("--scorers", "minimax").split(",")
+
+        if len(options) > 0 or self.num_of_secrets < 1 or not all(name in PartitionScorer.NAMES for name in self.partition_scorers):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+    @staticmethod
+    def parse_grid(grid: str) -> list[tuple[int, int]]:
+        """Return the (code_length, num_of_colours) of every grid point in a string such as "3:4,4:6"
+
+        Parameters:
+        grid -- the grid points, separated by commas
+        """
+
+        validator = Validator()
+
+        points = []
+        for point in grid.split(","):
+            (code_length, num_of_colours) = point.split(":")
+            if not validator.is_positive_integer(code_length) or not validator.is_positive_integer(num_of_colours):
+                raise ValueError(point)
+            points.append((int(code_length), int(num_of_colours)))
+
+        return points
+
+    def get_configurations(self) -> list[dict]:
+        """Return every configuration of the grid, each with the secrets it should solve"""
+
+        rng = random.Random(self.seed)
+
+        configurations = []
+        for (code_length, num_of_colours) in self.grid:
+            secrets = [[rng.randrange(num_of_colours) for _ in range(code_length)] for _ in range(self.num_of_secrets)]
+
+            for algorithm in ComputerSolver.ALGORITHMS:
+                if algorithm == "DonaldKnuth" and pow(num_of_colours, code_length) > self.MAX_KNUTH_CODES:
+                    continue
+
+                for partition_scorer in (self.partition_scorers if algorithm == "DonaldKnuth" else ["minimax"]):
+                    for use_multiple_processes in (False, True):
+                        configuration = {
+                            "algorithm": algorithm,
+                            "code_length": code_length,
+                            "num_of_colours": num_of_colours,
+                            "use_multiple_processes": use_multiple_processes,
+                            "secrets": secrets
+                        }
+                        if partition_scorer != "minimax":
+                            configuration["partition_scorer"] = partition_scorer
+
+                        configurations.append(configuration)
+
+        return configurations
+
+    def run(self) -> None:
+        """Run every configuration in a new process, write the results to the output file and compare them to the baseline"""
+
+        results = []
+        for configuration in self.get_configurations():
+            result = self.run_configuration_in_process(configuration)
+            results.append(result)
+
+            print(f"{self.get_name(result)}: {result['total_time']:.3f}s, {result['mean_guesses']:.2f} guesses", flush=True)
+
+        report = {
+            "host": {
+                "cpu_count": multiprocessing.cpu_count(),
+                "python": platform.python_version(),
+                "numpy": np.__version__ if np is not None else None,
+                "platform": platform.platform()
+            },
+            "settings": {"grid": self.grid, "secrets": self.num_of_secrets, "seed": self.seed},
+            "results": results
+        }
+
+        try:
+            with open(self.output_file_name, "w") as file:
+                json.dump(report, file, indent=2)
+        except OSError:
+            sys.exit(ExitCodes.OUTPUT_FILE_ERROR.value)
+
+        if self.baseline_file_name is not None:
+            self.compare(results)
+
+    def compare(self, results: list[dict]) -> None:
+        """Print how every result differs from the result of the same configuration in the baseline
+
+        Parameters:
+        results -- the results of this run
+        """
+
+        try:
+            with open(self.baseline_file_name, "r") as file:
+                baseline = {self.get_name(result): result for result in json.load(file)["results"]}
+        except (OSError, ValueError, KeyError):
+            sys.exit(ExitCodes.INPUT_FILE_ERROR.value)
+
+        num_of_regressions = 0
+        for result in results:
+            name = self.get_name(result)
+            if name not in baseline:
+                print(f"{name}: not in baseline")
+                continue
+
+            changes = []
+            for key in ("total_time", "max_guess_time", "peak_memory_kb", "peg_evaluations", "mean_guesses"):
+                (old, new) = (baseline[name].get(key), result[key])
+                if old is None or new is None or old == new:
+                    continue
+
+                if key in ("total_time", "max_guess_time") and new - old < self.MIN_TIME_CHANGE:
+                    continue
+
+                change = (new - old) / old if old != 0 else float("inf")
+                # times and memory vary between runs, but peg evaluations and guesses should not change at all
+                if change > (self.tolerance if key in ("total_time", "max_guess_time", "peak_memory_kb") else 0):
+                    changes.append(f"{key} {old} -> {new} ({change:+.0%})")
+
+            if len(changes) > 0:
+                num_of_regressions += 1
+                print(f"REGRESSION {name}: " + ", ".join(changes))
+
+        print(f"{num_of_regressions} of {len(results)} configurations regressed")
+
+    @staticmethod
+    def get_name(result: dict) -> str:
+        """Return the name of the configuration of a result, e.g. DonaldKnuth-4-6-multiple or DonaldKnuth-4-6-single-entropy"""
+
+        processes = "multiple" if result["use_multiple_processes"] else "single"
+        name = f"{result['algorithm']}-{result['code_length']}-{result['num_of_colours']}-{processes}"
+
+        if "partition_scorer" in result:
+            name += f"-{result['partition_scorer']}"
+
+        return name
+
+    @staticmethod
+    def run_configuration_in_process(configuration: dict) -> dict:
+        """Run a configuration in a new process (see run_configuration) and return its result
+
+        Parameters:
+        configuration -- a configuration returned by get_configurations
+        """
+
+        process = subprocess.run(
+            [sys.executable, __file__, "--configuration", json.dumps(configuration)],
+            stdout=subprocess.PIPE,
+            check=True
+        )
+
+        return json.loads(process.stdout)
+
+    def run_configuration(self, configuration: dict) -> None:
+        """Solve every secret of a configuration and print its result as JSON
+
+        Parameters:
+        configuration -- a configuration returned by get_configurations
+        """
+
+        algorithm_class = ComputerSolver.ALGORITHMS[configuration["algorithm"]]
+        use_multiple_processes = configuration["use_multiple_processes"]
+        options = {"partition_scorer": configuration["partition_scorer"]} if "partition_scorer" in configuration else {}
+
+        total_time = 0
+        guess_times = []  # the total time taken by each guess number
+        guess_counts = []  # the number of secrets which needed each guess number
+        max_guess_time = 0
+        guesses = {}
+        peg_evaluations = 0
+
+        for secret in configuration["secrets"]:
+            start = time.perf_counter()
+            algorithm = algorithm_class(tuple(secret), configuration["num_of_colours"], use_multiple_processes, **options)
+            total_time += time.perf_counter() - start
+
+            counter = GameMetrics.count_peg_evaluations(algorithm)
+
+            while True:
+                guess_num = algorithm.inc_guess_num()
+
+                start = time.perf_counter()
+                (black_pegs, _) = algorithm.get_next_guess()
+                guess_time = time.perf_counter() - start
+
+                if guess_num > len(guess_times):
+                    guess_times.append(0)
+                    guess_counts.append(0)
+                guess_times[guess_num - 1] += guess_time
+                guess_counts[guess_num - 1] += 1
+                max_guess_time = max(max_guess_time, guess_time)
+                total_time += guess_time
+
+                if black_pegs == len(secret):
+                    break
+
+            guesses[guess_num] = guesses.get(guess_num, 0) + 1
+            peg_evaluations += counter[0]
+
+        num_of_secrets = len(configuration["secrets"])
+        peak_memory_kb = GameMetrics.get_peak_memory_kb()
+
+        keys = ("algorithm", "code_length", "num_of_colours", "use_multiple_processes", "partition_scorer")
+        result = {key: configuration[key] for key in keys if key in configuration}
+        result.update({
+            "num_of_secrets": num_of_secrets,
+            "total_time": total_time,
+            "guess_times": [guess_time / count for guess_time, count in zip(guess_times, guess_counts)],
+            "max_guess_time": max_guess_time,
+            "guesses": guesses,
+            "mean_guesses": sum(num * count for num, count in guesses.items()) / num_of_secrets,
+            "max_guesses": max(guesses),
+            "peg_evaluations": None if use_multiple_processes else peg_evaluations,
+            "peak_memory_kb": peak_memory_kb
+        })
+
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    Benchmark()
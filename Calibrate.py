@@ -0,0 +1,102 @@
+import multiprocessing
+import random
+import sys
+from Benchmark import Benchmark
+from constants.enums import ExitCodes
+from solvers.ComputerSolver import ComputerSolver
+from utils.SelectionProfile import SelectionProfile
+
+
+class Calibrate:
+    """Times every algorithm, with and without multiple processes, on this machine and writes a SelectionProfile
+    which ComputerSolver uses to pick an algorithm instead of its default ranges.
+
+    Format of arguments:
+    python Calibrate.py [--output ProfileFile] [--latency-target Seconds] [--grid CodeLength:NumberOfColours,...]
+                        [--secrets NumberOfSecrets] [--seed Seed]
+
+    The default ProfileFile is ComputerSolver.SELECTION_PROFILE. Games with more codes than the largest grid point
+    still use the default ranges. The profile is ignored if the number of CPU cores changes, so it must be calibrated again.
+    """
+
+    DEFAULT_LATENCY_TARGET = 1.0
+    DEFAULT_GRID = [(2, 4), (3, 4), (3, 6), (4, 4), (4, 6), (5, 5), (4, 8), (5, 6), (6, 6), (5, 8), (6, 7), (7, 7)]
+    DEFAULT_SECRETS = 5
+    DEFAULT_SEED = 0
+
+    # an algorithm is not timed for any larger grid points once a game takes this many times the latency target,
+    # since it only gets slower as the number of codes increases
+    MAX_TIME_FACTOR = 10
+
+    def __init__(self) -> None:
+        self.process_args()
+        self.calibrate()
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        args = sys.argv[1:]
+        if len(args) % 2 == 1:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        options = dict(zip(args[::2], args[1::2]))
+
+        self.output_file_name = options.pop("--output", ComputerSolver.SELECTION_PROFILE)
+        try:
+            self.latency_target = float(options.pop("--latency-target", self.DEFAULT_LATENCY_TARGET))
+            self.grid = Benchmark.parse_grid(options.pop("--grid")) if "--grid" in options else self.DEFAULT_GRID
+            self.num_of_secrets = int(options.pop("--secrets", self.DEFAULT_SECRETS))
+            self.seed = int(options.pop("--seed", self.DEFAULT_SEED))
+        except ValueError:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        if len(options) > 0 or self.num_of_secrets < 1 or self.latency_target <= 0:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+    def calibrate(self) -> None:
+        """Time every algorithm for every grid point, from the fewest codes to the most, and write the profile"""
+
+        rng = random.Random(self.seed)
+        grid = sorted(self.grid, key=lambda point: pow(point[1], point[0]))
+
+        candidates = [(algorithm, use_multiple_processes) for algorithm in ComputerSolver.ALGORITHMS for use_multiple_processes in (False, True)]
+        measurements = []
+
+        for (code_length, num_of_colours) in grid:
+            secrets = [[rng.randrange(num_of_colours) for _ in range(code_length)] for _ in range(self.num_of_secrets)]
+
+            for (algorithm, use_multiple_processes) in list(candidates):
+                result = Benchmark.run_configuration_in_process({
+                    "algorithm": algorithm,
+                    "code_length": code_length,
+                    "num_of_colours": num_of_colours,
+                    "use_multiple_processes": use_multiple_processes,
+                    "secrets": secrets
+                })
+
+                mean_time = result["total_time"] / result["num_of_secrets"]
+                measurements.append({
+                    "code_length": code_length,
+                    "num_of_colours": num_of_colours,
+                    "algorithm": algorithm,
+                    "use_multiple_processes": use_multiple_processes,
+                    "mean_time": mean_time,
+                    "mean_guesses": result["mean_guesses"]
+                })
+
+                print(f"{Benchmark.get_name(result)}: {mean_time:.3f}s per game, {result['mean_guesses']:.2f} guesses", flush=True)
+
+                if mean_time > self.MAX_TIME_FACTOR * self.latency_target:
+                    candidates.remove((algorithm, use_multiple_processes))
+
+        profile = SelectionProfile(self.output_file_name, multiprocessing.cpu_count(), self.latency_target, measurements)
+        try:
+            profile.save()
+        except OSError:
+            sys.exit(ExitCodes.OUTPUT_FILE_ERROR.value)
+
+
+if __name__ == '__main__':
+    Calibrate()
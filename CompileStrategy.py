@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from constants.enums import ExitCodes
+from solvers.ComputerSolver import ComputerSolver
+from utils.StrategyTreeFile import StrategyTreeFile
+from utils.Validator import Validator
+
+
+class CompileStrategy:
+    """Compiles the strategy tree of Donald Knuth's algorithm for a code length and number of colours,
+    so ComputerSolver can look up every guess instead of searching for it.
+
+    Format of arguments:
+    python CompileStrategy.py CodeLength NumberOfColours [OutputFile]
+
+    The default OutputFile is the file ComputerSolver uses automatically (see ComputerSolver.get_strategy_file_name).
+    """
+
+    def __init__(self) -> None:
+        self.validator = Validator()
+
+        self.process_args()
+        self.compile()
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        num_of_args = len(sys.argv)
+        if num_of_args < 3 or not self.validator.is_positive_integer(sys.argv[1]) or not self.validator.is_positive_integer(sys.argv[2]):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        self.code_length = int(sys.argv[1])
+        self.num_of_colours = int(sys.argv[2])
+
+        if num_of_args > 3:
+            self.output_file_name = sys.argv[3]
+        else:
+            self.output_file_name = ComputerSolver.get_strategy_file_name(self.code_length, self.num_of_colours)
+            os.makedirs(ComputerSolver.STRATEGY_DIRECTORY, exist_ok=True)
+
+    def compile(self) -> None:
+        """Compile the strategy tree and write it to the output file"""
+
+        start = time.perf_counter()
+
+        # the answer code is not used when compiling
+        use_multiple_processes = pow(self.num_of_colours, self.code_length) > 1296
+        algorithm = DonaldKnuthAlgorithm(tuple([0] * self.code_length), self.num_of_colours, use_multiple_processes)
+
+        try:
+            num_of_nodes = StrategyTreeFile.compile(algorithm, self.output_file_name)
+        except OSError:
+            sys.exit(ExitCodes.OUTPUT_FILE_ERROR.value)
+
+        print(f"Compiled {num_of_nodes} nodes to {self.output_file_name} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    CompileStrategy()
@@ -0,0 +1,113 @@
+import json
+import multiprocessing
+import sys
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from algorithms.Hybrid import HybridAlgorithm
+from algorithms.StrategyTree import StrategyTreeAlgorithm
+from constants.enums import ExitCodes
+from solvers.ComputerSolver import ComputerSolver
+from utils.PartitionScorer import PartitionScorer
+from utils.StrategyEvaluator import StrategyEvaluator
+from utils.Validator import Validator
+
+
+class Evaluate:
+    """Plays every possible answer code for a code length and number of colours with one algorithm (see StrategyEvaluator)
+    and prints the mean and most guesses, the number of answer codes solved in each number of guesses and the time taken.
+
+    Format of arguments:
+    python Evaluate.py CodeLength NumberOfColours [--algorithm Algorithm] [--scorer PartitionScorer] [--strategy StrategyFile]
+                       [--max-guesses MaximumGuesses] [--processes NumberOfProcesses] [--output OutputFile]
+
+    Algorithm -- DonaldKnuth, Swaszek, SampledMinimax or Hybrid (default: DonaldKnuth)
+    PartitionScorer -- the name of the PartitionScorer Donald Knuth's algorithm (or the sampled or hybrid algorithm) uses (default: minimax)
+    StrategyFile -- a strategy tree file (see CompileStrategy.py) to evaluate instead of an algorithm
+    MaximumGuesses -- the number of guesses after which a game is lost (default: StrategyEvaluator.DEFAULT_MAX_GUESSES)
+    NumberOfProcesses -- the number of worker processes the games are split between (default: number of cpu cores)
+    OutputFile -- the file the result is written to as JSON
+    """
+
+    def __init__(self) -> None:
+        self.validator = Validator()
+
+        self.process_args()
+        self.evaluate()
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        args = sys.argv[1:]
+        if len(args) < 2 or len(args) % 2 == 1:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        if not self.validator.is_positive_integer(args[0]) or not self.validator.is_positive_integer(args[1]):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        self.code_length = int(args[0])
+        self.num_of_colours = int(args[1])
+
+        options = dict(zip(args[2::2], args[3::2]))
+
+        algorithm_name = options.pop("--algorithm", "DonaldKnuth")
+        partition_scorer = options.pop("--scorer", "minimax")
+        strategy_file_name = options.pop("--strategy", None)
+        max_guesses = options.pop("--max-guesses", str(StrategyEvaluator.DEFAULT_MAX_GUESSES))
+        num_of_processes = options.pop("--processes", str(multiprocessing.cpu_count()))
+        self.output_file_name = options.pop("--output", None)
+
+        if (
+            len(options) > 0 or algorithm_name not in ComputerSolver.ALGORITHMS or partition_scorer not in PartitionScorer.NAMES
+            or not self.validator.is_positive_integer(max_guesses) or not self.validator.is_positive_integer(num_of_processes)
+        ):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        # the games are split between processes by the evaluator, so the algorithm itself uses a single process
+        if strategy_file_name is not None:
+            (algorithm_class, args, kwargs) = (StrategyTreeAlgorithm, (strategy_file_name,), {})
+        else:
+            algorithm_class = ComputerSolver.ALGORITHMS[algorithm_name]
+            (args, kwargs) = ((False,), {})
+            if issubclass(algorithm_class, (DonaldKnuthAlgorithm, HybridAlgorithm)):
+                kwargs["partition_scorer"] = partition_scorer
+
+        self.evaluator = StrategyEvaluator(
+            algorithm_class,
+            self.code_length,
+            self.num_of_colours,
+            args,
+            kwargs,
+            int(max_guesses),
+            int(num_of_processes)
+        )
+
+    def evaluate(self) -> None:
+        """Evaluate the algorithm, print its result and write it to the output file"""
+
+        try:
+            result = self.evaluator.evaluate()
+        except (OSError, ValueError):  # the strategy file could not be opened, or was compiled for other codes
+            sys.exit(ExitCodes.INPUT_FILE_ERROR.value)
+
+        if "partition_scorer" in self.evaluator.kwargs:
+            result["partition_scorer"] = self.evaluator.kwargs["partition_scorer"]
+
+        print(f"{result['algorithm']} {self.code_length}x{self.num_of_colours}: {result['num_of_secrets']} codes in {result['total_time']:.2f}s")
+        if result["mean_guesses"] is not None:
+            print(f"mean guesses {result['mean_guesses']:.4f}, max guesses {result['max_guesses']}, lost {result['num_of_lost']}")
+        else:
+            print(f"lost {result['num_of_lost']}")
+        for (guess_num, count) in result["guesses"].items():
+            print(f"{guess_num:>3}: {count}")
+
+        if self.output_file_name is not None:
+            try:
+                with open(self.output_file_name, "w") as file:
+                    json.dump(result, file, indent=2)
+            except OSError:
+                sys.exit(ExitCodes.OUTPUT_FILE_ERROR.value)
+
+
+if __name__ == '__main__':
+    Evaluate()
@@ -1,52 +1,176 @@
+import time
+
+IMPORT_START_TIME = time.perf_counter()  # the time the modules of the game started being imported (see --startup-report)
+
+import io
+import json
+import os
 import sys
 from typing import Union
 from constants.Text import Text
 from constants.enums import ExitCodes, Player
+from utils.GameExit import GameExit
 from utils.LineStream import LineStream
+from utils.PartitionScorer import PartitionScorer
 from utils.Validator import Validator
-from solvers.ComputerSolver import ComputerSolver
 from solvers.HumanSolver import HumanSolver
 
+# the computer player (and so NumPy and the WorkerPool) and cProfile are only imported when they are needed,
+# so human games start faster
+IMPORT_TIME = time.perf_counter() - IMPORT_START_TIME
 
-class Mastermind:
-    def __init__(self) -> None:
-        self.validator = Validator()
 
-        self.process_args()
+class Mastermind:
+    OUTPUT_BUFFER_SIZE = 65536
+
+    def __init__(
+        self, 
+        args: Union[list[str], None] = None, 
+        input_text: Union[str, None] = None, 
+        computer_game_file_name: str = "computerGame.txt", 
+        use_multiple_processes: bool = True, 
+        reuse_algorithm: bool = False
+    ) -> None:
+        """Store the arguments of the game, which is played by calling play.
 
-        self.read_input_file()
-        self.open_output_file()
+        Parameters:
+        args -- the command line arguments, not including the name of the script (default: sys.argv[1:])
+        input_text -- the contents of the input file, which is then not opened (default: None)
+        computer_game_file_name -- the file the guesses of the computer are written to (default: "computerGame.txt")
+        use_multiple_processes -- whether the computer may use multiple processes (default: True)
+        reuse_algorithm -- whether the computer should reuse the algorithm of an earlier game (default: False, see ComputerSolver)
+        """
 
-        self.get_code()
-        self.get_player()
+        self.validator = Validator()
 
-        # This would be better using match ... case but its not available in required the Python version
-        if self.player == Player.HUMAN:
-            self.play_human_game()
-        elif self.player == Player.COMPUTER:
-            self.play_computer_game()
+        self.args = sys.argv[1:] if args is None else args
+        self.input_text = input_text
+        self.computer_game_file_name = computer_game_file_name
+        self.use_multiple_processes = use_multiple_processes
+        self.reuse_algorithm = reuse_algorithm
+
+    def play(self) -> ExitCodes:
+        """Play the game and return its exit code"""
+
+        profiler = None
+        self.play_start_time = time.perf_counter()
+        self.startup_report = {
+            "import_time": IMPORT_TIME,
+            "solver_import_time": None,
+            "solver_setup_time": None,
+            "startup_time": None,
+            "snapshots_loaded": 0,
+            "snapshots_saved": 0
+        }
 
-        self.exit(ExitCodes.SUCCESS)
+        try:
+            self.process_args()
+
+            if self.profile_file_name is not None:
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+            self.read_input_file()
+            self.open_output_file()
+
+            try:
+                self.get_code()
+                self.get_player()
+
+                # This would be better using match ... case but its not available in required the Python version
+                if self.player == Player.HUMAN:
+                    self.play_human_game()
+                elif self.player == Player.COMPUTER:
+                    self.play_computer_game()
+            except UnicodeDecodeError:  # the lines of the input file are read as they are needed, so it can fail during the game
+                self.exit(ExitCodes.INPUT_FILE_ERROR)
+
+            self.exit(ExitCodes.SUCCESS)
+        except GameExit as game_exit:
+            exit_code = game_exit.exit_code
+
+        if profiler is not None:
+            profiler.disable()
+            try:
+                profiler.dump_stats(self.profile_file_name)
+            except OSError:
+                if exit_code == ExitCodes.SUCCESS:
+                    exit_code = ExitCodes.OUTPUT_FILE_ERROR
+
+        if getattr(self, "startup_report_file_name", None) is not None:  # the arguments may not have been processed
+            try:
+                with open(self.startup_report_file_name, "w") as file:
+                    json.dump(self.startup_report, file, indent=2)
+            except OSError:
+                if exit_code == ExitCodes.SUCCESS:
+                    exit_code = ExitCodes.OUTPUT_FILE_ERROR
+
+        return exit_code
 
     def process_args(self) -> None:
         """Declare the properties of this object from the command line arguments.
 
         Format of arguments:
-        python Mastermind.py InputFile OutputFile [CodeLength] [MaximumGuesses] [AvailableColour]*
+        python Mastermind.py InputFile OutputFile [CodeLength] [MaximumGuesses] [AvailableColour]* [--metrics MetricsFile] [--profile ProfileFile]
+                             [--scorer PartitionScorer] [--guess-cache GuessCacheFile] [--deadline Seconds]
+                             [--seed Seed] [--snapshots SnapshotDirectory] [--startup-report StartupReportFile]
+
+        MetricsFile -- the file a JSON report of every guess of a computer game is written to (see GameMetrics)
+        ProfileFile -- the file the cProfile stats of the game are written to, which can be read with pstats
+        PartitionScorer -- the name of the PartitionScorer the computer uses if it picks Donald Knuth's (or the hybrid) algorithm (default: minimax)
+        GuessCacheFile -- the file of the GuessCache the computer uses if it picks Donald Knuth's algorithm, which is
+                          created if it does not exist and saved after the game
+        Seconds -- the number of seconds the computer may take to find each guess if it picks Donald Knuth's algorithm,
+                   after which it uses the best guess found so far (default: no limit)
+        Seed -- the seed of the samples the computer uses if it picks the sampled algorithm, a non-negative integer (default: 0)
+        SnapshotDirectory -- the directory of the TableSnapshots the computer memory-maps its code tables from,
+                             which are written the first time they are generated
+        StartupReportFile -- the file a JSON report of the time taken to start the game is written to, containing the seconds
+                             taken to import the modules of the game (import_time) and of the computer player (solver_import_time),
+                             to create the computer player (solver_setup_time), from the start of the import until the first
+                             guess (startup_time), and the number of TableSnapshots loaded and saved
         """
 
-        num_of_args = len(sys.argv)
-        if num_of_args < 3:
+        self.metrics_file_name = self.get_option("--metrics")
+        self.profile_file_name = self.get_option("--profile")
+
+        self.guess_cache_file_name = self.get_option("--guess-cache")
+        self.snapshot_directory = self.get_option("--snapshots")
+        self.startup_report_file_name = self.get_option("--startup-report")
+
+        deadline = self.get_option("--deadline")
+        try:
+            self.deadline = float(deadline) if deadline is not None else None
+        except ValueError:
+            self.exit(ExitCodes.ARGS_ERROR)
+        if self.deadline is not None and not self.deadline > 0:
+            self.exit(ExitCodes.ARGS_ERROR)
+
+        seed = self.get_option("--seed")
+        try:
+            self.seed = int(seed) if seed is not None else None
+        except ValueError:
+            self.exit(ExitCodes.ARGS_ERROR)
+        if self.seed is not None and self.seed < 0:
+            self.exit(ExitCodes.ARGS_ERROR)
+
+        self.partition_scorer = self.get_option("--scorer") or "minimax"
+        if self.partition_scorer not in PartitionScorer.NAMES:
+            self.exit(ExitCodes.ARGS_ERROR)
+
+        num_of_args = len(self.args)
+        if num_of_args < 2:
             self.exit(ExitCodes.ARGS_ERROR)
 
-        self.input_file_name = sys.argv[1]
-        self.output_file_name = sys.argv[2]
+        self.input_file_name = self.args[0]
+        self.output_file_name = self.args[1]
 
-        self.code_length = int(sys.argv[3]) if num_of_args > 3 and self.validator.is_positive_integer(sys.argv[3]) else 5
-        self.max_guesses = int(sys.argv[4]) if num_of_args > 4 and self.validator.is_positive_integer(sys.argv[4]) else 12
+        self.code_length = int(self.args[2]) if num_of_args > 2 and self.validator.is_positive_integer(self.args[2]) else 5
+        self.max_guesses = int(self.args[3]) if num_of_args > 3 and self.validator.is_positive_integer(self.args[3]) else 12
 
-        if num_of_args > 6:
-            input_colours = sys.argv[5:num_of_args]
+        if num_of_args > 5:
+            input_colours = self.args[4:num_of_args]
 
             # avoid duplicate colours
             self.colours = []
@@ -63,23 +187,43 @@ class Mastermind:
 
         self.num_of_colours = len(self.colours)
 
+    def get_option(self, option: str) -> Union[str, None]:
+        """Remove an option and its value from the command line arguments and return the value, or None if it was not given.
+        Exit if the option has no value.
+
+        Parameters:
+        option -- the name of the option, e.g. --metrics
+        """
+
+        if option not in self.args:
+            return None
+
+        i = self.args.index(option)
+        if i + 1 == len(self.args):
+            self.exit(ExitCodes.ARGS_ERROR)
+
+        value = self.args[i + 1]
+        self.args = self.args[:i] + self.args[i + 2:]
+
+        return value
+
     def read_input_file(self) -> None:
-        """Create a LineStream for the input file so the lines can be read later.
+        """Create a LineStream for the input file (or self.input_text) so the lines can be read later.
         Exit if the file cannot be opened.
         """
 
         try:
-            self.lines = LineStream(open(self.input_file_name, "r"))
+            self.lines = LineStream(open(self.input_file_name, "r") if self.input_text is None else io.StringIO(self.input_text))
         except:
             self.exit(ExitCodes.INPUT_FILE_ERROR)
 
     def open_output_file(self) -> None:
-        """Open the output file and assign it to the output_file attribute.
-        Exit if the file cannot be opened.
+        """Open the output file and assign it to the output_file attribute. Lines are written to it
+        in chunks of OUTPUT_BUFFER_SIZE bytes as the game is played. Exit if the file cannot be opened.
         """
 
         try:
-            self.output_file = open(self.output_file_name, "w")
+            self.output_file = open(self.output_file_name, "w", buffering=self.OUTPUT_BUFFER_SIZE)
         except:
             self.exit(ExitCodes.OUTPUT_FILE_ERROR)
 
@@ -140,65 +284,90 @@ class Mastermind:
         self.player = Player.HUMAN if player == "human" else Player.COMPUTER
 
     def play_human_game(self) -> None:
-        solver = HumanSolver(self.code)
+        """Scores each guess in the input file until the code is guessed, the maximum number of guesses is reached
+        or there are no more lines. The score of each guess is written to the output file as soon as it is found,
+        so only one line of the input file and output file is stored at a time.
+        """
 
-        lines = []
+        solver = HumanSolver(self.code)
+        self.set_startup_time()
 
         while True:
             if self.lines.is_eof():  # EOF reached
-                lines.append(Text.LOST)
+                self.write_line(Text.LOST)
                 break
             
             guess_num = solver.inc_guess_num()
             if guess_num > self.max_guesses:
-                lines.append(Text.LOST)
-                lines.append(Text.MAX_GUESSES(self.max_guesses))
+                self.write_line(Text.LOST)
+                self.write_line(Text.MAX_GUESSES(self.max_guesses))
                 break
 
             guess = self.format_code(self.lines.get_next_line())
 
             if guess is None:
-                lines.append(Text.ILL_FORMED_GUESS(guess_num))
+                self.write_line(Text.ILL_FORMED_GUESS(guess_num))
             else:
                 (black_pegs, white_pegs) = solver.get_next_guess(guess)
 
-                lines.append(Text.GUESS(guess_num, black_pegs, white_pegs))
+                self.write_line(Text.GUESS(guess_num, black_pegs, white_pegs))
 
                 if black_pegs == self.code_length:
-                    lines.append(Text.WON(guess_num))
+                    self.write_line(Text.WON(guess_num))
                     if not self.lines.is_eof():  # determine if there were more guesses
-                        lines.append(Text.IGNORED_LINES)
+                        self.write_line(Text.IGNORED_LINES)
                     break
 
-        self.write_lines(lines, self.output_file)
-
     def play_computer_game(self) -> None:
         """Tries to guess the inputted code using only feedback from previous guesses.
 
-        Guesses are added to the computerGame.txt file.
+        Guesses are added to the computerGame.txt file (or self.computer_game_file_name).
         Feedback from guesses are added to the output file.
         """
 
-        solver = ComputerSolver(self.code, self.num_of_colours)
-
-        lines = []
+        # the computer does not use the rest of the input file, but it is checked before the game is played (see exit)
+        self.lines.read_to_end()
+
+        start = time.perf_counter()
+        from solvers.ComputerSolver import ComputerSolver
+        from utils.TableSnapshot import TableSnapshot
+        self.startup_report["solver_import_time"] = time.perf_counter() - start
+
+        (num_of_loads, num_of_saves) = (TableSnapshot.num_of_loads, TableSnapshot.num_of_saves)
+
+        start = time.perf_counter()
+        solver = ComputerSolver(
+            self.code, 
+            self.num_of_colours, 
+            use_multiple_processes=self.use_multiple_processes, 
+            reuse_algorithm=self.reuse_algorithm,
+            record_metrics=self.metrics_file_name is not None,
+            partition_scorer=self.partition_scorer,
+            guess_cache_file=self.guess_cache_file_name,
+            deadline=self.deadline,
+            seed=self.seed,
+            snapshot_directory=self.snapshot_directory
+        )
+        self.startup_report["solver_setup_time"] = time.perf_counter() - start
+
+        self.startup_report["snapshots_loaded"] = TableSnapshot.num_of_loads - num_of_loads
+        self.startup_report["snapshots_saved"] = TableSnapshot.num_of_saves - num_of_saves
+        self.set_startup_time()
 
         while True:
             guess_num = solver.inc_guess_num()
             if guess_num > self.max_guesses:
-                lines.append(Text.LOST)
+                self.write_line(Text.LOST)
                 break
 
             (black_pegs, white_pegs) = solver.get_next_guess()
 
-            lines.append(Text.GUESS(guess_num, black_pegs, white_pegs))
+            self.write_line(Text.GUESS(guess_num, black_pegs, white_pegs))
 
             if black_pegs == self.code_length:
-                lines.append(Text.WON(guess_num))
+                self.write_line(Text.WON(guess_num))
                 break
 
-        self.write_lines(lines, self.output_file)
-
         lines = [
             "code " + self.code_to_text(self.code),
             "player human"
@@ -207,12 +376,40 @@ class Mastermind:
             lines.append(self.code_to_text(guess))
 
         try:
-            file = open("computerGame.txt", "w")
+            file = open(self.computer_game_file_name, "w")
             self.write_lines(lines, file)
             file.close()
         except:
             self.exit(ExitCodes.OUTPUT_FILE_ERROR)
 
+        if solver.metrics is not None:
+            try:
+                solver.metrics.save(self.metrics_file_name)
+            except OSError:
+                self.exit(ExitCodes.OUTPUT_FILE_ERROR)
+
+        try:
+            solver.save_guess_cache()
+        except OSError:
+            self.exit(ExitCodes.OUTPUT_FILE_ERROR)
+
+    def set_startup_time(self) -> None:
+        """Record the seconds from the start of the import of the game until now, when the first guess is about to be made"""
+
+        self.startup_report["startup_time"] = IMPORT_TIME + time.perf_counter() - self.play_start_time
+
+    def write_line(self, line: str) -> None:
+        """Write a string to the output file, followed by a new line. Exit if it cannot be written.
+
+        Parameters:
+        line -- the string to write, which should NOT end with \n
+        """
+
+        try:
+            self.output_file.write(line + "\n")
+        except:
+            self.exit(ExitCodes.OUTPUT_FILE_ERROR)
+
     def write_lines(self, lines: list[str], file: 'File') -> None:
         """Write a list of strings to a file, creates a new line after every string.
 
@@ -227,22 +424,42 @@ class Mastermind:
             self.exit(ExitCodes.OUTPUT_FILE_ERROR)
 
     def exit(self, error: ExitCodes) -> None:
-        """Write the specified exit code to the output file (if required) and return this exit code.
+        """Write the specified exit code to the output file (if required) and stop the game with this exit code.
 
         Parameters:
         error -- the enum value of the exit code
         """
 
+        if hasattr(self, "lines") and error != ExitCodes.INPUT_FILE_ERROR:  # determines if the input file has been opened
+            try:
+                self.lines.read_to_end()  # the input file is only valid if all of it can be read, even the lines which were not needed
+            except UnicodeDecodeError:
+                error = ExitCodes.INPUT_FILE_ERROR
+
         if hasattr(self, "output_file"):  # determines if the output file has been opened
             if error == ExitCodes.CODE_ERROR:
                 self.write_lines([Text.ILL_FORMED_CODE], self.output_file)
             elif error == ExitCodes.PLAYER_ERROR:
                 self.write_lines([Text.ILL_FORMED_PLAYER], self.output_file)
 
-            self.output_file.close()
+            try:
+                self.output_file.close()  # writes the last chunk of buffered lines
+            except OSError:
+                if error == ExitCodes.SUCCESS:
+                    error = ExitCodes.OUTPUT_FILE_ERROR
+
+            # an input file which cannot be read has no output file, so the lines written before the error are removed
+            if error == ExitCodes.INPUT_FILE_ERROR:
+                try:
+                    os.remove(self.output_file_name)
+                except OSError:
+                    pass
+
+        if hasattr(self, "lines"):  # determines if the input file has been opened
+            self.lines.close()
 
-        sys.exit(error.value)
+        raise GameExit(error)
 
 
 if __name__ == '__main__':
-    Mastermind()
+    sys.exit(Mastermind().play().value)
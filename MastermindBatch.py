@@ -0,0 +1,190 @@
+import json
+import multiprocessing
+import os
+import shlex
+import sys
+import traceback
+from typing import Iterable, Union
+from constants.enums import ExitCodes
+from Mastermind import Mastermind
+from utils.Validator import Validator
+
+
+class MastermindBatch:
+    """Plays many games of Mastermind in one invocation, using a pool of worker processes which each keep the
+    algorithms of the games they have played (see ComputerSolver.reuse_algorithm), so the codes for the same
+    code length and number of colours are only generated once per process.
+
+    Format of arguments:
+    python MastermindBatch.py Manifest [--processes NumberOfProcesses]
+    python MastermindBatch.py Games.jsonl [--processes NumberOfProcesses]
+    python MastermindBatch.py InputDirectory OutputDirectory [CodeLength] [MaximumGuesses] [AvailableColour]* [--processes NumberOfProcesses]
+
+    Manifest -- a file where every line contains the arguments of Mastermind.py for one game (quotes are allowed)
+    Games.jsonl -- a file (or - for stdin) where every line is a JSON object with the keys "output_file", then "input_file"
+                   or "input" (the contents of an input file), and optionally "code_length", "max_guesses", "colours" and
+                   "computer_game_file"
+    InputDirectory -- every file in this directory is an input file, with an output file of the same name in OutputDirectory
+
+    The guesses of each computer game are written next to its output file (see get_computer_game_file_name).
+    The exit code of every game is printed on its own line, followed by a tab and its output file, in the order of the games.
+    A game which fails with an unexpected error has the exit code ExitCodes.GAME_ERROR and its traceback is printed to stderr.
+    """
+
+    def __init__(self) -> None:
+        self.validator = Validator()
+
+        self.process_args()
+        self.read_games()
+        self.play_games()
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        self.args = sys.argv[1:]
+        self.num_of_processes = multiprocessing.cpu_count()
+
+        if "--processes" in self.args:
+            i = self.args.index("--processes")
+            if i + 1 == len(self.args) or not self.validator.is_positive_integer(self.args[i + 1]):
+                sys.exit(ExitCodes.ARGS_ERROR.value)
+
+            self.num_of_processes = int(self.args[i + 1])
+            del self.args[i:i + 2]
+
+        if len(self.args) == 0:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        self.games_file_name = self.args[0]
+
+    def read_games(self) -> None:
+        """Set self.games as the (args, input_text, computer_game_file_name) of every game,
+        where args are the arguments of Mastermind.py. Exit if the games cannot be read.
+        """
+
+        try:
+            if os.path.isdir(self.games_file_name):
+                self.games = self.read_directory()
+            elif self.games_file_name == "-":
+                self.games = self.read_jsonl(sys.stdin)
+            else:
+                with open(self.games_file_name, "r") as file:
+                    self.games = self.read_jsonl(file) if self.games_file_name.endswith(".jsonl") else self.read_manifest(file)
+        except (OSError, ValueError, KeyError, TypeError):
+            sys.exit(ExitCodes.INPUT_FILE_ERROR.value)
+
+    def read_directory(self) -> list[tuple[list[str], None, str]]:
+        """Return every game for the files in the input directory, which all use the remaining arguments"""
+
+        if len(self.args) < 2:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        (input_directory, output_directory), args = self.args[:2], self.args[2:]
+        os.makedirs(output_directory, exist_ok=True)
+
+        games = []
+        for file_name in sorted(os.listdir(input_directory)):
+            input_file_name = os.path.join(input_directory, file_name)
+            if os.path.isfile(input_file_name):
+                output_file_name = os.path.join(output_directory, file_name)
+                games.append(([input_file_name, output_file_name] + args, None, self.get_computer_game_file_name(output_file_name)))
+
+        return games
+
+    def read_manifest(self, file: 'File') -> list[tuple[list[str], None, str]]:
+        """Return a game for every line of a manifest which is not empty
+
+        Parameters:
+        file -- the manifest
+        """
+
+        games = []
+        for line in file:
+            args = shlex.split(line)
+            if len(args) > 0:
+                output_file_name = args[1] if len(args) > 1 else ""
+                games.append((args, None, self.get_computer_game_file_name(output_file_name)))
+
+        return games
+
+    def read_jsonl(self, file: 'File') -> list[tuple[list[str], Union[str, None], str]]:
+        """Return a game for every line of a JSONL file which is not empty
+
+        Parameters:
+        file -- the JSONL file
+        """
+
+        games = []
+        for line in file:
+            if line.strip() == "":
+                continue
+
+            game = json.loads(line)
+
+            # invalid values are passed on to Mastermind so they are reported as the game's exit code
+            args = [str(game.get("input_file", "")), str(game["output_file"])]
+            args.append(str(game.get("code_length", 5)))
+            args.append(str(game.get("max_guesses", 12)))
+            args.extend(str(colour) for colour in game.get("colours", []))
+
+            computer_game_file_name = game.get("computer_game_file", self.get_computer_game_file_name(args[1]))
+            games.append((args, game.get("input"), computer_game_file_name))
+
+        return games
+
+    @staticmethod
+    def get_computer_game_file_name(output_file_name: str) -> str:
+        """Return the file the guesses of a computer game are written to, instead of computerGame.txt
+        (e.g. outputs/game1.txt -> outputs/game1.computerGame.txt)
+
+        Parameters:
+        output_file_name -- the output file of the game
+        """
+
+        return os.path.splitext(output_file_name)[0] + ".computerGame.txt"
+
+    def play_games(self) -> None:
+        """Play every game and print its exit code. If only one process is used, the games are played in this process
+        so the algorithms can still use multiple processes (which worker processes cannot create).
+        """
+
+        if self.num_of_processes == 1 or len(self.games) <= 1:
+            self.print_exit_codes(map(self.play_game, [game + (True,) for game in self.games]))
+        else:
+            with multiprocessing.Pool(self.num_of_processes) as pool:
+                self.print_exit_codes(pool.imap(self.play_game, [game + (False,) for game in self.games]))
+
+    def print_exit_codes(self, exit_codes: Iterable[int]) -> None:
+        """Print the exit code of every game, as soon as it has been played
+
+        Parameters:
+        exit_codes -- the exit code of every game, in the order of self.games
+        """
+
+        for (args, _, _), exit_code in zip(self.games, exit_codes):
+            output_file_name = args[1] if len(args) > 1 else ""
+            print(f"{exit_code}\t{output_file_name}", flush=True)
+
+    @staticmethod
+    def play_game(game: tuple) -> int:
+        """Play a game and return its exit code, or ExitCodes.GAME_ERROR if it fails with an error which Mastermind
+        does not handle, so one game cannot stop the others
+
+        Parameters:
+        game -- the (args, input_text, computer_game_file_name) of the game, followed by whether it may use multiple processes
+        """
+
+        (args, input_text, computer_game_file_name, use_multiple_processes) = game
+
+        try:
+            mastermind = Mastermind(args, input_text, computer_game_file_name, use_multiple_processes, reuse_algorithm=True)
+            return mastermind.play().value
+        except Exception:
+            traceback.print_exc()
+            return ExitCodes.GAME_ERROR.value
+
+
+if __name__ == '__main__':
+    MastermindBatch()
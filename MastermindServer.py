@@ -0,0 +1,237 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import itertools
+import json
+import sys
+import time
+import traceback
+from constants.enums import ExitCodes
+from utils.ServerSession import ServerSession
+from utils.Validator import Validator
+
+
+class MastermindServer:
+    """Plays games of Mastermind for clients which connect to a Unix socket or a TCP port on localhost.
+    Every algorithm is copied from the first session with the same code length and number of colours
+    (see ComputerSolver.reuse_algorithm), so the codes and tables are shared by every session.
+
+    Format of arguments:
+    python MastermindServer.py --unix SocketPath [--idle-timeout Seconds] [--deadline Seconds]
+    python MastermindServer.py --port Port [--idle-timeout Seconds] [--deadline Seconds]
+
+    The deadline is the number of seconds the computer may take to find each guess (see ComputerSolver.deadline).
+
+    Every request is a line containing a JSON object with a "command" and is answered by a line containing a JSON object
+    with "ok" (and "error" if ok is false):
+    open -- start a session with optional "code_length", "max_guesses", "colours" and "code" (the answer code as colour names,
+            which may be left out if the client scores the computer's guesses), answered with its "session".
+            The code length and number of colours can give at most MAX_CODES codes (see MAX_CODE_LENGTH)
+    guess -- score a human "guess" of the session's code, answered with "guess_num", "pegs" ([black, white]) and "won"
+    next -- make the computer's next guess, answered with "guess_num", "guess", "search_finished" (false if the deadline 
+            passed before the search for the guess finished) and "lost". If the session has no code, the request must contain 
+            the "pegs" of the previous guess. Otherwise, the answer also has "pegs" and "won". Once the computer has made
+            "max_guesses" guesses without guessing the code, the answer only has "lost" (true)
+    play -- play a full computer game for the session's code, answered with "guesses", "lines" (as in the output file) and "won"
+    close -- end the session
+
+    A request which fails with an unexpected error is answered with an "error" starting with "Internal error", 
+    and its traceback is printed to stderr.
+
+    A session which has not been used for the idle timeout is closed by the server.
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 600
+
+    # the largest game a session can be opened for. Every computer guess is made by the one thread of the executor, 
+    # so a game with more codes would keep the other sessions waiting for more than about a second per guess
+    # (or run out of memory). The code length is checked first, so the number of codes is cheap to find
+    MAX_CODE_LENGTH = 24
+    MAX_CODES = pow(2, 24)
+
+    def __init__(self) -> None:
+        self.validator = Validator()
+
+        self.process_args()
+
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+
+        # the task of close_idle_sessions, kept so it is not garbage collected while the server runs
+        self.idle_sessions_task = None
+
+        # the computer's guesses take most of the time of a request so they are made by another thread, which keeps
+        # the server responding to other clients. One thread is used so the shared algorithms are only used by one guess at a time
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        except OSError:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        sys.exit(ExitCodes.SUCCESS.value)
+
+    def process_args(self) -> None:
+        """Declare the properties of this object from the command line arguments."""
+
+        args = sys.argv[1:]
+        if len(args) % 2 == 1:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        options = dict(zip(args[::2], args[1::2]))
+
+        self.socket_path = options.pop("--unix", None)
+        self.port = options.pop("--port", None)
+        if (self.socket_path is None) == (self.port is None):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        if self.port is not None:
+            if not self.validator.is_positive_integer(self.port):
+                sys.exit(ExitCodes.ARGS_ERROR.value)
+            self.port = int(self.port)
+
+        idle_timeout = options.pop("--idle-timeout", str(self.DEFAULT_IDLE_TIMEOUT))
+        if not self.validator.is_positive_integer(idle_timeout):
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+        self.idle_timeout = int(idle_timeout)
+
+        try:
+            self.deadline = float(options.pop("--deadline")) if "--deadline" in options else None
+        except ValueError:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+        if self.deadline is not None and not self.deadline > 0:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+        if len(options) > 0:
+            sys.exit(ExitCodes.ARGS_ERROR.value)
+
+    async def serve(self) -> None:
+        """Accept clients until the server is stopped, closing idle sessions"""
+
+        if self.socket_path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host="127.0.0.1", port=self.port)
+
+        async with server:
+            self.idle_sessions_task = asyncio.create_task(self.close_idle_sessions())
+            try:
+                await server.serve_forever()
+            finally:
+                # awaiting the cancelled task raises any error which stopped it before the server did
+                self.idle_sessions_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self.idle_sessions_task
+
+    async def close_idle_sessions(self) -> None:
+        """Close every session which has not been used for the idle timeout, checking twice per timeout"""
+
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+
+            now = time.monotonic()
+            for session_id, session in list(self.sessions.items()):
+                if now - session.last_used > self.idle_timeout:
+                    del self.sessions[session_id]
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer every request of a client until it disconnects
+
+        Parameters:
+        reader -- the stream the requests are read from
+        writer -- the stream the responses are written to
+        """
+
+        try:
+            while True:
+                line = await reader.readline()
+                if line == b"":  # the client disconnected
+                    break
+
+                if line.strip() == b"":
+                    continue
+
+                try:
+                    response = await self.handle_request(json.loads(line))
+                    response["ok"] = True
+                except (ValueError, KeyError, TypeError) as error:
+                    message = error.args[0] if len(error.args) > 0 else type(error).__name__
+                    response = {"ok": False, "error": str(message)}
+                except Exception as error:
+                    # any other error is a fault of the server rather than the request, so it is logged, 
+                    # but the client is still answered and can keep using the connection
+                    traceback.print_exc()
+                    response = {"ok": False, "error": f"Internal error ({type(error).__name__})"}
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request: dict) -> dict:
+        """Run the command of a request and return the response.
+        Raise a ValueError, KeyError or TypeError if the request is not valid.
+
+        Parameters:
+        request -- the request sent by the client
+        """
+
+        command = request["command"]
+
+        if command == "open":
+            return self.open_session(request)
+
+        session_id = request["session"]
+        if session_id not in self.sessions:
+            raise ValueError(f"There is no session {session_id}")
+
+        session = self.sessions[session_id]
+        session.last_used = time.monotonic()
+
+        loop = asyncio.get_running_loop()
+
+        # This would be better using match ... case but its not available in required the Python version
+        if command == "guess":
+            return session.score_guess(request["guess"])
+        elif command == "next":
+            return await loop.run_in_executor(self.executor, session.next_guess, request.get("pegs"))
+        elif command == "play":
+            return await loop.run_in_executor(self.executor, session.play_computer_game)
+        elif command == "close":
+            del self.sessions[session_id]
+            return {}
+
+        raise ValueError(f"Unknown command {command}")
+
+    def open_session(self, request: dict) -> dict:
+        """Create a session for an open request and return the response
+
+        Parameters:
+        request -- the request sent by the client
+        """
+
+        code_length = request.get("code_length", 5)
+        max_guesses = request.get("max_guesses", 12)
+        colours = request.get("colours", ServerSession.DEFAULT_COLOURS)
+
+        if not isinstance(code_length, int) or code_length < 1 or not isinstance(max_guesses, int) or max_guesses < 1:
+            raise ValueError("code_length and max_guesses must be positive integers")
+
+        if not isinstance(colours, list) or not all(isinstance(colour, str) for colour in colours) or len(set(colours)) < 2:
+            raise ValueError("colours must be a list of at least 2 colour names")
+
+        if code_length > self.MAX_CODE_LENGTH or pow(len(set(colours)), code_length) > self.MAX_CODES:
+            raise ValueError(f"code_length can be at most {self.MAX_CODE_LENGTH}, and there can be at most {self.MAX_CODES} codes")
+
+        session_id = next(self.session_ids)
+        self.sessions[session_id] = ServerSession(code_length, max_guesses, colours, request.get("code"), self.deadline)
+
+        return {"session": session_id}
+
+
+if __name__ == '__main__':
+    MastermindServer()
@@ -1,6 +1,11 @@
+import copy
 import itertools
 import multiprocessing
-from solvers.Solver import Solver
+from typing import Iterator, Union
+from solvers.Solver import Solver, np
+from utils.FeedbackIndex import FeedbackIndex
+from utils.FeedbackTable import FeedbackTable
+from utils.TableSnapshot import TableSnapshot
 
 
 class Algorithm(Solver):
@@ -11,16 +16,35 @@ class Algorithm(Solver):
     guesses, guesses_set -- stores all the current guesses
     use_multiple_processes -- whether this algorithm should use multiple processes (default: False)
     num_of_processes -- the number of processes this algorithm should use if multiple processes are enabled (default: number of cpu cores)
+    use_feedback_table -- whether feedback should be looked up in a FeedbackTable instead of being recomputed (default: False)
+    max_table_bytes -- the maximum number of bytes the FeedbackTable can use
+    feedback_table -- the FeedbackTable for all codes, or None if it is not used
+    feedback_index -- the FeedbackIndex shared by every algorithm with the same code length and number of colours, 
+                      or None if it is not used
+    remaining_set -- the codes which could possibly be the answer code as a CodeSet, or None if the algorithm does not store them as one
     guess -- the last guess made by the algorithm
+    is_search_finished -- whether the last guess was found by a finished search, rather than the best guess found 
+                          before a deadline passed (see DonaldKnuthAlgorithm.deadline)
     """
 
-    def __init__(self, code: tuple[int, ...], num_of_colours: int, use_multiple_processes: bool = False) -> None:
+    def __init__(
+        self, 
+        code: tuple[int, ...], 
+        num_of_colours: int, 
+        use_multiple_processes: bool = False, 
+        use_feedback_table: bool = False, 
+        max_table_bytes: int = FeedbackTable.DEFAULT_MAX_BYTES,
+        use_feedback_index: bool = False
+    ) -> None:
         """Initalise the variables for an algorithm.
 
         Parameters:
         code -- the answer code 
         num_of_colours -- the number of available colours for this game
         use_multiple_processes - whether the algorithm should use multiple processes (default: False)
+        use_feedback_table -- whether the algorithm should look up feedback in a FeedbackTable (default: False)
+        max_table_bytes -- the maximum number of bytes the FeedbackTable can use (default: FeedbackTable.DEFAULT_MAX_BYTES)
+        use_feedback_index -- whether the algorithm should filter the remaining codes using a FeedbackIndex (default: False)
         """
 
         super().__init__(code)
@@ -32,10 +56,101 @@ class Algorithm(Solver):
         self.use_multiple_processes = use_multiple_processes
         self.num_of_processes = multiprocessing.cpu_count()  # each process can have its own CPU core
 
-    def generate_all_codes(self) -> list[tuple[int, ...]]:
-        """Return all combinations of possible codes using self.num_of_colours and self.code_length"""
+        self.use_feedback_table = use_feedback_table
+        self.max_table_bytes = max_table_bytes
+        self.feedback_table = None
 
-        return [code for code in itertools.product(range(self.num_of_colours), repeat=self.code_length)]
+        self.feedback_index = FeedbackIndex.open(Algorithm, self.code_length, self.num_of_colours) if use_feedback_index else None
+        self.remaining_set = None
+
+        self.is_search_finished = True
+
+    def generate_codes(self) -> Iterator[tuple[int, ...]]:
+        """Return an iterator over all combinations of possible codes using self.num_of_colours and self.code_length,
+        which generates each code when it is needed instead of storing every code
+        """
+
+        return itertools.product(range(self.num_of_colours), repeat=self.code_length)
+
+    def generate_code_array(self) -> 'np.ndarray':
+        """Return the codes generated by generate_codes as a NumPy array with one code per row. If a TableSnapshot
+        of this code length and number of colours exists, the array is a read-only view of it instead of being generated.
+        """
+
+        snapshot = TableSnapshot.open(self.code_length, self.num_of_colours)
+        if snapshot is not None:
+            return snapshot.get_code_array()
+
+        shape = (self.num_of_colours,) * self.code_length
+        code_array = np.ascontiguousarray(np.indices(shape, dtype=np.uint8).reshape(self.code_length, -1).T)
+        TableSnapshot.save(self.code_length, self.num_of_colours, code_array)
+
+        return code_array
+
+    def get_index(self, code: tuple[int, ...]) -> int:
+        """Return the index of the code in the order of generate_codes (its rank as a base num_of_colours integer)"""
+
+        index = 0
+        for colour in code:
+            index = index * self.num_of_colours + colour
+
+        return index
+
+    def get_array_indices(self, codes: 'np.ndarray') -> 'np.ndarray':
+        """Return the index of every code in a NumPy array with one code per row (see get_index)"""
+
+        powers = self.num_of_colours ** np.arange(self.code_length - 1, -1, -1, dtype=np.int64)
+        return codes.astype(np.int64) @ powers
+
+    def get_code(self, index: int) -> tuple[int, ...]:
+        """Return the code at the index in the order of generate_codes (the inverse of get_index)"""
+
+        code = [0] * self.code_length
+        for i in range(self.code_length - 1, -1, -1):
+            index, code[i] = divmod(index, self.num_of_colours)
+
+        return tuple(code)
+
+    def get_array_codes(self, indices: 'np.ndarray') -> 'np.ndarray':
+        """Return the code at every index as a NumPy array with one code per row (the inverse of get_array_indices)"""
+
+        powers = self.num_of_colours ** np.arange(self.code_length - 1, -1, -1, dtype=np.int64)
+        return ((indices[:, None] // powers) % self.num_of_colours).astype(np.uint8)
+
+    def get_colour_counts(self, codes: 'np.ndarray') -> 'np.ndarray':
+        """Return the number of times each colour is in each code, as a NumPy array with one row per code
+
+        Parameters:
+        codes -- array with one code per row
+        """
+
+        return (codes[:, :, np.newaxis] == np.arange(self.num_of_colours, dtype=codes.dtype)).sum(axis=1, dtype=np.uint8)
+
+    def get_batch_partition_sizes(self, guesses: 'np.ndarray', codes: 'np.ndarray', code_counts: 'np.ndarray') -> 'np.ndarray':
+        """Return the partition sizes of the codes for every guess at once (see DonaldKnuthAlgorithm.get_partition_sizes),
+        as a NumPy array with one row per guess. The pegs are found as in Solver.get_pegs_batch, for every pair of guess and code.
+
+        Parameters:
+        guesses -- array with one guess per row
+        codes -- array with one code per row
+        code_counts -- the colour counts of codes (see get_colour_counts)
+        """
+
+        num_of_partitions = pow(self.code_length + 1, 2)
+
+        black_pegs = (guesses[:, np.newaxis, :] == codes[np.newaxis, :, :]).sum(axis=2, dtype=np.int64)
+        pegs = np.minimum(self.get_colour_counts(guesses)[:, np.newaxis, :], code_counts[np.newaxis, :, :]).sum(axis=2, dtype=np.int64)
+
+        # black_pegs * (code_length + 1) + white_pegs, offset by the partitions of the guesses before it
+        feedback = black_pegs * self.code_length + pegs + (np.arange(len(guesses)) * num_of_partitions)[:, np.newaxis]
+
+        return np.bincount(feedback.ravel(), minlength=len(guesses) * num_of_partitions).reshape(len(guesses), num_of_partitions)
+
+    def create_feedback_table(self) -> None:
+        """Create self.feedback_table for all codes, if this algorithm should use a FeedbackTable"""
+
+        if self.use_feedback_table:
+            self.feedback_table = FeedbackTable(self, self.max_table_bytes)
     
     def create_initial_code(self) -> tuple[int, ...]:
         """Return a tuple containing integers representing the first guess of an algorithm"""
@@ -50,4 +165,51 @@ class Algorithm(Solver):
         """Add self.guess to self.guesses_set and self.guesses"""
 
         self.guesses_set.add(self.guess)
-        self.guesses.append(self.guess)
\ No newline at end of file
+        self.guesses.append(self.guess)
+
+    def make_guess(self) -> None:
+        """Set self.guess as the next guess, using only self.pegs of the previous guesses (not self.code).
+        Each algorithm must implement this method.
+        """
+
+        raise NotImplementedError
+
+    def get_next_guess(self) -> tuple[int, int]:
+        """Make the next guess and return its (black_pegs, white_pegs)"""
+
+        self.make_guess()
+
+        self.pegs = (black_pegs, white_pegs) = self.get_pegs(self.guess, self.code)
+
+        return (black_pegs, white_pegs)
+
+    def get_remaining_codes(self) -> list[tuple[int, ...]]:
+        """Return the codes which could possibly be the answer code. Each algorithm must implement this method."""
+
+        raise NotImplementedError
+
+    def get_num_of_remaining_codes(self) -> Union[int, None]:
+        """Return the number of codes which could possibly be the answer code, or None if the algorithm does not store them"""
+
+        return len(self.get_remaining_codes())
+
+    def get_possible_pegs(self) -> set[tuple[int, int]]:
+        """Return every (black_pegs, white_pegs) which self.guess could get, if any of the remaining codes was the answer code.
+        If a FeedbackIndex is used, these are the partitions of self.guess which share a code with self.remaining_set.
+        """
+
+        if self.feedback_index is not None and self.remaining_set is not None:
+            partition_sizes = self.feedback_index.get_partition_sizes(self.get_index(self.guess), self.remaining_set)
+            return set(map(self.decode_pegs, partition_sizes))
+
+        return set(map(self.get_scorer(self.guess), self.get_remaining_codes()))
+
+    def copy(self) -> 'Algorithm':
+        """Return a copy of this algorithm which can make different guesses without changing this algorithm.
+        Attributes which are replaced rather than changed each turn (e.g. all codes) are shared with the copy.
+        """
+
+        algorithm = copy.copy(self)
+        algorithm.guesses, algorithm.guesses_set = list(self.guesses), set(self.guesses_set)
+
+        return algorithm
\ No newline at end of file
@@ -1,123 +1,542 @@
-import math
-import multiprocessing
+import array
+import time
+from typing import Union
 from algorithms.Algorithm import Algorithm
+from solvers.Solver import np
+from utils.CodeSet import CodeSet
+from utils.FeedbackTable import FeedbackTable
+from utils.GuessCache import GuessCache
+from utils.PartitionScorer import PartitionScorer
+from utils.SymmetryGroup import SymmetryGroup
+from utils.WorkerPool import SharedArray, WorkerPool
 
 
 class DonaldKnuthAlgorithm(Algorithm):
-    """Guesses the code using Donald Knuth's Five Guess algorithm.
+    """Guesses the code using Donald Knuth's Five Guess algorithm. Each guess is the code whose partitions of the remaining codes
+    have the lowest score, which is the size of the largest partition unless another PartitionScorer is used.
+    
+    Codes are stored by their index (see Algorithm.get_index) and only converted to tuples when they are guessed.
     
     Attributes:
-    all_codes -- a list of all possible code combinations
     num_of_codes -- the total number of all possible code combinations
-    remaining_codes -- a set of the codes which could possibly be the answer code
-    part -- number of codes each process should search, if using multiple processes
+    code_array -- all codes as a NumPy array with one code per row, if NumPy is installed
+    remaining_indices -- the indexes of the codes which could possibly be the answer code, as a NumPy array 
+                         if NumPy is installed, otherwise as an array.array (or a range before the first guess)
+    remaining_set -- remaining_indices as a CodeSet
+    remaining_array -- the remaining codes as a NumPy array with one code per row, if NumPy is installed
+    remaining_codes -- the remaining codes as tuples, only if NumPy is not installed and a FeedbackTable is not used 
+                       (since they are then scored one at a time), or None before the first guess
+    symmetry_group -- the symmetries left by the guesses made so far
+    candidate_indices -- the indexes of the codes which should be scored this turn, one from each orbit of symmetry_group
+    remaining_name -- the name of the SharedArray remaining_indices were last read from, in a worker process of the WorkerPool
+    guess_feedback -- the encoded pegs the guess gives each remaining code, in the order of remaining_indices, if they were kept 
+                      when the guess was scored (as a NumPy array if NumPy is installed, otherwise see Solver.create_feedback_array), or None
+    skipped_evaluations -- the number of peg evaluations min_max_score has skipped this game, by stopping early
+    partition_scorer -- the PartitionScorer which scores the partitions of each code
+    guess_cache -- the GuessCache storing the guess chosen for each state, which is shared by copies of this algorithm (or None)
+    deadline -- the number of seconds each guess may take to find, or None if there is no limit
+    deadline_time -- the time.time() at which the search for the current guess must stop, or None if there is no limit
     pegs -- a tuple storing the (black_pegs, white_pegs) of the last guess
     """
 
-    def __init__(self, code: tuple[int, ...], num_of_colours: int, use_multiple_processes: bool = False) -> None:
+    # the number of remaining codes partitioned at a time using NumPy, before checking if partitioning can stop.
+    # np.bincount has a high overhead per call, so checking more often than this makes min_max_score slower
+    PRUNE_CHUNK = 4096
+
+    def __init__(
+        self, 
+        code: tuple[int, ...], 
+        num_of_colours: int, 
+        use_multiple_processes: bool = False, 
+        use_feedback_table: bool = False, 
+        max_table_bytes: int = FeedbackTable.DEFAULT_MAX_BYTES,
+        partition_scorer: str = "minimax",
+        guess_cache: Union[GuessCache, None] = None,
+        deadline: Union[float, None] = None,
+        use_feedback_index: bool = False
+    ) -> None:
         """Initalise the variables for Donald Knuth's algorithm.
 
         Parameters:
         code -- the answer code 
         num_of_colours -- the number of available colours for this game
         use_multiple_processes - whether the algorithm should use multiple processes (default: False)
+        use_feedback_table -- whether the algorithm should look up feedback in a FeedbackTable (default: False)
+        max_table_bytes -- the maximum number of bytes the FeedbackTable can use (default: FeedbackTable.DEFAULT_MAX_BYTES)
+        partition_scorer -- the name of the PartitionScorer to use (default: "minimax")
+        guess_cache -- the GuessCache to look up and store guesses in (default: None)
+        deadline -- the number of seconds each guess may take to find (default: None, no limit)
+        use_feedback_index -- whether the algorithm should filter the remaining codes using a FeedbackIndex (default: False)
         """
 
-        super().__init__(code, num_of_colours, use_multiple_processes)
+        super().__init__(code, num_of_colours, use_multiple_processes, use_feedback_table, max_table_bytes, use_feedback_index)
 
-        self.all_codes = self.generate_all_codes()
-        self.remaining_codes = set(self.all_codes)
-        self.num_of_codes = len(self.all_codes)
-        
-        if self.use_multiple_processes: 
-            # calculate how many codes each process will handle
-            self.part = math.ceil(self.num_of_codes / self.num_of_processes) 
+        self.partition_scorer = PartitionScorer(partition_scorer)
+        self.guess_cache = guess_cache
+        self.deadline = deadline
+        self.deadline_time = None
+
+        self.num_of_codes = pow(self.num_of_colours, self.code_length)
+
+        self.create_feedback_table()
+        if np is not None:
+            self.code_array = self.generate_code_array()
+            self.remaining_indices = np.arange(self.num_of_codes)
+            self.remaining_array = self.code_array
+        else:
+            self.remaining_indices = range(self.num_of_codes)
+            self.remaining_codes = None
+        self.remaining_set = None
+        self.remaining_name = None
+        self.guess_feedback = None
+
+        self.skipped_evaluations = 0
+
+        self.symmetry_group = SymmetryGroup(self)
 
-    def min_max_score(self, start: int, end: int, min_scores: list[tuple[int, int]]) -> None:
-        """Performs the MinMax of the Donald Knuth's Five Guess algorithm on a specified section of self.all_codes
+    def min_max_score(self, start: int, end: int, min_scores: list[tuple], shared_bound: Union[SharedArray, None] = None) -> None:
+        """Performs the MinMax of the Donald Knuth's Five Guess algorithm on a specified section of self.candidate_indices,
+        finding the codes with the lowest score given by self.partition_scorer
+
+        Codes which could be the answer code are scored first because they usually have a low score. If the score is
+        the size of the largest partition, scoring a code stops as soon as one of its partitions is larger than the lowest 
+        score found so far (or shared_bound), since that code can no longer have the lowest score. This gives the same 
+        codes as scoring every code fully.
+
+        If self.deadline_time passes, scoring stops and the codes with the lowest score of the codes scored so far are given,
+        so the codes which are most likely to be good guesses have been scored.
+
+        The pegs of the first code with the lowest score which could be the answer code are kept, since it is the code 
+        find_guess_index guesses if it is one of the codes with the lowest score of every section (see filter_remaining_codes).
         
         Parameters:
         start -- the index at the beginning of this function's allocated section
         end -- the index at the end of this function's allocated section
-        min_scores -- an output list to store the min_score and the codes with this min_score
+        min_scores -- an output list to store the min_score, the indexes of the codes with this min_score, the number of skipped peg evaluations,
+                      whether every code was scored and the (index, feedback) of the first code with this min_score which could be 
+                      the answer code, where feedback is the encoded pegs it gives each remaining code (or None if there is no such code)
+        shared_bound -- a SharedArray storing the lowest score found by any process, if using multiple processes
+                        and the score can be pruned (default: None)
         """
 
         min_score = float("inf")
         codes = []
-        
-        for i in range(start, end):
-            code = self.all_codes[i]
+        skipped_evaluations = 0
+        is_finished = True
+        best_consistent = None
 
-            if code in self.guesses_set:  # don't want to make the same guess twice
+        num_of_remaining_codes = len(self.remaining_indices)
+        guess_indices = {self.get_index(guess) for guess in self.guesses_set}
+        
+        for i in self.get_candidate_order(start, end):
+            if i in guess_indices:  # don't want to make the same guess twice
                 continue
 
-            # stores all possible black, white peg combinations against the number of 
-            # times this combination occurs (called "score") e.g. scores[(0, 3)] = 5
-            scores = {}  
-            for guess in self.remaining_codes:
-                pegs = self.get_pegs(guess, code)
-                scores[pegs] = 1 if pegs not in scores else scores[pegs] + 1
+            if self.deadline_time is not None and time.time() >= self.deadline_time:
+                is_finished = False
+                break
+
+            if self.partition_scorer.is_prunable:
+                bound = min_score if shared_bound is None else min(min_score, shared_bound.read(0, 1)[0])
+            else:
+                bound = float("inf")
+
+            # codes which could be the answer code are scored in order of their indexes before any other code, 
+            # so the pegs are only needed for them
+            feedback = [] if i in self.remaining_set else None
+            partition_sizes = self.get_partition_sizes(i, bound, feedback)
+
+            if max(partition_sizes) > bound:  # this code was not fully scored
+                skipped_evaluations += num_of_remaining_codes - sum(partition_sizes)
+                continue
 
-            # gets the peg combination (key) with the highest score (value)
-            max_score = max(scores, key=scores.get, default=None)  
-            score = scores[max_score]
+            score = self.partition_scorer.score(partition_sizes)
 
             # update codes to contain the codes with the lowest score
             if score < min_score:
                 min_score = score
-                codes = [code]
+                codes = [i]
+                best_consistent = (i, feedback) if feedback is not None else None
+
+                if shared_bound is not None and score < bound:
+                    shared_bound.write([score])
             elif min_score == score:
-                codes.append(code)
+                codes.append(i)
+                if best_consistent is None and feedback is not None:
+                    best_consistent = (i, feedback)
+
+        if best_consistent is not None:
+            (i, feedback) = best_consistent
+            best_consistent = (i, np.concatenate(feedback) if np is not None else self.create_feedback_array(feedback))
+
+        codes.sort()  # codes were scored out of order, so return them in the order of their indexes
+        min_scores.append((min_score, codes, skipped_evaluations, is_finished, best_consistent))
+
+    def get_candidate_order(self, start: int, end: int) -> list[int]:
+        """Return the indexes in the range [start, end) of self.candidate_indices, in the order they should be scored.
+        Codes which could be the answer code come first.
+
+        Parameters:
+        start -- the index at the beginning of the range
+        end -- the index at the end of the range
+        """
+
+        candidate_indices = self.candidate_indices[start:end]
+        if np is not None:
+            is_consistent = self.remaining_set.contains_array(candidate_indices)
+            return candidate_indices[is_consistent].tolist() + candidate_indices[~is_consistent].tolist()
+
+        consistent, inconsistent = [], []
+        for i in candidate_indices:
+            if i in self.remaining_set:
+                consistent.append(i)
+            else:
+                inconsistent.append(i)
+
+        return consistent + inconsistent
+
+    def get_partition_sizes(self, i: int, bound: float = float("inf"), feedback: Union[list, None] = None) -> list[int]:
+        """Partition remaining codes by the pegs they would give if the code at index i was the guess, 
+        and return the size of each partition (called its "score"). If NumPy is installed, the partitions
+        are counted using np.bincount on PRUNE_CHUNK codes at a time.
+
+        Partitioning stops as soon as any partition is larger than bound, in which case the sizes are
+        only for the codes which were scored before stopping.
+
+        Parameters:
+        i -- the index of the guess
+        bound -- the size at which partitioning should stop (default: infinity)
+        feedback -- an output list to store the encoded pegs of each remaining code scored, as a NumPy array 
+                    for each chunk if NumPy is installed (default: None, the pegs are not stored)
+        """
+
+        guess = self.get_code(i)
+
+        if np is not None:
+            if self.feedback_table is not None:
+                row = self.feedback_table.get_row(i)
+
+            partition_sizes = np.zeros(pow(self.code_length + 1, 2), dtype=np.int64)
+            for start in range(0, len(self.remaining_indices), self.PRUNE_CHUNK):
+                end = start + self.PRUNE_CHUNK
+
+                if self.feedback_table is None:
+                    chunk_feedback = self.get_pegs_batch(guess, self.remaining_array[start:end])
+                else:
+                    chunk_feedback = row[self.remaining_indices[start:end]]
+
+                if feedback is not None:
+                    feedback.append(chunk_feedback)
+
+                partition_sizes += np.bincount(chunk_feedback, minlength=len(partition_sizes))
+                if partition_sizes.max() > bound:
+                    break
+
+            return partition_sizes
+
+        # stores all possible encoded black, white peg combinations (see Solver.encode_pegs) against 
+        # the number of times this combination occurs (called "score") e.g. scores[encode_pegs((0, 3))] = 5
+        scores = [0] * pow(self.code_length + 1, 2)
+        if self.feedback_table is None:
+            score = self.get_scorer(guess, encoded=True)
+            pegs = map(score, self.remaining_codes)
+        else:
+            row = self.feedback_table.get_row(i)
+            pegs = (row[j] for j in self.remaining_indices)
+
+        for encoded_pegs in pegs:
+            scores[encoded_pegs] += 1
+            if feedback is not None:
+                feedback.append(encoded_pegs)
+            if scores[encoded_pegs] > bound:
+                break
+
+        return scores
+
+    def filter_remaining_codes(self) -> None:
+        """Filter remaining codes to include only codes which would give the same pegs as self.guess if they were the code.
+        If the pegs of self.guess were kept when it was scored (see min_max_score), the remaining codes are the partition 
+        with those pegs, so they are not scored again. If a FeedbackIndex is used, they are found by a bitwise and instead.
+        """
+
+        if self.feedback_index is not None:
+            codes = self.feedback_index.get(self.get_index(self.guess), self.encode_pegs(self.pegs))
+            if self.remaining_set is not None:  # before the first guess is filtered, every code is remaining
+                codes = codes & self.remaining_set
+
+            self.set_remaining_indices(codes.get_indices(), remaining_set=codes)
+            return
+
+        if self.guess_feedback is not None:
+            feedback = self.encode_pegs(self.pegs)
+            if np is not None:
+                self.set_remaining_indices(self.remaining_indices[self.guess_feedback == feedback])
+            else:
+                positions = [k for k, guess_feedback in enumerate(self.guess_feedback) if guess_feedback == feedback]
+                self.set_remaining_indices(
+                    [self.remaining_indices[k] for k in positions],
+                    [self.remaining_codes[k] for k in positions] if self.feedback_table is None else None
+                )
+            return
+
+        if np is None and self.feedback_table is None:
+            # before the first guess, every code is generated as it is filtered instead of being stored
+            codes = self.remaining_codes if self.remaining_codes is not None else self.generate_codes()
+            score = self.get_scorer(self.guess)
+            self.set_remaining_indices([i for i, code in zip(self.remaining_indices, codes) if score(code) == self.pegs])
+            return
+
+        feedback = self.encode_pegs(self.pegs)
+
+        if np is not None:
+            if self.feedback_table is None:
+                guess_feedback = self.get_pegs_batch(self.guess, self.remaining_array)
+            else:
+                guess_feedback = self.feedback_table.get_row(self.get_index(self.guess))[self.remaining_indices]
+
+            self.set_remaining_indices(self.remaining_indices[guess_feedback == feedback])
+        else:
+            row = self.feedback_table.get_row(self.get_index(self.guess))
+            self.set_remaining_indices([i for i in self.remaining_indices if row[i] == feedback])
+
+    def set_remaining_indices(
+        self, 
+        indices: 'np.ndarray', 
+        codes: Union[list[tuple[int, ...]], None] = None, 
+        remaining_set: Union[CodeSet, None] = None
+    ) -> None:
+        """Set remaining codes to the codes at the given indexes
+
+        Parameters:
+        indices -- the indexes of the remaining codes, as a NumPy array if NumPy is installed
+        codes -- the remaining codes as tuples if they are already known, which are only used if NumPy is not installed 
+                 and a FeedbackTable is not used (default: None, the codes are found from their indexes)
+        remaining_set -- the indexes as a CodeSet, if it has already been created (default: None, it is created from indices)
+        """
+
+        if np is not None:
+            self.remaining_indices = np.asarray(indices, dtype=np.int64)
+            self.remaining_array = self.code_array[self.remaining_indices]
+        else:
+            self.remaining_indices = array.array("q", indices)
+            if self.feedback_table is None:
+                self.remaining_codes = codes if codes is not None else [self.get_code(i) for i in self.remaining_indices]
+
+        self.remaining_set = remaining_set if remaining_set is not None else CodeSet(self.num_of_codes, self.remaining_indices)
+
+    def min_max_score_in_pool(self) -> list[tuple]:
+        """Perform min_max_score on every chunk of self.candidate_indices in the WorkerPool, and return
+        the (min_score, codes, skipped_evaluations, is_finished, best_consistent) of each chunk of self.candidate_indices in order.
+        Only the pegs of the one code of each chunk which could be guessed are sent back, rather than those of every code scored.
+
+        The indexes of the remaining codes are written to a SharedArray once, which every worker reads without it 
+        being copied. If every code is a candidate, each task is a [start, end) range of indexes and the worker
+        finds the codes in its range from their indexes (see Algorithm.get_code). Otherwise, the candidate indexes
+        are written to another SharedArray and each task is a [start, end) range of that array.
+        The lowest score found by any worker is stored in another SharedArray, so every worker can stop
+        scoring codes which cannot have the lowest score, if the score can be pruned (see PartitionScorer.is_prunable).
+
+        If there is a deadline, the candidate indexes are always written in the order they should be scored (see get_candidate_order),
+        since the chunks are scored in order and the chunks which have not started when the deadline passes are not scored.
+        """
+
+        indices = self.remaining_indices
+        num_of_candidates = len(self.candidate_indices)
+
+        candidate_indices = self.candidate_indices
+        if self.deadline_time is not None:
+            candidate_indices = self.get_candidate_order(0, num_of_candidates)
+
+        shared_arrays = [SharedArray(len(indices)), SharedArray(1)]
+        if num_of_candidates < self.num_of_codes or self.deadline_time is not None:
+            shared_arrays.append(SharedArray(num_of_candidates))
+        try:
+            (remaining, shared_bound) = shared_arrays[:2]
+            remaining.write(indices)
+            shared_bound.write([len(indices)])  # no partition can be larger than every remaining code
+            if len(shared_arrays) > 2:
+                shared_arrays[2].write(candidate_indices)
+            arrays = [(array.name, array.length, array.typecode) for array in shared_arrays]
+
+            tasks = []
+            for (start, end) in WorkerPool.get_chunks(num_of_candidates, self.num_of_processes):
+                tasks.append((
+                    self.code_length, 
+                    self.num_of_colours, 
+                    self.partition_scorer.name, 
+                    list(self.guesses_set), 
+                    self.deadline_time, 
+                    arrays, 
+                    start, 
+                    end
+                ))
+
+            return WorkerPool.map(self.num_of_processes, DonaldKnuthAlgorithm.min_max_score_worker, tasks)
+        finally:
+            for shared_array in shared_arrays:
+                shared_array.close(unlink=True)
+
+    @staticmethod
+    def min_max_score_worker(task: tuple) -> tuple:
+        """Perform min_max_score for a task sent by min_max_score_in_pool, in a worker process of the WorkerPool
+
+        Parameters:
+        task -- tuple of (code_length, num_of_colours, partition_scorer, guesses, deadline_time, arrays, start, end)
+        """
+
+        (code_length, num_of_colours, partition_scorer, guesses, deadline_time, arrays, start, end) = task
+
+        algorithm = WorkerPool.get_worker_algorithm(DonaldKnuthAlgorithm, code_length, num_of_colours)
+        [remaining, shared_bound, *candidates] = WorkerPool.attach(arrays)
+
+        algorithm.guesses_set = set(guesses)
+        algorithm.deadline_time = deadline_time
+        if algorithm.partition_scorer.name != partition_scorer:
+            algorithm.partition_scorer = PartitionScorer(partition_scorer)
+
+        # a worker usually scores several chunks of the same turn, so the remaining codes are only read once per turn
+        if algorithm.remaining_name != remaining.name:
+            algorithm.set_remaining_indices(remaining.read())
+            algorithm.remaining_name = remaining.name
+
+        if len(candidates) == 0:  # every code is a candidate
+            algorithm.candidate_indices = np.arange(start, end) if np is not None else range(start, end)
+        else:
+            algorithm.candidate_indices = candidates[0].read(start, end)
+
+        min_scores = []
+        algorithm.min_max_score(0, end - start, min_scores, shared_bound if algorithm.partition_scorer.is_prunable else None)
+
+        return min_scores[0]
+
+    def get_remaining_codes(self) -> list[tuple[int, ...]]:
+        """Return the codes which could possibly be the answer code"""
+
+        if np is not None:
+            return [tuple(code) for code in self.remaining_array.tolist()]
+
+        return [self.get_code(i) for i in self.remaining_indices]
+
+    def get_num_of_remaining_codes(self) -> int:
+        """Return the number of codes which could possibly be the answer code, without creating them"""
 
-        min_scores.append((min_score, codes))
+        return len(self.remaining_indices)
 
-    def get_next_guess(self) -> tuple[int, int]:
-        """Find the next guess using Donald Knuth's Five Guess algorithm."""
+    def copy(self) -> 'DonaldKnuthAlgorithm':
+        """Return a copy of this algorithm which can make different guesses without changing this algorithm"""
+
+        algorithm = super().copy()
+        algorithm.symmetry_group = self.symmetry_group.copy(algorithm)
+
+        return algorithm
+
+    def get_state_key(self) -> bytes:
+        """Return the GuessCache key of the current state, which is everything the next guess depends on:
+        the parameters of the algorithm, the guesses made (which are not scored and decide the symmetry group) 
+        and the remaining codes
+        """
+
+        guess_indices = array.array("q", sorted(self.get_index(guess) for guess in self.guesses_set))
+        if np is not None:
+            remaining = np.ascontiguousarray(self.remaining_indices, dtype=np.int64)
+        else:
+            remaining = array.array("q", self.remaining_indices)
+
+        return GuessCache.get_key(
+            self.code_length, 
+            self.num_of_colours, 
+            self.partition_scorer.name, 
+            guess_indices.tobytes(), 
+            remaining.tobytes()
+        )
+
+    def find_guess_index(self) -> int:
+        """Return the index of the next guess, by scoring every candidate code (or as many as can be scored before 
+        self.deadline_time), and set self.is_search_finished and self.guess_feedback
+        """
+
+        if len(self.remaining_indices) <= 2:
+            # every scorer gives the lowest score to the codes which could be the answer code when there are at most 2, 
+            # since they split the remaining codes into partitions of 1 code, so the first of them would be guessed
+            return int(self.remaining_indices[0])
+
+        # only the first code of each orbit needs to be scored, since every code in an orbit has the same score 
+        # and either every code or no code in an orbit could be the answer code
+        self.candidate_indices = self.symmetry_group.get_representatives()
+
+        codes = []
+        if not self.use_multiple_processes:
+            min_scores = []
+            self.min_max_score(0, len(self.candidate_indices), min_scores)
+            _, codes, skipped_evaluations, self.is_search_finished, best_consistent = min_scores[0]
+            best_consistents = [best_consistent]
+        else:
+            min_scores = self.min_max_score_in_pool()
+
+            # its possible for multiple processes to find the same minimum score
+            # so merge all codes with this minimum score into a single list
+            min_score = min(score for score, _, _, _, _ in min_scores)
+            best_consistents = []
+            for score, c, _, _, best_consistent in min_scores:
+                if score == min_score:
+                    codes += c
+                    best_consistents.append(best_consistent)
+
+            skipped_evaluations = sum(skipped for _, _, skipped, _, _ in min_scores)
+            self.is_search_finished = all(is_finished for _, _, _, is_finished, _ in min_scores)
+
+        self.skipped_evaluations += skipped_evaluations
+
+        if len(codes) == 0:
+            # the deadline passed before any code was scored, so the first code which could be the answer code 
+            # is guessed, as in Swaszek's algorithm
+            return int(self.remaining_indices[0])
+        
+        # choose the guess as the code which is in remaining codes
+        guess_index = codes[0]
+        i = 1
+        while guess_index not in self.remaining_set and i < len(codes):
+            guess_index = codes[i]
+            i += 1
+
+        if guess_index not in self.remaining_set:
+            # no code with the lowest score could be the answer code, so the last code with the lowest 
+            # score is chosen, which is the last code of one of the scored orbits
+            guess_index = max(self.symmetry_group.get_last_index(i) for i in codes)
+
+        # the guess is the first code with the lowest score which could be the answer code, so its pegs were 
+        # kept if it was chosen by the loop above
+        for best_consistent in best_consistents:
+            if best_consistent is not None and best_consistent[0] == guess_index:
+                self.guess_feedback = best_consistent[1]
+
+        return guess_index
+
+    def make_guess(self) -> None:
+        """Find the next guess using Donald Knuth's Five Guess algorithm, unless it is in the GuessCache.
+        If self.deadline is set, the best guess found when it passes is used instead.
+        """
+
+        self.deadline_time = None if self.deadline is None else time.time() + self.deadline
+        self.is_search_finished = True
 
         if self.guess_num == 1:
             self.guess = self.create_initial_code()
         else:
-            # filter remaining codes to include only codes which would give the same pegs if they were the code
-            self.remaining_codes = {code for code in self.remaining_codes if self.get_pegs(self.guess, code) == self.pegs}
-
-            codes = []
-            if not self.use_multiple_processes:
-                min_scores = []
-                self.min_max_score(0, self.num_of_codes, min_scores)
-                _, codes = min_scores[0]
-            else:
-                manager = multiprocessing.Manager()
-                min_scores = manager.list()  # create a mutex list which can safely be shared between concurrent processes
-
-                processes = []
-                remaining = self.num_of_codes
-                while remaining > 0:  # create processes until all processes cover every index in self.remaining_codes
-                    args = (max(0, remaining-self.part), remaining, min_scores)
-                    remaining -= self.part
-
-                    process = multiprocessing.Process(target=self.min_max_score, args=args) 
-                    processes.append(process)
-                    process.start()
-
-                for process in processes:
-                    process.join()
-
-                # its possible for multiple processes to find the same minimum score
-                # so merge all codes with this minimum score into a single list
-                min_score, _ = min(min_scores)
-                for score, c in min_scores:
-                    if score == min_score:
-                        codes += c
-            
-            # choose the guess as the code which is in remaining codes
-            self.guess = codes[0]
-            i = 1
-            while self.guess not in self.remaining_codes and i < len(codes):
-                self.guess = codes[i]
-                i += 1
+            self.filter_remaining_codes()
+            self.guess_feedback = None
 
-        self.append_guess()
+            if self.guess_cache is None:
+                guess_index = self.find_guess_index()
+            else:
+                key = self.get_state_key()
+                guess_index = self.guess_cache.get(key)
+                if guess_index is None:
+                    guess_index = self.find_guess_index()
+                    if self.is_search_finished:  # a guess found before a deadline might not be the best guess
+                        self.guess_cache.put(key, int(guess_index))
 
-        self.pegs = (black_pegs, white_pegs) = self.get_pegs(self.guess, self.code)
+            self.guess = self.get_code(guess_index)
 
-        return (black_pegs, white_pegs)
+        self.append_guess()
+        self.symmetry_group.add_guess(self.guess)
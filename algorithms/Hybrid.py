@@ -0,0 +1,129 @@
+from typing import Union
+from algorithms.Swaszek import SwaszekAlgorithm
+from solvers.Solver import np
+from utils.PartitionScorer import PartitionScorer
+
+
+class HybridAlgorithm(SwaszekAlgorithm):
+    """Guesses the code using Swaszek's algorithm until few enough codes remain for a minimax step to be cheap, then
+    guesses the remaining code whose partitions of the remaining codes have the lowest score, as in Donald Knuth's
+    algorithm but only scoring the remaining codes. This suits numbers of codes which are too many to store every code
+    for Donald Knuth's algorithm, since a game usually has only a few hundred remaining codes after 3 or 4 guesses.
+
+    The remaining codes are filtered by Swaszek's algorithm on every turn, including after the switch, so nothing is
+    regenerated when it happens. The switch happens on the first turn where a minimax step costs at most max_evaluations
+    peg evaluations (see get_minimax_cost), which then holds for every later turn since the remaining codes only get fewer.
+
+    Attributes:
+    partition_scorer -- the PartitionScorer which scores the partitions of each remaining code after the switch
+    max_evaluations -- the number of peg evaluations a minimax step may use
+    switch_guess_num -- the number of the first guess found by a minimax step, or None before the switch
+    """
+
+    # a peg evaluation takes about 20 times longer without NumPy, so fewer are used to keep each turn under a second
+    # (the same as SampledMinimaxAlgorithm.DEFAULT_MAX_EVALUATIONS)
+    DEFAULT_MAX_EVALUATIONS = 2000000 if np is not None else 200000
+
+    # the number of peg evaluations which take as long as scoring the partitions of one remaining code
+    CANDIDATE_COST = 50
+
+    # the number of pairs of remaining codes scored at once using NumPy, which bounds the memory used
+    BATCH_SIZE = 65536
+
+    def __init__(
+        self,
+        code: tuple[int, ...],
+        num_of_colours: int,
+        *args,
+        partition_scorer: str = "minimax",
+        max_evaluations: int = DEFAULT_MAX_EVALUATIONS,
+        **kwargs
+    ) -> None:
+        """Initalise the variables for the hybrid algorithm.
+
+        Parameters:
+        code -- the answer code
+        num_of_colours -- the number of available colours for this game
+        args, kwargs -- the other arguments of SwaszekAlgorithm
+        partition_scorer -- the name of the PartitionScorer to use after the switch (default: "minimax")
+        max_evaluations -- the number of peg evaluations a minimax step may use (default: DEFAULT_MAX_EVALUATIONS)
+        """
+
+        super().__init__(code, num_of_colours, *args, **kwargs)
+
+        self.partition_scorer = PartitionScorer(partition_scorer)
+        self.max_evaluations = max_evaluations
+        self.switch_guess_num = None
+
+    def get_minimax_cost(self, num_of_remaining_codes: int) -> int:
+        """Return the number of peg evaluations a minimax step takes, which scores every remaining code against
+        every remaining code, with CANDIDATE_COST evaluations for the partitions of each remaining code
+
+        Parameters:
+        num_of_remaining_codes -- the number of remaining codes
+        """
+
+        return num_of_remaining_codes * (num_of_remaining_codes + self.CANDIDATE_COST)
+
+    def choose_guess(self) -> tuple[int, ...]:
+        """Return the next guess from the filtered self.remaining_codes, which is found by a minimax step
+        if it costs at most max_evaluations, otherwise by Swaszek's algorithm
+        """
+
+        num_of_remaining_codes = len(self.remaining_codes)
+
+        # with at most 2 remaining codes, every code splits them into partitions of 1 code so the first is guessed
+        if num_of_remaining_codes <= 2 or self.get_minimax_cost(num_of_remaining_codes) > self.max_evaluations:
+            return super().choose_guess()
+
+        if self.switch_guess_num is None:
+            self.switch_guess_num = self.guess_num
+
+        return self.get_remaining_code(self.get_minimax_index())
+
+    def get_minimax_index(self) -> int:
+        """Return the position in self.remaining_codes of the remaining code whose partitions of the remaining codes
+        have the lowest score, preferring the first of them. None of the remaining codes have been guessed,
+        since a guess which did not win is not consistent with its own pegs.
+        """
+
+        best = None  # the (score, position) of the best remaining code so far
+
+        if np is not None:
+            codes = self.remaining_codes
+            code_counts = self.get_colour_counts(codes)
+            batch_size = max(1, self.BATCH_SIZE // len(codes))
+
+            for start in range(0, len(codes), batch_size):
+                all_partition_sizes = self.get_batch_partition_sizes(codes[start:start + batch_size], codes, code_counts).tolist()
+                for (k, partition_sizes) in enumerate(all_partition_sizes):
+                    best = self.get_best(best, partition_sizes, start + k)
+
+            return best[1]
+
+        codes = [self.get_code(i) for i in self.remaining_codes]
+        num_of_partitions = pow(self.code_length + 1, 2)
+
+        for (k, guess) in enumerate(codes):
+            partition_sizes = [0] * num_of_partitions
+            for feedback in self.get_pegs_batch(guess, codes):
+                partition_sizes[feedback] += 1
+            best = self.get_best(best, partition_sizes, k)
+
+        return best[1]
+
+    def get_best(self, best: Union[tuple[float, int], None], partition_sizes: list[int], k: int) -> tuple[float, int]:
+        """Return the (score, position) of the better of best and the remaining code at position k,
+        which is best if their scores are equal since it comes first
+
+        Parameters:
+        best -- the (score, position) of the best remaining code so far, or None if no code has been scored
+        partition_sizes -- the partition sizes of the remaining code at position k
+        k -- the position of the remaining code in self.remaining_codes
+        """
+
+        score = self.partition_scorer.score(partition_sizes)
+        if best is None or score < best[0]:
+            return (score, k)
+
+        return best
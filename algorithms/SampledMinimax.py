@@ -0,0 +1,166 @@
+import math
+import random
+import time
+from typing import Union
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from solvers.Solver import np
+from utils.GuessCache import GuessCache
+
+
+class SampledMinimaxAlgorithm(DonaldKnuthAlgorithm):
+    """Guesses the code using Donald Knuth's algorithm on random samples, for numbers of codes where scoring every code
+    against every remaining code takes too long. Each turn, a sample of candidate codes is scored by the partitions of
+    a sample of the remaining codes, and the candidate with the lowest score is guessed.
+
+    The sizes of the samples are chosen so each turn uses at most max_evaluations peg evaluations (see get_sample_sizes).
+    Half of the candidates are sampled from the remaining codes, since they can win straight away and usually have a low score.
+    If every code can be scored against every remaining code within max_evaluations, the turn is the same as
+    Donald Knuth's algorithm, including the guess it makes when no code with the lowest score could be the answer code.
+
+    The samples of a turn are drawn from a random.Random seeded by seed and the state of the game (see get_state_key),
+    so the same guesses and pegs always give the same next guess. This makes a game reproducible from its seed, and
+    lets copies of the algorithm (see StrategyEvaluator) and the GuessCache be used as for Donald Knuth's algorithm.
+
+    Attributes:
+    max_evaluations -- the number of peg evaluations each turn may use
+    seed -- the seed of the samples
+    """
+
+    # a peg evaluation takes about 20 times longer without NumPy, so fewer are used to keep each turn under a second
+    DEFAULT_MAX_EVALUATIONS = 2000000 if np is not None else 200000
+    DEFAULT_SEED = 0
+
+    CONSISTENT_FRACTION = 0.5  # the fraction of the candidates sampled from the remaining codes
+    MIN_SAMPLE_SIZE = 200  # the fewest remaining codes a candidate is scored against, unless fewer codes remain
+
+    # the number of peg evaluations which take as long as scoring the partitions of one candidate, which is most
+    # of the time of a candidate when only a few codes remain
+    CANDIDATE_COST = 50
+
+    # the number of pairs of candidate and remaining code scored at once using NumPy, which bounds the memory used
+    BATCH_SIZE = 65536
+
+    def __init__(
+        self,
+        code: tuple[int, ...],
+        num_of_colours: int,
+        *args,
+        max_evaluations: int = DEFAULT_MAX_EVALUATIONS,
+        seed: int = DEFAULT_SEED,
+        **kwargs
+    ) -> None:
+        """Initalise the variables for the sampled algorithm.
+
+        Parameters:
+        code -- the answer code
+        num_of_colours -- the number of available colours for this game
+        args, kwargs -- the other arguments of DonaldKnuthAlgorithm
+        max_evaluations -- the number of peg evaluations each turn may use (default: DEFAULT_MAX_EVALUATIONS)
+        seed -- the seed of the samples (default: DEFAULT_SEED)
+        """
+
+        super().__init__(code, num_of_colours, *args, **kwargs)
+
+        self.max_evaluations = max_evaluations
+        self.seed = seed
+
+    def get_sample_sizes(self) -> tuple[int, int]:
+        """Return the number of candidates to score and the number of remaining codes to score each of them against.
+        The remaining codes are sampled first, with at least the square root of max_evaluations (or MIN_SAMPLE_SIZE)
+        of them, so the partitions of each candidate are accurate. The rest of max_evaluations decides the number of candidates,
+        where each candidate costs CANDIDATE_COST evaluations on top of its sample.
+        """
+
+        num_of_remaining_codes = len(self.remaining_indices)
+        num_of_candidates = self.num_of_codes - len(self.guesses_set)
+
+        sample_size = max(self.MIN_SAMPLE_SIZE, math.isqrt(self.max_evaluations), self.max_evaluations // num_of_candidates)
+        sample_size = min(num_of_remaining_codes, sample_size)
+
+        return (min(num_of_candidates, max(1, self.max_evaluations // (sample_size + self.CANDIDATE_COST))), sample_size)
+
+    def get_state_key(self) -> bytes:
+        """Return the GuessCache key of the current state, which also depends on the samples"""
+
+        return GuessCache.get_key(super().get_state_key(), type(self).__name__, self.max_evaluations, self.seed)
+
+    def find_guess_index(self) -> int:
+        """Return the index of the next guess, by scoring a sample of candidate codes against a sample of the remaining codes.
+        If every code can be scored against every remaining code within max_evaluations, they all are.
+        """
+
+        num_of_remaining_codes = len(self.remaining_indices)
+        if num_of_remaining_codes <= 2:
+            return super().find_guess_index()
+
+        rng = random.Random(self.get_state_key())
+        (num_of_candidates, sample_size) = self.get_sample_sizes()
+
+        sample = np.sort(self.remaining_indices[rng.sample(range(num_of_remaining_codes), sample_size)]) if np is not None else \
+            sorted(self.remaining_indices[i] for i in rng.sample(range(num_of_remaining_codes), sample_size))
+
+        guess_indices = {self.get_index(guess) for guess in self.guesses_set}
+        if num_of_candidates == self.num_of_codes - len(guess_indices):
+            candidates = [i for i in range(self.num_of_codes) if i not in guess_indices]
+        else:
+            # part of the candidates are remaining codes, the rest are any code (which may also be remaining codes)
+            num_of_consistent = min(num_of_remaining_codes, int(num_of_candidates * self.CONSISTENT_FRACTION))
+            candidates = {int(self.remaining_indices[i]) for i in rng.sample(range(num_of_remaining_codes), num_of_consistent)}
+            candidates.update(rng.sample(range(self.num_of_codes), num_of_candidates - num_of_consistent))
+            candidates = sorted(candidates - guess_indices)
+
+        return self.get_sampled_guess_index(candidates, sample)
+
+    def get_sampled_guess_index(self, candidates: list[int], sample: Union['np.ndarray', list[int]]) -> int:
+        """Return the index of the candidate whose partitions of the sample have the lowest score, preferring codes
+        which could be the answer code and then the lowest index. Scoring stops early if self.deadline_time passes.
+        If every code is scored against every remaining code and none with the lowest score could be the answer code,
+        the highest index is preferred instead, which is the code DonaldKnuthAlgorithm.find_guess_index guesses.
+
+        Parameters:
+        candidates -- the indexes of the candidates, in ascending order
+        sample -- the indexes of the sampled remaining codes, as a NumPy array if NumPy is installed
+        """
+
+        # codes which could be the answer code are scored first, as in min_max_score
+        is_consistent = [i in self.remaining_set for i in candidates]
+        candidates = [i for i, consistent in zip(candidates, is_consistent) if consistent] + \
+            [i for i, consistent in zip(candidates, is_consistent) if not consistent]
+
+        if np is not None:
+            sample_array = self.code_array[sample]
+            sample_counts = self.get_colour_counts(sample_array)
+            batch_size = max(1, self.BATCH_SIZE // len(sample))
+        else:
+            sample_codes = [self.get_code(i) for i in sample]
+
+        is_full_search = len(sample) == len(self.remaining_indices) and len(candidates) == self.num_of_codes - len(self.guesses_set)
+
+        best = None  # the (score, is not consistent, index) of the best candidate, which is the lowest of every candidate
+        for start in range(0, len(candidates), batch_size if np is not None else 1):
+            if self.deadline_time is not None and time.time() >= self.deadline_time:
+                self.is_search_finished = False
+                break
+
+            if np is not None:
+                batch = candidates[start:start + batch_size]
+                all_partition_sizes = self.get_batch_partition_sizes(self.code_array[batch], sample_array, sample_counts).tolist()
+            else:
+                batch = candidates[start:start + 1]
+                partition_sizes = [0] * pow(self.code_length + 1, 2)
+                for feedback in self.get_pegs_batch(self.get_code(batch[0]), sample_codes):
+                    partition_sizes[feedback] += 1
+                all_partition_sizes = [partition_sizes]
+
+            for i, partition_sizes in zip(batch, all_partition_sizes):
+                consistent = i in self.remaining_set
+                # the index is negated to prefer the highest index of the codes which could not be the answer code
+                candidate = (self.partition_scorer.score(partition_sizes), not consistent, -i if is_full_search and not consistent else i)
+                if best is None or candidate < best:
+                    best = candidate
+
+        if best is None:
+            # the deadline passed before any code was scored, as in DonaldKnuthAlgorithm.find_guess_index
+            return int(self.remaining_indices[0])
+
+        return abs(best[2])
@@ -0,0 +1,51 @@
+from algorithms.Algorithm import Algorithm
+from utils.StrategyTreeFile import StrategyTreeFile
+
+
+class StrategyTreeAlgorithm(Algorithm):
+    """Guesses the code by looking up each guess in a compiled strategy tree (see StrategyTreeFile),
+    which makes the same guesses as the algorithm it was compiled from.
+
+    Attributes:
+    tree -- the strategy tree
+    node -- the index of the node of the last guess
+    pegs -- a tuple storing the (black_pegs, white_pegs) of the last guess
+    """
+
+    def __init__(self, code: tuple[int, ...], num_of_colours: int, file_name: str) -> None:
+        """Open the strategy tree. Raise a ValueError if it was not compiled for this code length and number of colours.
+
+        Parameters:
+        code -- the answer code
+        num_of_colours -- the number of available colours for this game
+        file_name -- the path of the strategy tree file
+        """
+
+        super().__init__(code, num_of_colours)
+
+        self.tree = StrategyTreeFile.open(file_name)
+        if self.tree.code_length != self.code_length or self.tree.num_of_colours != self.num_of_colours:
+            raise ValueError(f"{file_name} was not compiled for {self.code_length} pegs and {self.num_of_colours} colours")
+
+        self.node = 0
+
+    def make_guess(self) -> None:
+        """Find the next guess by following the pegs of the last guess to the next node of the tree.
+        Raise a ValueError if the tree has no next node for the pegs, since no remaining code gives them.
+        """
+
+        if self.guess_num > 1:
+            node = self.tree.get_next_node(self.node, self.encode_pegs(self.pegs))
+            if node == 0:
+                raise ValueError(f"No remaining code gives the pegs {self.pegs}")
+
+            self.node = node
+
+        self.guess = self.get_code(self.tree.get_guess(self.node))
+
+        self.append_guess()
+
+    def get_num_of_remaining_codes(self) -> None:
+        """Return None, since the strategy tree only stores the guesses and not the remaining codes"""
+
+        return None
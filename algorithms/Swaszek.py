@@ -1,92 +1,302 @@
+import array
 import math
-import multiprocessing
+from typing import Iterator
 from algorithms.Algorithm import Algorithm
+from solvers.Solver import np
+from utils.FeedbackTable import FeedbackTable
+from utils.WorkerPool import SharedArray, WorkerPool
 
 
 class SwaszekAlgorithm(Algorithm):
     """Guesses the code using Swaszek's (1999-2000) algorithm.
     
     Attributes:
-    remaining_codes -- a set of the codes which could possibly be the answer code
+    remaining_codes -- the codes which could possibly be the answer code, as a NumPy array with one code per row if NumPy is installed, 
+                       otherwise as an array.array of their indexes (see Algorithm.get_index). This is None before the
+                       first guess is filtered, since every code is remaining and they are never all stored
     num_of_codes -- number of remaining codes
+    part -- number of codes each process should filter, if using multiple processes
     pegs -- a tuple storing the (black_pegs, white_pegs) of the last guess
+    feedback -- the encoded pegs of the last guess
+    guess_row -- the encoded feedback of every code against the last guess, if a FeedbackTable is used
+    remaining_set -- the remaining codes as a CodeSet, only if a FeedbackIndex is used (or None before the first guess is filtered)
     """
 
-    def __init__(self, code: tuple[int, ...], num_of_colours: int, use_multiple_processes: bool = False) -> None:
+    # the minimum number of codes each process should filter for multiple processes to be used. Sending a turn 
+    # to the WorkerPool takes about 2ms, which is enough time to score ~1000 codes using get_pegs 
+    # or ~13000 codes using NumPy on a single process
+    MIN_PART = 150 if np is None else 15000
+
+    def __init__(
+        self, 
+        code: tuple[int, ...], 
+        num_of_colours: int, 
+        use_multiple_processes: bool = False, 
+        use_feedback_table: bool = False, 
+        max_table_bytes: int = FeedbackTable.DEFAULT_MAX_BYTES,
+        use_feedback_index: bool = False
+    ) -> None:
         """Initalise the variables for Swaszek's algorithm.
 
         Parameters:
         code -- the answer code 
         num_of_colours -- the number of available colours for this game
         use_multiple_processes - whether the algorithm should use multiple processes (default: False)
+        use_feedback_table -- whether the algorithm should look up feedback in a FeedbackTable (default: False)
+        max_table_bytes -- the maximum number of bytes the FeedbackTable can use (default: FeedbackTable.DEFAULT_MAX_BYTES)
+        use_feedback_index -- whether the algorithm should filter the remaining codes using a FeedbackIndex (default: False)
         """
 
-        super().__init__(code, num_of_colours, use_multiple_processes)
+        super().__init__(code, num_of_colours, use_multiple_processes, use_feedback_table, max_table_bytes, use_feedback_index)
 
-        self.remaining_codes = self.generate_all_codes()
-        self.num_of_codes = len(self.remaining_codes)
+        self.remaining_codes = None
+        self.num_of_codes = pow(self.num_of_colours, self.code_length)
+
+        self.create_feedback_table()
+
+    def filter_in_pool(self) -> None:
+        """Remove all codes from self.remaining_codes, which would not give the same answer if 
+        they were the code, by filtering chunks of self.remaining_codes in the WorkerPool.
+
+        The indexes of the remaining codes are written to a SharedArray once, which every worker reads without 
+        it being copied. Each worker writes whether each code in its chunk should be kept to another 
+        SharedArray, so a task only contains the names of the arrays and the range of its chunk.
+        """
+
+        indices = self.remaining_codes if np is None else self.get_array_indices(self.remaining_codes)
+
+        codes = SharedArray(self.num_of_codes)
+        keep = SharedArray(self.num_of_codes, "B")
+        try:
+            codes.write(indices)
+            arrays = [(array.name, array.length, array.typecode) for array in (codes, keep)]
+
+            tasks = []
+            for (start, end) in WorkerPool.get_chunks(self.num_of_codes, self.num_of_processes):
+                tasks.append((self.code_length, self.num_of_colours, self.guess, self.feedback, arrays, start, end))
+
+            WorkerPool.map(self.num_of_processes, SwaszekAlgorithm.filter_worker, tasks)
+
+            is_kept = keep.read()
+        finally:
+            codes.close(unlink=True)
+            keep.close(unlink=True)
+
+        if np is None:
+            self.remaining_codes = array.array("q", (i for i, kept in zip(self.remaining_codes, is_kept) if kept))
+        else:
+            self.remaining_codes = self.remaining_codes[is_kept.astype(bool)]
+
+    @staticmethod
+    def filter_worker(task: tuple) -> int:
+        """Filter a chunk of codes for a task sent by filter_in_pool, in a worker process of 
+        the WorkerPool, and return the number of codes which should be kept
 
-    def filter(self, start: int, end: int, remaining_codes: list[tuple[int, ...]]) -> None:
-        """Remove all codes from self.remaining_codes, which would not give the 
-        same answer if they were the code, within the given index range [start, end)
-        
         Parameters:
-        start -- the index at which this process should start filtering
-        end -- the index at which this process should stop
-        remaining_codes -- output list containing all filtered codes
+        task -- tuple of (code_length, num_of_colours, guess, feedback, arrays, start, end)
         """
 
-        # It is faster to create an intermediate list and update remaining_codes at the 
-        # end since remaining_codes has a mutex guard and I do not want each process to wait 
-        # for write access each time they want to append a code
-        codes = []
+        (code_length, num_of_colours, guess, feedback, arrays, start, end) = task
+
+        algorithm = WorkerPool.get_worker_algorithm(Algorithm, code_length, num_of_colours)
+        [codes, keep] = WorkerPool.attach(arrays)
+
+        indices = codes.read(start, end)
+        if np is None:
+            is_kept = [code_feedback == feedback for code_feedback in algorithm.get_pegs_batch(guess, map(algorithm.get_code, indices))]
+        else:
+            is_kept = algorithm.get_pegs_batch(guess, algorithm.get_array_codes(indices)) == feedback
+
+        keep.write(is_kept, start)
 
-        for i in range(start, end):
-            if self.get_pegs(self.guess, self.remaining_codes[i]) == self.pegs:
-                codes.append(self.remaining_codes[i])
+        return is_kept.count(True) if np is None else int(is_kept.sum())
 
-        remaining_codes += codes
+    def filter_with_index(self) -> None:
+        """Remove all codes from self.remaining_codes, which would not give the same answer if they were the code, 
+        by a bitwise and of self.remaining_set and the codes which give self.feedback against self.guess in the FeedbackIndex
+        """
+
+        codes = self.feedback_index.get(self.get_index(self.guess), self.feedback)
+        if self.remaining_set is not None:  # before the first guess is filtered, every code is remaining
+            codes = codes & self.remaining_set
+
+        self.remaining_set = codes
+
+        indices = codes.get_indices()
+        self.remaining_codes = indices if np is None else self.get_array_codes(indices)
+
+    def get_consistent_codes(self, start: int, end: int) -> 'np.ndarray':
+        """Return the codes in self.remaining_codes, within the given index range [start, end), 
+        which would give the same pegs as self.guess if they were the code. 
+        If NumPy is installed, the codes are scored in one pass using get_pegs_batch.
+
+        Parameters:
+        start -- the index at which to start filtering
+        end -- the index at which to stop filtering
+        """
+
+        codes = self.remaining_codes[start:end]
+
+        if np is None:
+            if self.feedback_table is None:
+                score = self.get_scorer(self.guess, encoded=True)  # the colours of self.guess are only counted once for this turn
+                return array.array("q", (i for i in codes if score(self.get_code(i)) == self.feedback))
+
+            return array.array("q", (i for i in codes if self.guess_row[i] == self.feedback))
+
+        if self.feedback_table is None:
+            feedback = self.get_pegs_batch(self.guess, codes)
+        else:
+            feedback = self.guess_row[self.get_array_indices(codes)]
+
+        return codes[feedback == self.feedback]
+
+    def get_first_consistent_codes(self) -> 'np.ndarray':
+        """Return every code which would give the same pegs as the first guess if it was the code, in the order
+        of their indexes, without generating any other codes. This is a NumPy array with one code per row if
+        NumPy is installed, otherwise it is an array.array of their indexes.
+
+        Codes are built one position at a time from every prefix which could still be consistent. A prefix is kept
+        only if its number of black pegs, and its number of pegs of either colour, have not gone over the pegs of 
+        the first guess and can still reach them using the positions which are left.
+        """
+
+        (black_pegs, white_pegs) = self.pegs
+        num_of_pegs = black_pegs + white_pegs
+
+        guess_colours = sorted(set(self.guess))
+        guess_counts = [self.guess.count(colour) for colour in guess_colours]
+
+        if np is None:
+            return array.array("q", self.generate_first_consistent_indices(0, 0, 0, 0, dict.fromkeys(guess_colours, 0)))
+
+        # the column of each colour in counts, or -1 if it is not in the guess
+        colour_columns = np.full(self.num_of_colours, -1)
+        colour_columns[guess_colours] = np.arange(len(guess_colours))
+
+        # int8 is used since no count can be more than code_length, which keeps the arrays of prefixes small
+        codes = np.zeros((1, 0), dtype=np.uint8)  # every consistent prefix, one per row
+        blacks = np.zeros(1, dtype=np.int8)  # the black pegs of each prefix
+        pegs = np.zeros(1, dtype=np.int8)  # the pegs of either colour of each prefix
+        counts = np.zeros((1, len(guess_colours)), dtype=np.int8)  # how many times each prefix uses each colour of the guess
+
+        for k in range(self.code_length):
+            positions_left = self.code_length - k - 1
+
+            # the blacks and pegs of every prefix followed by every colour, with one row per prefix and one column per colour
+            new_blacks = blacks[:, None] + (np.arange(self.num_of_colours) == self.guess[k]).astype(np.int8)
+            new_pegs = np.repeat(pegs[:, None], self.num_of_colours, axis=1)
+            new_pegs[:, guess_colours] += counts < guess_counts
+
+            is_kept = (new_blacks <= black_pegs) & (new_blacks + positions_left >= black_pegs)
+            is_kept &= (new_pegs <= num_of_pegs) & (new_pegs + positions_left >= num_of_pegs)
+
+            # np.nonzero returns the kept prefixes and colours in order, so the codes stay in the order of their indexes
+            (rows, colours) = np.nonzero(is_kept)
+
+            codes = np.column_stack((codes[rows], colours.astype(np.uint8)))
+            blacks = new_blacks[rows, colours]
+            pegs = new_pegs[rows, colours]
+
+            counts = counts[rows]
+            is_guess_colour = colour_columns[colours] >= 0
+            counts[np.flatnonzero(is_guess_colour), colour_columns[colours[is_guess_colour]]] += 1
+
+        return codes
+
+    def generate_first_consistent_indices(self, k: int, index: int, blacks: int, pegs: int, counts: dict[int, int]) -> Iterator[int]:
+        """Generate the index of every consistent code which starts with a prefix, in order 
+        (see get_first_consistent_codes, which this is the same as without NumPy)
+
+        Parameters:
+        k -- the length of the prefix
+        index -- the index of the prefix, as if it was a code of length k
+        blacks -- the black pegs of the prefix
+        pegs -- the pegs of either colour of the prefix
+        counts -- how many times the prefix uses each colour of the guess
+        """
+
+        (black_pegs, white_pegs) = self.pegs
+        num_of_pegs = black_pegs + white_pegs
+        positions_left = self.code_length - k - 1
+
+        for colour in range(self.num_of_colours):
+            new_blacks = blacks + (colour == self.guess[k])
+            new_pegs = pegs + (colour in counts and counts[colour] < self.guess.count(colour))
+
+            if new_blacks > black_pegs or new_blacks + positions_left < black_pegs:
+                continue
+            if new_pegs > num_of_pegs or new_pegs + positions_left < num_of_pegs:
+                continue
+
+            if positions_left == 0:
+                yield index * self.num_of_colours + colour
+                continue
+
+            if colour in counts:
+                counts[colour] += 1
+            yield from self.generate_first_consistent_indices(k + 1, index * self.num_of_colours + colour, new_blacks, new_pegs, counts)
+            if colour in counts:
+                counts[colour] -= 1
+
+    def get_remaining_code(self, i: int) -> tuple[int, ...]:
+        """Return the code at index i of self.remaining_codes as a tuple"""
+
+        return self.get_code(self.remaining_codes[i]) if np is None else tuple(self.remaining_codes[i].tolist())
+
+    def get_remaining_codes(self) -> list[tuple[int, ...]]:
+        """Return the codes which could possibly be the answer code"""
+
+        if self.remaining_codes is None:
+            return list(self.generate_codes())
+
+        return [self.get_code(i) for i in self.remaining_codes] if np is None else [tuple(code) for code in self.remaining_codes.tolist()]
         
-    def get_next_guess(self) -> tuple[int, int]:
+    def get_num_of_remaining_codes(self) -> int:
+        """Return the number of codes which could possibly be the answer code, without creating them"""
+
+        return self.num_of_codes if self.remaining_codes is None else len(self.remaining_codes)
+
+    def make_guess(self) -> None:
+        """Find the next guess using Swaszek's algorithm."""
+
         if self.guess_num == 1:
             self.guess = self.create_initial_code()
         else:
-            part = math.ceil(self.num_of_codes / self.num_of_processes)  # calculate how many codes each process will filter
+            self.feedback = self.encode_pegs(self.pegs)
+            if self.feedback_table is not None:
+                # look up the feedback of every code against self.guess once for this turn
+                self.guess_row = self.feedback_table.get_row(self.get_index(self.guess))
+
+            self.part = math.ceil(self.num_of_codes / self.num_of_processes)  # calculate how many codes each process will filter
             
-            # I do not use multiple processes if use_multiple_processes is true and part is 
-            # less than 150 because it takes more time to initalise every process compared to 
-            # just searching through (150 * num_of_processes) codes on a single process
-            if not self.use_multiple_processes or (self.use_multiple_processes and part < 150):
-                self.remaining_codes = [code for code in self.remaining_codes if self.get_pegs(self.guess, code) == self.pegs]
+            # I do not use multiple processes if use_multiple_processes is true and part is less than 
+            # MIN_PART because it takes more time to send the codes to every process compared to 
+            # just searching through (MIN_PART * num_of_processes) codes on a single process
+            if self.feedback_index is not None:
+                self.filter_with_index()
+            elif self.remaining_codes is None:
+                # only the codes which are consistent with the first guess are generated
+                self.remaining_codes = self.get_first_consistent_codes()
+            elif not self.use_multiple_processes or (self.use_multiple_processes and self.part < self.MIN_PART):
+                self.remaining_codes = self.get_consistent_codes(0, self.num_of_codes)
             else:
-                manager = multiprocessing.Manager()
-                remaining_codes = manager.list()  # create a mutex list which can safely be shared between concurrent processes
+                self.filter_in_pool()
 
-                processes = []
-                remaining = self.num_of_codes  # number of remaining codes which have not been allocated a process
-                while remaining > 0:
-                    args = (max(0, remaining-part), remaining, remaining_codes)
-                    remaining -= part
+            self.num_of_codes = len(self.remaining_codes)
+            self.guess = self.choose_guess()
 
-                    process = multiprocessing.Process(target=self.filter, args=args) 
-                    processes.append(process)
-                    process.start()
+        self.append_guess()
 
-                for process in processes:  # wait for all processes to terminate
-                    process.join() 
-
-                self.remaining_codes = remaining_codes  # update self.remaining_codes to the results from the processes
-                self.num_of_codes = len(self.remaining_codes)
-            
-            # find the first remaining code which has not been used as a guess before
-            self.guess = self.remaining_codes[0]
-            i = 1
-            while self.guess in self.guesses_set and i < len(self.guesses): 
-                self.guess = self.remaining_codes[i]
-                i += 1
-
-        self.append_guess()       
+    def choose_guess(self) -> tuple[int, ...]:
+        """Return the next guess from the filtered self.remaining_codes, which is the first remaining code 
+        which has not been used as a guess before
+        """
 
-        self.pegs = (black_pegs, white_pegs) = self.get_pegs(self.guess, self.code)
+        guess = self.get_remaining_code(0)
+        i = 1
+        while guess in self.guesses_set and i < len(self.guesses): 
+            guess = self.get_remaining_code(i)
+            i += 1
 
-        return (black_pegs, white_pegs)
+        return guess
@@ -8,6 +8,7 @@ class ExitCodes(Enum):
     OUTPUT_FILE_ERROR = 3  # There was an issue with the output file
     CODE_ERROR        = 4  # No or ill-formed code provided
     PLAYER_ERROR      = 5  # No or ill-formed player provided
+    GAME_ERROR        = 6  # The game failed unexpectedly (only reported by MastermindBatch.py, so the other games still run)
 
 
 class Player(Enum):
@@ -1,5 +1,15 @@
+import os
+from typing import Union
 from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from algorithms.Hybrid import HybridAlgorithm
+from algorithms.SampledMinimax import SampledMinimaxAlgorithm
+from algorithms.StrategyTree import StrategyTreeAlgorithm
 from algorithms.Swaszek import SwaszekAlgorithm
+from utils.GameMetrics import GameMetrics
+from utils.GuessCache import GuessCache
+from utils.PartitionScorer import PartitionScorer
+from utils.SelectionProfile import SelectionProfile
+from utils.TableSnapshot import TableSnapshot
 
 
 class ComputerSolver:
@@ -7,36 +17,214 @@ class ComputerSolver:
     
     Attributes:
     algorithm -- the algorithm which should be used to find this code
+    metrics -- the GameMetrics recording every guess, or None if metrics should not be recorded
+    reused_algorithms -- algorithms which have not made any guesses, stored against their class and parameters, 
+                         which are copied for each game instead of being created again (see create_algorithm)
     """
 
-    def __init__(self, code: tuple[int, ...], num_of_colours: int) -> None:
+    # the directory containing the strategy trees compiled by CompileStrategy.py
+    STRATEGY_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "strategies")
+
+    # the SelectionProfile written by Calibrate.py
+    SELECTION_PROFILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "selection_profile.json")
+
+    ALGORITHMS = {
+        "DonaldKnuth": DonaldKnuthAlgorithm, 
+        "Swaszek": SwaszekAlgorithm, 
+        "SampledMinimax": SampledMinimaxAlgorithm, 
+        "Hybrid": HybridAlgorithm
+    }
+
+    # the sampled algorithm stores every code, so the hybrid algorithm is used for more codes than this
+    MAX_SAMPLED_CODES = 1000000
+
+    reused_algorithms = {}
+
+    def __init__(
+        self, 
+        code: tuple[int, ...], 
+        num_of_colours: int, 
+        use_feedback_table: bool = False, 
+        strategy_file: Union[str, None] = None,
+        use_multiple_processes: bool = True,
+        reuse_algorithm: bool = False,
+        profile_file: Union[str, None] = None,
+        latency_target: Union[float, None] = None,
+        record_metrics: bool = False,
+        partition_scorer: str = "minimax",
+        guess_cache_file: Union[str, None] = None,
+        deadline: Union[float, None] = None,
+        seed: Union[int, None] = None,
+        use_feedback_index: bool = False,
+        snapshot_directory: Union[str, None] = None
+    ) -> None:
         """Intialise the algorithm based on the number_of_colours and code length
         Donald Knuth's algorithm takes more time but less guesses. 
         Swaszek's algorithm takes less time but more guesses. 
+        If a strategy tree has been compiled for the number_of_colours and code length, it is used instead, 
+        unless its file cannot be read.
+        Otherwise, if this machine has been calibrated, the algorithm is picked using its SelectionProfile.
         
         Parameters: 
         code -- the answer code
         num_of_colours -- the number of inputted colours
+        use_feedback_table -- whether the algorithm should look up feedback in a FeedbackTable (default: False)
+        strategy_file -- the path of a strategy tree file to use (default: the compiled file in STRATEGY_DIRECTORY, if it exists)
+        use_multiple_processes -- whether the algorithm may use multiple processes, which is not possible 
+                                  inside a worker process of a multiprocessing.Pool (default: True)
+        reuse_algorithm -- whether the algorithm should be copied from the last game with the same parameters (default: False)
+        profile_file -- the path of the SelectionProfile to use (default: SELECTION_PROFILE)
+        latency_target -- the number of seconds the game should take (default: the profile's latency target)
+        record_metrics -- whether every guess should be measured by a GameMetrics (default: False)
+        partition_scorer -- the name of the PartitionScorer Donald Knuth's algorithm (or the hybrid algorithm) uses, 
+                            if it is picked (default: "minimax").
+                            Strategy trees are compiled using "minimax", so they are not used with any other scorer
+        guess_cache_file -- the file of the GuessCache Donald Knuth's algorithm uses, if it is picked (default: None). 
+                            If it is None and reuse_algorithm is True, a GuessCache which is only stored in memory is used
+        deadline -- the number of seconds Donald Knuth's algorithm may take to find each guess, if it is picked (default: None, no limit).
+                    When it passes, the best guess found so far is used (see DonaldKnuthAlgorithm.deadline)
+        seed -- the seed of the samples of the sampled algorithm, if it is picked (default: None, SampledMinimaxAlgorithm.DEFAULT_SEED)
+        use_feedback_index -- whether the algorithm should filter the remaining codes using a FeedbackIndex, which is shared
+                              by every game in this process with the same code length and number of colours (default: False)
+        snapshot_directory -- the directory of the TableSnapshots the code tables are memory-mapped from, which are written
+                              the first time the tables are generated (default: None, the directory set for this process if any)
         """
 
-        num_of_codes = pow(num_of_colours, len(code))
+        if snapshot_directory is not None:
+            TableSnapshot.use_directory(snapshot_directory)
+
+        if strategy_file is None:
+            strategy_file = self.get_strategy_file_name(len(code), num_of_colours)
+
+        if partition_scorer not in PartitionScorer.NAMES:
+            raise ValueError(f"There is no partition scorer called {partition_scorer}")
+
+        self.algorithm = None
+        if partition_scorer == "minimax" and os.path.exists(strategy_file):
+            try:
+                self.algorithm = self.create_algorithm(reuse_algorithm, StrategyTreeAlgorithm, code, num_of_colours, strategy_file)
+            except (OSError, ValueError):  # the file is incomplete, from another version or compiled for other codes
+                pass
+
+        if self.algorithm is None:
+            profile = SelectionProfile.open(profile_file or self.SELECTION_PROFILE)
+            selection = profile.select(len(code), num_of_colours, latency_target) if profile is not None else None
+
+            if selection is not None:
+                (algorithm_name, algorithm_uses_multiple_processes) = selection
+                algorithm_class = self.ALGORITHMS[algorithm_name]
+            else:
+                (algorithm_class, algorithm_uses_multiple_processes) = self.get_default_selection(pow(num_of_colours, len(code)))
+
+            # only Donald Knuth's algorithm (and the sampled algorithm based on it) caches its guesses and stops at a deadline, 
+            # and the hybrid algorithm also scores partitions once it switches to minimax
+            options = {"use_feedback_index": use_feedback_index}
+            if issubclass(algorithm_class, (DonaldKnuthAlgorithm, HybridAlgorithm)):
+                options["partition_scorer"] = partition_scorer
+            if issubclass(algorithm_class, DonaldKnuthAlgorithm):
+                options["deadline"] = deadline
+                if guess_cache_file is not None or reuse_algorithm:
+                    options["guess_cache"] = GuessCache.open(guess_cache_file)
+            if algorithm_class is SampledMinimaxAlgorithm and seed is not None:
+                options["seed"] = seed
+
+            self.algorithm = self.create_algorithm(
+                reuse_algorithm, 
+                algorithm_class, 
+                code, 
+                num_of_colours, 
+                algorithm_uses_multiple_processes and use_multiple_processes, 
+                use_feedback_table,
+                **options
+            )
+
+        self.metrics = GameMetrics(self.algorithm) if record_metrics else None
+
+    @classmethod
+    def get_default_selection(cls, num_of_codes: int) -> tuple[type, bool]:
+        """Return the (algorithm_class, use_multiple_processes) used when this machine has not been calibrated
         
+        Parameters:
+        num_of_codes -- the number of possible codes
+        """
+
         # I benchmarked with a variety of code lengths and number of colours and these ranges
-        # provided the best number of guesses vs time taken ratio
-        if num_of_codes <= 2187:
-            self.algorithm = DonaldKnuthAlgorithm(code, num_of_colours)
-        elif num_of_codes <= 15625:
-            self.algorithm = DonaldKnuthAlgorithm(code, num_of_colours, True)
-        elif num_of_codes <= 390625:
-            self.algorithm = SwaszekAlgorithm(code, num_of_colours)
+        # provided the best number of guesses vs time taken ratio. The multiple process ranges start 
+        # lower now that processes are reused between turns (see WorkerPool), and Swaszek's algorithm 
+        # only sends a turn to other processes when it has enough codes (see SwaszekAlgorithm.MIN_PART).
+        # Donald Knuth's algorithm only scores one code of each orbit (see SymmetryGroup), so it is used for more codes
+        # Above that, the sampled algorithm takes a bounded time per guess and still takes fewer guesses than Swaszek's algorithm,
+        # and for codes which are too many to store, the hybrid algorithm switches from Swaszek's algorithm to minimax 
+        # once few enough codes remain
+        # These ranges can be checked on other machines by running Benchmark.py, or replaced by running Calibrate.py
+        if num_of_codes <= 1296:
+            return (DonaldKnuthAlgorithm, False)
+        elif num_of_codes <= 46656:
+            return (DonaldKnuthAlgorithm, True)
+        elif num_of_codes <= cls.MAX_SAMPLED_CODES:
+            return (SampledMinimaxAlgorithm, False)
         else:
-            self.algorithm = SwaszekAlgorithm(code, num_of_colours, True)
+            return (HybridAlgorithm, True)
+
+    @classmethod
+    def create_algorithm(cls, reuse_algorithm: bool, algorithm_class: type, code: tuple[int, ...], num_of_colours: int, *args, **kwargs) -> 'Algorithm':
+        """Return a new instance of algorithm_class. If reuse_algorithm is True, the instance is a copy of one created 
+        for an earlier game with the same parameters, so the codes (and FeedbackTable) are only generated once per process.
+
+        Parameters:
+        reuse_algorithm -- whether the algorithm should be copied from an earlier game
+        algorithm_class -- the class of the algorithm
+        code -- the answer code
+        num_of_colours -- the number of inputted colours
+        args, kwargs -- the other arguments of algorithm_class
+        """
+
+        if not reuse_algorithm:
+            return algorithm_class(code, num_of_colours, *args, **kwargs)
+
+        key = (algorithm_class, len(code), num_of_colours, *args, *sorted(kwargs.items()))
+        if key not in cls.reused_algorithms:
+            cls.reused_algorithms[key] = algorithm_class(code, num_of_colours, *args, **kwargs)
+
+        algorithm = cls.reused_algorithms[key].copy()
+        algorithm.code = code
+
+        return algorithm
+
+    @classmethod
+    def get_strategy_file_name(cls, code_length: int, num_of_colours: int) -> str:
+        """Return the path of the strategy tree which CompileStrategy.py compiles for the code length and number of colours"""
+
+        return os.path.join(cls.STRATEGY_DIRECTORY, f"knuth-{code_length}-{num_of_colours}.mmst")
 
     def get_next_guess(self) -> tuple[int, int]:
         """Get the next guess from the chosen algorithm and return this guess' (black_pegs, white_pegs)"""
         
+        if self.metrics is not None:
+            return self.metrics.get_next_guess()
+
         return self.algorithm.get_next_guess()
 
+    def make_guess(self, pegs: Union[tuple[int, int], None]) -> tuple[int, ...]:
+        """Make the next guess using pegs given by the player instead of the answer code, and return the guess
+
+        Parameters:
+        pegs -- the (black_pegs, white_pegs) of the previous guess, or None if this is the first guess
+        """
+
+        if pegs is not None:
+            self.algorithm.pegs = pegs
+
+        self.algorithm.make_guess()
+        return self.algorithm.guess
+
+    def save_guess_cache(self) -> None:
+        """Write the GuessCache of the algorithm to its file, if it has one"""
+
+        guess_cache = getattr(self.algorithm, "guess_cache", None)
+        if guess_cache is not None:
+            guess_cache.save()
+
     def inc_guess_num(self) -> int:
         """Increase the number of guesses"""
         
@@ -2,13 +2,19 @@ from solvers.Solver import Solver
 
 
 class HumanSolver(Solver):
-    """Represents a human player"""
+    """Represents a human player
+
+    Attributes:
+    score -- returns the pegs of a guess against the code (see Solver.get_scorer)
+    """
 
     def __init__(self, code: tuple[int, ...]) -> None:
-        """Initalise the super class"""
+        """Initalise the super class and the scorer for the code, which is used for every guess"""
 
         super().__init__(code)
 
+        self.score = self.get_scorer(self.code)
+
     def get_next_guess(self, guess: tuple[int, ...]) -> tuple[int, int]:
         """Return the (black_pegs, white_pegs) for the inputted guess
         
@@ -16,4 +22,4 @@ class HumanSolver(Solver):
         guess - the code to compare to the correct code
         """ 
 
-        return self.get_pegs(guess, self.code)
+        return self.score(guess)
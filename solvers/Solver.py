@@ -1,3 +1,38 @@
+import array
+import functools
+from types import ModuleType
+from typing import Callable, Iterable, Union
+from utils.PegScorer import PegScorer
+
+
+@functools.lru_cache(maxsize=None)
+def import_numpy() -> Union[ModuleType, None]:
+    """Return the NumPy module, or None if it is not installed. It is only imported the first time it is needed,
+    so games which never score codes in batches (e.g. human games) do not wait for it to be imported.
+    """
+
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional, without it codes are scored one at a time
+        return None
+
+    return numpy
+
+
+def __getattr__(name: str) -> Union[ModuleType, None]:
+    """Return NumPy (or None) as the np attribute of this module, so `from solvers.Solver import np` imports it when
+    a module which scores codes is imported rather than when this module is imported
+
+    Parameters:
+    name -- the name of the attribute
+    """
+
+    if name == "np":
+        return import_numpy()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class Solver:
     """Provides properties and methods required to play the game
     
@@ -55,3 +90,79 @@ class Solver:
                 used[i] = True
 
         return (black_pegs, white_pegs)
+
+    def get_scorer(self, code: tuple[int, ...], encoded: bool = False) -> Callable[[tuple[int, ...]], tuple[int, int]]:
+        """Return a function which returns the same as get_pegs(guess, code) for any guess, which is faster when many
+        guesses are scored against the same code since the colours of the code are only counted once (see PegScorer).
+        Since the pegs are the same if the guess and the code are swapped, it can also score many codes against one guess.
+
+        Parameters:
+        code -- tuple of integers representing the fixed code
+        encoded -- whether the function should return the pegs encoded by encode_pegs (default: False)
+        """
+
+        return PegScorer.create(code, encoded)
+
+    def encode_pegs(self, pegs: tuple[int, int]) -> int:
+        """Return the (black_pegs, white_pegs) as a single integer less than (code_length + 1)^2, which fits in one byte
+        for codes of up to 15 pegs (see get_feedback_typecode)
+
+        Parameters:
+        pegs -- tuple of (black_pegs, white_pegs)
+        """
+
+        (black_pegs, white_pegs) = pegs
+        return black_pegs * (self.code_length + 1) + white_pegs
+
+    def decode_pegs(self, feedback: int) -> tuple[int, int]:
+        """Return the (black_pegs, white_pegs) for feedback created by encode_pegs
+
+        Parameters:
+        feedback -- the encoded pegs
+        """
+
+        return divmod(feedback, self.code_length + 1)
+
+    def get_feedback_typecode(self) -> str:
+        """Return the typecode (of the array module) which fits every encoded pegs (see encode_pegs): "B" (one byte)
+        if there are at most 256 of them, which is true for codes of up to 15 pegs, otherwise "H" (two bytes)
+        """
+
+        return "B" if pow(self.code_length + 1, 2) <= 256 else "H"
+
+    def create_feedback_array(self, feedback: Iterable[int]) -> Union[bytearray, array.array]:
+        """Return encoded pegs as a bytearray, or as an array.array of get_feedback_typecode() if they do not fit in one byte
+
+        Parameters:
+        feedback -- the encoded pegs
+        """
+
+        typecode = self.get_feedback_typecode()
+        return bytearray(feedback) if typecode == "B" else array.array(typecode, feedback)
+
+    def get_pegs_batch(self, guess: tuple[int, ...], codes: 'np.ndarray') -> 'np.ndarray':
+        """Return the encoded pegs (see encode_pegs) of a guess against every code in codes.
+        If NumPy is installed, all codes are scored in one vectorised pass and an array of get_feedback_typecode()
+        (uint8, or uint16 for codes of more than 15 pegs) is returned. Otherwise, each code is scored using get_scorer
+        and the pegs are returned by create_feedback_array.
+
+        Parameters:
+        guess -- tuple of integers representing a guess
+        codes -- array with one code per row (or a list of codes if NumPy is not installed)
+        """
+
+        np = import_numpy()
+        if np is None:
+            return self.create_feedback_array(map(self.get_scorer(guess, encoded=True), codes))
+
+        black_pegs = (codes == np.array(guess, dtype=codes.dtype)).sum(axis=1)
+
+        # the number of pegs of either colour is the sum of the minimum count of each colour in the
+        # guess and the code, so only the colours in the guess need to be counted
+        pegs = np.zeros(len(codes), dtype=np.int64)
+        for colour in set(guess):
+            pegs += np.minimum((codes == colour).sum(axis=1), guess.count(colour))
+
+        white_pegs = pegs - black_pegs
+
+        return (black_pegs * (self.code_length + 1) + white_pegs).astype(self.get_feedback_typecode())
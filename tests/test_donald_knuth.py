@@ -0,0 +1,107 @@
+import collections
+import unittest
+from unittest import mock
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from algorithms.SampledMinimax import SampledMinimaxAlgorithm
+
+
+class TestDonaldKnuth(unittest.TestCase):
+    """Donald Knuth's algorithm makes the same guesses as a full minimax search, although it stops scoring a code once
+    it cannot have the lowest score (see min_max_score) and only scores one code of each orbit (see SymmetryGroup)
+    """
+
+    def get_full_search_guesses(self, code: tuple[int, ...], num_of_colours: int, feedback: list[list[int]]) -> list[int]:
+        """Return the indexes of the guesses of a minimax search which fully scores every code that has not been guessed.
+        The guess is the first code with the lowest score which could be the answer code, or else the last code with the lowest score.
+        Count the guesses which could not be the answer code in self.num_of_inconsistent_guesses.
+
+        Parameters:
+        code -- the answer code
+        num_of_colours -- the number of colours of every code
+        feedback -- the encoded pegs of every pair of codes, by their indexes
+        """
+
+        algorithm = DonaldKnuthAlgorithm(code, num_of_colours)
+        answer = algorithm.get_index(code)
+        guesses = [algorithm.get_index(algorithm.create_initial_code())]
+        remaining = range(len(feedback))
+
+        while guesses[-1] != answer:
+            remaining = [j for j in remaining if feedback[guesses[-1]][j] == feedback[guesses[-1]][answer]]
+
+            scores = {}
+            for i in range(len(feedback)):
+                if i not in guesses:
+                    scores[i] = max(collections.Counter(feedback[i][j] for j in remaining).values())
+
+            min_score = min(scores.values())
+            codes = [i for i in sorted(scores) if scores[i] == min_score]
+            consistent_codes = [i for i in codes if i in remaining]
+
+            if len(consistent_codes) > 0:
+                guesses.append(consistent_codes[0])
+            else:
+                guesses.append(codes[-1])
+                self.num_of_inconsistent_guesses += 1
+
+        return guesses
+
+    def get_guesses(self, algorithm: DonaldKnuthAlgorithm) -> list[int]:
+        """Play a game with the algorithm until it guesses the answer code and return the indexes of its guesses"""
+
+        while True:
+            algorithm.inc_guess_num()
+            if algorithm.get_next_guess() == (algorithm.code_length, 0):
+                return [algorithm.get_index(guess) for guess in algorithm.guesses]
+
+    def test_same_guesses_as_full_search(self) -> None:
+        """Every game of 3 and 4 pegs with 4 colours makes the same guesses single- and multi-process, with and without
+        a FeedbackTable, including the guesses where no code with the lowest score could be the answer code
+        """
+
+        # with NumPy, scoring a code only stops between chunks, so the chunks are made smaller than the remaining codes
+        patcher = mock.patch.object(DonaldKnuthAlgorithm, "PRUNE_CHUNK", 8)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for (code_length, num_of_colours) in ((3, 4), (4, 4)):
+            algorithm = DonaldKnuthAlgorithm(tuple([0] * code_length), num_of_colours)
+            codes = [algorithm.get_code(i) for i in range(algorithm.num_of_codes)]
+            feedback = [[algorithm.encode_pegs(algorithm.get_pegs(guess, code)) for code in codes] for guess in codes]
+
+            self.num_of_inconsistent_guesses = 0
+            expected = {code: self.get_full_search_guesses(code, num_of_colours, feedback) for code in codes}
+            if code_length == 4:
+                # the guesses where no code with the lowest score could be the answer code are the last code of 
+                # the last scored orbit with the lowest score (see SymmetryGroup.get_last_index), which 4 pegs has
+                self.assertGreater(self.num_of_inconsistent_guesses, 0)
+
+            for use_multiple_processes in (False, True):
+                for use_feedback_table in (False, True):
+                    skipped_evaluations = 0
+                    for code in codes:
+                        algorithm = DonaldKnuthAlgorithm(code, num_of_colours, use_multiple_processes, use_feedback_table)
+                        self.assertEqual(self.get_guesses(algorithm), expected[code], (code, use_multiple_processes, use_feedback_table))
+                        skipped_evaluations += algorithm.skipped_evaluations
+
+                    # the worker processes may have been started before PRUNE_CHUNK was changed, in which case they 
+                    # score every code of these games in one chunk and skip nothing
+                    if not use_multiple_processes:
+                        self.assertGreater(skipped_evaluations, 0)
+
+    def test_sampled_minimax_full_search(self) -> None:
+        """The sampled algorithm makes the same guesses as Donald Knuth's algorithm when it can score every code
+        against every remaining code, for every game of 4 pegs with 4 colours
+        """
+
+        # enough peg evaluations to score every code against every code, including the cost of each candidate
+        max_evaluations = pow(4, 8) * 2
+
+        for i in range(pow(4, 4)):
+            code = DonaldKnuthAlgorithm((0, 0, 0, 0), 4).get_code(i)
+            expected = self.get_guesses(DonaldKnuthAlgorithm(code, 4))
+            self.assertEqual(self.get_guesses(SampledMinimaxAlgorithm(code, 4, max_evaluations=max_evaluations)), expected, code)
+
+
+if __name__ == '__main__':
+    unittest.main()
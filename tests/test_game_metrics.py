@@ -0,0 +1,36 @@
+import unittest
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from algorithms.Swaszek import SwaszekAlgorithm
+from utils.GameMetrics import GameMetrics
+
+
+class TestGameMetrics(unittest.TestCase):
+    """The peg evaluations of a game are counted whether the pegs are found or looked up in a FeedbackTable"""
+
+    def get_peg_evaluations(self, algorithm: 'Algorithm') -> list[int]:
+        """Play a game with the algorithm, which has not made any guesses, and return the peg evaluations of every guess"""
+
+        metrics = GameMetrics(algorithm)
+        while True:
+            algorithm.inc_guess_num()
+            if metrics.get_next_guess() == (algorithm.code_length, 0):
+                return [guess["peg_evaluations"] for guess in metrics.guesses]
+
+    def test_feedback_table(self) -> None:
+        """A game looks up as many pegs in a FeedbackTable as it would find without one, and the table of the copies
+        of the algorithm is not counted
+        """
+
+        for (algorithm_class, code, num_of_colours) in ((DonaldKnuthAlgorithm, (1, 2, 3, 0), 4), (SwaszekAlgorithm, (1, 2, 3, 0), 6)):
+            expected = self.get_peg_evaluations(algorithm_class(code, num_of_colours))
+            self.assertGreater(sum(expected), len(expected))
+
+            algorithm = algorithm_class(code, num_of_colours, False, True)
+            self.assertEqual(self.get_peg_evaluations(algorithm.copy()), expected)
+
+            # the table of the algorithm which was copied is used without counting
+            self.assertNotIn("get_row", vars(algorithm.feedback_table))
+
+
+if __name__ == '__main__':
+    unittest.main()
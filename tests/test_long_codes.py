@@ -0,0 +1,96 @@
+import os
+import random
+import unittest
+from algorithms.Hybrid import HybridAlgorithm
+from algorithms.Swaszek import SwaszekAlgorithm
+from solvers.ComputerSolver import ComputerSolver
+from solvers.Solver import Solver
+from utils.FeedbackTable import FeedbackTable
+
+
+class TestLongCodes(unittest.TestCase):
+    """Codes of more than 15 pegs, whose encoded pegs do not fit in one byte (see Solver.get_feedback_typecode)"""
+
+    def play(self, algorithm: 'Algorithm', max_guesses: int = 50) -> int:
+        """Play a game with the algorithm until it guesses the answer code and return the number of guesses
+
+        Parameters:
+        algorithm -- the algorithm, created with the answer code
+        max_guesses -- the number of guesses after which the game fails (default: 50)
+        """
+
+        for guess_num in range(1, max_guesses + 1):
+            algorithm.inc_guess_num()
+            if algorithm.get_next_guess() == (algorithm.code_length, 0):
+                return guess_num
+
+        self.fail(f"{type(algorithm).__name__} did not guess {algorithm.code} in {max_guesses} guesses")
+
+    def test_get_pegs_batch(self) -> None:
+        """The pegs of a guess against many codes are the same as the pegs of each code, including those over 255"""
+
+        rng = random.Random(0)
+        code_length = 17
+        solver = Solver(tuple([0] * code_length))
+
+        guess = tuple(rng.randrange(2) for _ in range(code_length))
+        codes = [guess] + [tuple(rng.randrange(2) for _ in range(code_length)) for _ in range(200)]
+
+        expected = [solver.encode_pegs(solver.get_pegs(guess, code)) for code in codes]
+        self.assertGreater(max(expected), 255)
+
+        from solvers.Solver import np
+        feedback = solver.get_pegs_batch(guess, codes if np is None else np.array(codes, dtype=np.uint8))
+        self.assertEqual([int(value) for value in feedback], expected)
+
+    def test_create_feedback_array(self) -> None:
+        """Encoded pegs are stored in one byte for codes of up to 15 pegs, and in two bytes for longer codes"""
+
+        self.assertIsInstance(Solver(tuple([0] * 15)).create_feedback_array([240]), bytearray)
+        self.assertEqual(list(Solver(tuple([0] * 16)).create_feedback_array([272, 0])), [272, 0])
+
+    def test_feedback_table(self) -> None:
+        """A FeedbackTable stores the pegs of codes of 16 pegs without wrapping them, whether it is precomputed or not"""
+
+        algorithm = SwaszekAlgorithm(tuple([0] * 16), 1, False)
+        self.assertEqual(FeedbackTable(algorithm).get(0, 0), 16 * 17)
+
+        rng = random.Random(3)
+        algorithm = SwaszekAlgorithm(tuple([0] * 16), 2, False)
+        table = FeedbackTable(algorithm, 4 * algorithm.num_of_codes)
+        self.assertFalse(table.is_precomputed)
+
+        for _ in range(100):
+            (i, j) = (rng.randrange(algorithm.num_of_codes), rng.randrange(algorithm.num_of_codes))
+            self.assertEqual(table.get(i, j), algorithm.encode_pegs(algorithm.get_pegs(algorithm.get_code(i), algorithm.get_code(j))))
+
+    def test_swaszek(self) -> None:
+        """Swaszek's algorithm guesses codes of 17 pegs"""
+
+        rng = random.Random(1)
+        for _ in range(3):
+            code = tuple(rng.randrange(2) for _ in range(17))
+            self.play(SwaszekAlgorithm(code, 2, False))
+
+    def test_computer_solver(self) -> None:
+        """The computer player picks the hybrid algorithm for a game of 20 pegs and 2 colours (1,048,576 codes) and wins it"""
+
+        # a profile which does not exist, so the algorithm is picked by get_default_selection on every machine
+        profile_file = os.path.join(os.path.dirname(__file__), "missing_selection_profile.json")
+
+        code = tuple(random.Random(2).randrange(2) for _ in range(20))
+        solver = ComputerSolver(code, 2, profile_file=profile_file)
+        self.assertIsInstance(solver.algorithm, HybridAlgorithm)
+
+        for _ in range(50):
+            solver.inc_guess_num()
+            if solver.get_next_guess() == (20, 0):
+                break
+        else:
+            self.fail(f"the computer did not guess {code} in 50 guesses")
+
+        self.assertEqual(solver.get_guesses()[-1], code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import locale
+import os
+import tempfile
+import unittest
+from constants.enums import ExitCodes
+from Mastermind import Mastermind
+
+
+class TestMastermind(unittest.TestCase):
+    """An input file which cannot be read is reported the same way however much of it the game needs"""
+
+    INVALID_BYTES = b"\x81"  # not a character in UTF-8 or cp1252
+
+    def setUp(self) -> None:
+        try:
+            self.INVALID_BYTES.decode(locale.getpreferredencoding(False))
+        except UnicodeDecodeError:
+            pass
+        else:
+            self.skipTest("every byte can be decoded in the encoding of this machine")
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def play(self, input_lines: list[bytes], *args: str) -> ExitCodes:
+        """Play a game with an input file of the lines and return its exit code
+
+        Parameters:
+        input_lines -- the lines of the input file
+        args -- the arguments after the input and output file
+        """
+
+        self.input_file_name = os.path.join(self.directory.name, "input.txt")
+        self.output_file_name = os.path.join(self.directory.name, "output.txt")
+        with open(self.input_file_name, "wb") as file:
+            file.write(b"\n".join(input_lines) + b"\n")
+
+        return Mastermind([self.input_file_name, self.output_file_name, *args]).play()
+
+    def test_invalid_bytes_during_game(self) -> None:
+        """Bytes which cannot be decoded after many guesses have been scored give INPUT_FILE_ERROR and no output file"""
+
+        # more than one buffer of guesses is read before the invalid bytes
+        guesses = [b"red red red"] * 10000
+        exit_code = self.play([b"code red blue yellow", b"player human"] + guesses + [self.INVALID_BYTES] + guesses, "3", "100000")
+
+        self.assertEqual(exit_code, ExitCodes.INPUT_FILE_ERROR)
+        self.assertFalse(os.path.exists(self.output_file_name))
+
+    def test_invalid_bytes_after_win(self) -> None:
+        """Bytes which cannot be decoded after the winning guess give INPUT_FILE_ERROR, although they are not used"""
+
+        ignored_lines = [b"red red red"] * 10000
+        exit_code = self.play([b"code red blue yellow", b"player human", b"red blue yellow"] + ignored_lines + [self.INVALID_BYTES], "3")
+
+        self.assertEqual(exit_code, ExitCodes.INPUT_FILE_ERROR)
+        self.assertFalse(os.path.exists(self.output_file_name))
+
+    def test_ignored_lines(self) -> None:
+        """Lines after the winning guess which can be decoded are still ignored"""
+
+        exit_code = self.play([b"code red blue yellow", b"player human", b"red blue yellow"] + [b"red red red"] * 10000, "3")
+
+        self.assertEqual(exit_code, ExitCodes.SUCCESS)
+        with open(self.output_file_name, "r") as file:
+            self.assertEqual(len(file.readlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from constants.enums import ExitCodes
+from Mastermind import Mastermind
+from MastermindBatch import MastermindBatch
+
+
+class TestMastermindBatch(unittest.TestCase):
+    """The games of MastermindBatch.py are played independently of each other"""
+
+    def test_unexpected_error(self) -> None:
+        """A game which fails with an unexpected error gets ExitCodes.GAME_ERROR, and the next game is still played"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            # (args, input_text, computer_game_file_name, use_multiple_processes) of each game, see MastermindBatch.play_game
+            input_text = "code red blue yellow\nplayer computer\n"
+            games = [
+                (["-", os.path.join(directory, output_file_name), "3"], input_text, os.path.join(directory, "computerGame.txt"), True)
+                for output_file_name in ("failed.txt", "won.txt")
+            ]
+
+            play = Mastermind.play
+            calls = []
+
+            def fail_first_game(mastermind: Mastermind) -> ExitCodes:
+                calls.append(mastermind)
+                if len(calls) == 1:
+                    raise RuntimeError("the first game fails")
+                return play(mastermind)
+
+            stderr = io.StringIO()
+            with mock.patch.object(Mastermind, "play", fail_first_game), contextlib.redirect_stderr(stderr):
+                exit_codes = [MastermindBatch.play_game(game) for game in games]
+
+            self.assertEqual(exit_codes, [ExitCodes.GAME_ERROR.value, ExitCodes.SUCCESS.value])
+            self.assertIn("the first game fails", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import io
+import itertools
+import json
+import unittest
+from unittest import mock
+from MastermindServer import MastermindServer
+from utils.ServerSession import ServerSession
+
+
+class TestMastermindServer(unittest.TestCase):
+    """Requests sent to MastermindServer.py through a TCP connection"""
+
+    def setUp(self) -> None:
+        # MastermindServer.__init__ serves until the process is stopped, so only the attributes used by requests are set
+        self.server = MastermindServer.__new__(MastermindServer)
+        self.server.sessions = {}
+        self.server.session_ids = itertools.count(1)
+        self.server.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.server.deadline = None
+        self.addCleanup(self.server.executor.shutdown)
+
+    def send(self, requests: list[dict]) -> list[dict]:
+        """Send the requests through one connection and return the responses
+
+        Parameters:
+        requests -- the requests, which are answered in order
+        """
+
+        async def send_requests() -> list[dict]:
+            server = await asyncio.start_server(self.server.handle_client, host="127.0.0.1", port=0)
+            async with server:
+                (reader, writer) = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+                responses = []
+                for request in requests:
+                    writer.write(json.dumps(request).encode() + b"\n")
+                    await writer.drain()
+                    responses.append(json.loads(await reader.readline()))
+
+                writer.close()
+                await writer.wait_closed()
+
+            return responses
+
+        return asyncio.run(send_requests())
+
+    def test_unexpected_error(self) -> None:
+        """A request which fails with an unexpected error is answered and logged, and the connection is still used"""
+
+        stderr = io.StringIO()
+        with mock.patch.object(ServerSession, "play_computer_game", side_effect=RuntimeError("the game fails")):
+            with contextlib.redirect_stderr(stderr):
+                responses = self.send([
+                    {"command": "open", "code_length": 3, "code": ["red", "blue", "yellow"]},
+                    {"command": "play", "session": 1},
+                    {"command": "next", "session": 1}
+                ])
+
+        self.assertEqual(responses[1], {"ok": False, "error": "Internal error (RuntimeError)"})
+        self.assertIn("the game fails", stderr.getvalue())
+        self.assertTrue(responses[2]["ok"])
+        self.assertEqual(responses[2]["guess_num"], 1)
+
+    def test_max_codes(self) -> None:
+        """A session cannot be opened for a game with too many codes, which would stop the server answering other sessions"""
+
+        colours = [str(colour) for colour in range(8)]
+        responses = self.send([
+            {"command": "open", "code_length": 10 ** 9},
+            {"command": "open", "code_length": 9, "colours": colours},
+            {"command": "open", "code_length": 8, "colours": colours}
+        ])
+
+        self.assertEqual([response["ok"] for response in responses], [False, False, True])
+        self.assertEqual(len(self.server.sessions), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import inspect
+import itertools
+import unittest
+from solvers.Solver import Solver
+from utils.PegScorer import PegScorer
+
+
+class TestPegScorer(unittest.TestCase):
+    """The compiled scoring functions give the same pegs as Solver.get_pegs and can be read like any other function"""
+
+    def test_same_pegs_as_get_pegs(self) -> None:
+        """Every pair of codes of 1 to 4 pegs with 3 colours, and of 6 pegs with 2 colours, gets the same pegs"""
+
+        for (code_length, num_of_colours) in ((1, 3), (2, 3), (3, 3), (4, 3), (6, 2)):
+            solver = Solver(tuple([0] * code_length))
+            codes = list(itertools.product(range(num_of_colours), repeat=code_length))
+
+            for fixed_code in codes:
+                (score, score_encoded) = (PegScorer.create(fixed_code), PegScorer.create(fixed_code, encoded=True))
+                for code in codes:
+                    pegs = solver.get_pegs(code, fixed_code)
+                    self.assertEqual(score(code), pegs)
+                    self.assertEqual(score_encoded(code), solver.encode_pegs(pegs))
+
+    def test_source(self) -> None:
+        """The source of a scoring function is the source get_source gives"""
+
+        score = PegScorer.create((0, 1, 1), encoded=True)
+        self.assertIn(inspect.getsource(score), PegScorer.get_source(3, 2, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
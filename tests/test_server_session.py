@@ -0,0 +1,91 @@
+import itertools
+import unittest
+from constants.Text import Text
+from solvers.Solver import Solver
+from utils.ServerSession import ServerSession
+
+
+class TestServerSession(unittest.TestCase):
+    """A computer game of a ServerSession where the client scores the guesses"""
+
+    COLOURS = ["red", "blue", "yellow", "green"]
+    CODE_LENGTH = 4
+
+    def setUp(self) -> None:
+        self.solver = Solver(tuple([0] * self.CODE_LENGTH))
+        self.codes = list(itertools.product(self.COLOURS, repeat=self.CODE_LENGTH))
+
+    def get_pegs(self, guess: list[str], code: tuple[str, ...]) -> list[int]:
+        """Return the [black_pegs, white_pegs] of a guess against a code, both as colour names"""
+
+        return list(self.solver.get_pegs(tuple(guess), code))
+
+    def play(self, secret: tuple[str, ...], send_inconsistent_pegs: bool) -> list[list[str]]:
+        """Play a game where the client knows the secret and return the computer's guesses
+
+        Parameters:
+        secret -- the code the client scores the guesses against
+        send_inconsistent_pegs -- whether every request is first sent with pegs which no remaining code gives
+        """
+
+        session = ServerSession(self.CODE_LENGTH, 12, self.COLOURS, None)
+        remaining_codes = self.codes
+        guesses = []
+        pegs = None
+
+        for guess_num in range(1, 13):
+            if guess_num > 1:
+                if send_inconsistent_pegs:
+                    # the pegs of the previous guess which none of the codes remaining before it give
+                    possible_pegs = {tuple(self.get_pegs(guesses[-1], code)) for code in remaining_codes}
+                    all_pegs = [
+                        [black_pegs, white_pegs] for black_pegs in range(self.CODE_LENGTH) for white_pegs in range(self.CODE_LENGTH + 1)
+                        if black_pegs + white_pegs <= self.CODE_LENGTH and [black_pegs, white_pegs] != [self.CODE_LENGTH - 1, 1]
+                    ]
+                    for inconsistent_pegs in all_pegs:
+                        if tuple(inconsistent_pegs) not in possible_pegs:
+                            with self.assertRaises(ValueError):
+                                session.next_guess(inconsistent_pegs)
+
+                remaining_codes = [code for code in remaining_codes if self.get_pegs(guesses[-1], code) == pegs]
+
+            response = session.next_guess(pegs)
+            self.assertEqual(response["guess_num"], guess_num)
+
+            guesses.append(response["guess"])
+            pegs = self.get_pegs(response["guess"], secret)
+
+            if pegs == [self.CODE_LENGTH, 0]:
+                return guesses
+
+        self.fail(f"the computer did not guess {secret}")
+
+    def test_inconsistent_pegs(self) -> None:
+        """Pegs which no remaining code gives are rejected without changing the session, so the game continues as if
+        they had not been sent
+        """
+
+        for secret in (("red", "red", "blue", "yellow"), ("green", "green", "green", "green"), ("yellow", "blue", "green", "red")):
+            self.assertEqual(self.play(secret, True), self.play(secret, False))
+
+    def test_max_guesses(self) -> None:
+        """The computer loses a game of next requests after max_guesses guesses, as it does in a full computer game"""
+
+        secret = ["green", "green", "green", "green"]
+
+        session = ServerSession(self.CODE_LENGTH, 2, self.COLOURS, secret)
+        responses = [session.next_guess(None) for _ in range(3)]
+        self.assertEqual([response["lost"] for response in responses], [False, True, True])
+        self.assertEqual(responses[2], {"lost": True})
+        self.assertEqual(session.play_computer_game()["lines"], [Text.LOST])
+
+        session = ServerSession(self.CODE_LENGTH, 2, self.COLOURS, None)
+        for guess_num in range(1, 3):
+            response = session.next_guess(None if guess_num == 1 else self.get_pegs(response["guess"], tuple(secret)))
+            self.assertEqual((response["guess_num"], response["lost"]), (guess_num, False))
+
+        self.assertEqual(session.next_guess(self.get_pegs(response["guess"], tuple(secret))), {"lost": True})
+
+
+if __name__ == '__main__':
+    unittest.main()
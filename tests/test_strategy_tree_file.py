@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from algorithms.DonaldKnuth import DonaldKnuthAlgorithm
+from algorithms.StrategyTree import StrategyTreeAlgorithm
+from solvers.ComputerSolver import ComputerSolver
+from utils.StrategyTreeFile import StrategyTreeFile
+
+
+class TestStrategyTreeFile(unittest.TestCase):
+    """A strategy tree file which cannot be read is not used, and compile never leaves a partly written file"""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        self.file_name = os.path.join(self.directory.name, "knuth-2-3.mmst")
+        # a profile which does not exist, so the algorithm is picked by get_default_selection on every machine
+        self.profile_file = os.path.join(self.directory.name, "missing_selection_profile.json")
+
+    def create_solver(self, code: tuple[int, ...]) -> ComputerSolver:
+        """Return a ComputerSolver for a game of 2 pegs and 3 colours which uses the strategy tree file, if it can be read"""
+
+        return ComputerSolver(code, 3, strategy_file=self.file_name, use_multiple_processes=False, profile_file=self.profile_file)
+
+    def test_invalid_files(self) -> None:
+        """An empty, truncated or other file falls back to the algorithm picked without a strategy tree"""
+
+        StrategyTreeFile.compile(DonaldKnuthAlgorithm((0, 0), 3), self.file_name)
+        with open(self.file_name, "rb") as file:
+            contents = file.read()
+
+        for invalid_contents in (b"", contents[:20], contents[:-1], b"NOTMMST" + contents[7:]):
+            with open(self.file_name, "wb") as file:
+                file.write(invalid_contents)
+
+            with self.assertRaises(ValueError):
+                StrategyTreeFile(self.file_name)
+
+            self.assertIsInstance(self.create_solver((1, 2)).algorithm, DonaldKnuthAlgorithm)
+
+    def test_interrupted_compile(self) -> None:
+        """A compilation interrupted while writing leaves the earlier file as it was, and no other file"""
+
+        StrategyTreeFile.compile(DonaldKnuthAlgorithm((0, 0), 3), self.file_name)
+        with open(self.file_name, "rb") as file:
+            contents = file.read()
+
+        def open_interrupted_file(*args, **kwargs) -> mock.MagicMock:
+            """Open a file whose nodes are interrupted after the header has been written"""
+
+            file = mock.MagicMock(wraps=open(*args, **kwargs))
+            file.__enter__.return_value = file
+            file.__exit__.side_effect = lambda *_: file.close()
+            file.writelines.side_effect = KeyboardInterrupt
+            return file
+
+        with mock.patch("utils.StrategyTreeFile.open", open_interrupted_file, create=True):
+            with self.assertRaises(KeyboardInterrupt):
+                StrategyTreeFile.compile(DonaldKnuthAlgorithm((0, 0), 3), self.file_name)
+
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(self.file_name)])
+        with open(self.file_name, "rb") as file:
+            self.assertEqual(file.read(), contents)
+
+    def test_compile(self) -> None:
+        """A compiled file replaces an invalid file and makes the same guesses as the algorithm"""
+
+        with open(self.file_name, "wb") as file:
+            file.write(b"MMST")
+
+        StrategyTreeFile.compile(DonaldKnuthAlgorithm((0, 0), 3), self.file_name)
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(self.file_name)])
+
+        for code in ((0, 0), (1, 2), (2, 1)):
+            solver = self.create_solver(code)
+            self.assertIsInstance(solver.algorithm, StrategyTreeAlgorithm)
+
+            algorithm = DonaldKnuthAlgorithm(code, 3)
+            while True:
+                solver.inc_guess_num()
+                algorithm.inc_guess_num()
+                pegs = solver.get_next_guess()
+                self.assertEqual(pegs, algorithm.get_next_guess())
+                self.assertEqual(solver.algorithm.guess, algorithm.guess)
+                if pegs == (2, 0):
+                    break
+
+
+if __name__ == '__main__':
+    unittest.main()
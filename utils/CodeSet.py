@@ -0,0 +1,145 @@
+import array
+from typing import Iterable
+from solvers.Solver import np
+
+
+class CodeSet:
+    """A set of code indexes (see Algorithm.get_index) stored as a bitset with one bit for every possible code,
+    so checking if a code is in the set does not need the code as a tuple or a hash set of tuples.
+    Two sets are intersected with one bitwise and of their bitsets, and counted by the number of bits set (see FeedbackIndex).
+
+    Attributes:
+    num_of_codes -- the number of possible codes
+    bits -- the bitset, where bit (i % 8) of byte (i // 8) is set if index i is in the set,
+            as a uint8 NumPy array if NumPy is installed, otherwise as a bytearray
+    length -- the number of indexes in the set
+    """
+
+    # the number of bits set in each byte, used to count the bits of a NumPy bitset
+    BIT_COUNTS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8) if np is not None else None
+
+    def __init__(self, num_of_codes: int, indices: Iterable[int] = ()) -> None:
+        """Create the set containing the given indexes
+
+        Parameters:
+        num_of_codes -- the number of possible codes
+        indices -- the indexes in the set, as a NumPy array if NumPy is installed (default: no indexes)
+        """
+
+        self.num_of_codes = num_of_codes
+
+        if np is not None:
+            is_in_set = np.zeros(self.num_of_codes, dtype=bool)
+            is_in_set[np.asarray(indices, dtype=np.int64)] = True
+            self.bits = np.packbits(is_in_set, bitorder="little")
+            self.length = int(is_in_set.sum())
+        else:
+            self.bits = bytearray((self.num_of_codes + 7) // 8)
+            self.length = 0
+            for i in indices:
+                self.add(i)
+
+    def add(self, i: int) -> None:
+        """Add an index to the set
+
+        Parameters:
+        i -- the index
+        """
+
+        if i not in self:
+            self.bits[i >> 3] |= 1 << (i & 7)
+            self.length += 1
+
+    def __contains__(self, i: int) -> bool:
+        """Return whether an index is in the set
+
+        Parameters:
+        i -- the index
+        """
+
+        return (self.bits[i >> 3] >> (i & 7)) & 1 == 1
+
+    def __len__(self) -> int:
+        """Return the number of indexes in the set"""
+
+        return self.length
+
+    def contains_array(self, indices: 'np.ndarray') -> 'np.ndarray':
+        """Return whether each index in a NumPy array is in the set, as a boolean NumPy array
+
+        Parameters:
+        indices -- the indexes
+        """
+
+        return ((self.bits[indices >> 3] >> (indices & 7).astype(np.uint8)) & 1).astype(bool)
+
+    @classmethod
+    def from_bits(cls, num_of_codes: int, bits: 'np.ndarray') -> 'CodeSet':
+        """Return the set with the given bitset, without finding its indexes
+
+        Parameters:
+        num_of_codes -- the number of possible codes
+        bits -- the bitset (see the bits attribute), which is not copied
+        """
+
+        code_set = cls.__new__(cls)
+        code_set.num_of_codes = num_of_codes
+        code_set.bits = bits
+        code_set.length = cls.count_bits(bits)
+
+        return code_set
+
+    @classmethod
+    def count_bits(cls, bits: 'np.ndarray') -> int:
+        """Return the number of bits set in a bitset
+
+        Parameters:
+        bits -- the bitset
+        """
+
+        if np is not None:
+            return int(cls.BIT_COUNTS[bits].sum(dtype=np.int64))
+
+        return bin(int.from_bytes(bits, "little")).count("1")
+
+    def __and__(self, other: 'CodeSet') -> 'CodeSet':
+        """Return the set of indexes in both sets, found with one bitwise and of their bitsets
+
+        Parameters:
+        other -- a set of the same number of possible codes
+        """
+
+        if np is not None:
+            return CodeSet.from_bits(self.num_of_codes, np.bitwise_and(self.bits, other.bits))
+
+        # Python integers are used so the bitsets are combined at once rather than one byte at a time
+        bits = int.from_bytes(self.bits, "little") & int.from_bytes(other.bits, "little")
+        return CodeSet.from_bits(self.num_of_codes, bytearray(bits.to_bytes(len(self.bits), "little")))
+
+    def count_intersection(self, other: 'CodeSet') -> int:
+        """Return the number of indexes in both sets, without creating the set of them
+
+        Parameters:
+        other -- a set of the same number of possible codes
+        """
+
+        if np is not None:
+            return CodeSet.count_bits(np.bitwise_and(self.bits, other.bits))
+
+        return bin(int.from_bytes(self.bits, "little") & int.from_bytes(other.bits, "little")).count("1")
+
+    def get_indices(self) -> 'np.ndarray':
+        """Return the indexes in the set in ascending order, as a NumPy array if NumPy is installed, otherwise as an array.array"""
+
+        if np is not None:
+            return np.flatnonzero(np.unpackbits(self.bits, count=self.num_of_codes, bitorder="little"))
+
+        indices = array.array("q")
+        for (byte_index, byte) in enumerate(self.bits):
+            if byte == 0:  # most bytes are empty once a few guesses have been made
+                continue
+            for bit in range(8):
+                if (byte >> bit) & 1:
+                    indices.append((byte_index << 3) | bit)
+
+        return indices
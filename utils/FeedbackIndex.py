@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from solvers.Solver import np
+from utils.CodeSet import CodeSet
+
+
+class FeedbackIndex:
+    """Stores the codes which give each feedback (see Solver.encode_pegs) against a guess as a CodeSet, for the guesses
+    which have been made, so the remaining codes can be filtered by a bitwise and of two CodeSets instead of scoring
+    every remaining code against the guess. The number of remaining codes in each partition of a guess is then
+    the number of bits set in each bitwise and (see get_partition_sizes).
+
+    The partitions of a guess are found the first time it is needed, by scoring it against every code once.
+    The index is shared by every algorithm with the same code length and number of colours (see open), so the
+    partitions of a guess which is made again in a later game are not found again. The least recently used
+    guesses are evicted to stay within max_bytes.
+
+    Attributes:
+    algorithm -- the algorithm used to score codes, a code's index in a CodeSet is its index (see Algorithm.get_index)
+    code_array -- all codes as a NumPy array with one code per row, if NumPy is installed
+    num_of_codes -- the number of possible codes
+    max_bytes -- the maximum number of bytes the partitions can use
+    partitions -- the CodeSet of each feedback stored against the index of each guess, from the least to the most recently used
+    num_of_bytes -- the number of bytes used by the partitions
+    hits, misses -- the number of times the partitions of a guess were and were not already stored
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    opened_indexes = {}  # every FeedbackIndex opened by this process, stored against its (code_length, num_of_colours)
+
+    def __init__(self, algorithm: 'Algorithm', max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Create an empty index
+
+        Parameters:
+        algorithm -- the algorithm used to score codes
+        max_bytes -- the maximum number of bytes the partitions can use (default: DEFAULT_MAX_BYTES)
+        """
+
+        self.algorithm = algorithm
+        self.num_of_codes = pow(self.algorithm.num_of_colours, self.algorithm.code_length)
+        self.max_bytes = max_bytes
+
+        if np is not None:
+            self.code_array = self.algorithm.generate_code_array()
+
+        self.partitions = OrderedDict()
+        self.num_of_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, algorithm_class: type, code_length: int, num_of_colours: int) -> 'FeedbackIndex':
+        """Return the FeedbackIndex for the code length and number of colours, which is only created once per process
+
+        Parameters:
+        algorithm_class -- the class of the algorithm used to score codes, which is created with a placeholder answer code
+        code_length -- the length of each code
+        num_of_colours -- the number of available colours
+        """
+
+        key = (code_length, num_of_colours)
+        if key not in cls.opened_indexes:
+            cls.opened_indexes[key] = cls(algorithm_class(tuple([0] * code_length), num_of_colours))
+
+        return cls.opened_indexes[key]
+
+    def compute_partitions(self, i: int) -> dict[int, CodeSet]:
+        """Return the CodeSet of the codes which give each feedback against the code at index i,
+        for every feedback which at least one code gives
+
+        Parameters:
+        i -- the index of the guess
+        """
+
+        guess = self.algorithm.get_code(i)
+
+        if np is not None:
+            row = self.algorithm.get_pegs_batch(guess, self.code_array)
+            return {
+                int(feedback): CodeSet.from_bits(self.num_of_codes, np.packbits(row == feedback, bitorder="little"))
+                for feedback in np.unique(row)
+            }
+
+        row = self.algorithm.get_pegs_batch(guess, self.algorithm.generate_codes())
+        num_of_bytes = (self.num_of_codes + 7) // 8
+
+        partitions = {}
+        if not isinstance(row, bytearray):
+            # the pegs of codes of more than 15 pegs do not fit in a byte (see Solver.get_feedback_typecode), so they cannot
+            # be translated and the bits of each code are set one at a time
+            for (k, feedback) in enumerate(row):
+                if feedback not in partitions:
+                    partitions[feedback] = bytearray(num_of_bytes)
+                partitions[feedback][k >> 3] |= 1 << (k & 7)
+
+            return {feedback: CodeSet.from_bits(self.num_of_codes, bits) for (feedback, bits) in partitions.items()}
+
+        row = bytes(row)
+        for feedback in set(row):
+            # the row is translated to a "1" for each code which gives the feedback and a "0" for every other code, which
+            # is read as a binary number with the first code as its lowest bit, so no code is looked at by a Python loop
+            is_in_partition = row.translate(bytes(ord("1") if byte == feedback else ord("0") for byte in range(256)))
+            bits = int(is_in_partition[::-1], 2).to_bytes(num_of_bytes, "little")
+            partitions[feedback] = CodeSet.from_bits(self.num_of_codes, bytearray(bits))
+
+        return partitions
+
+    def get_partitions(self, i: int) -> dict[int, CodeSet]:
+        """Return the CodeSet of the codes which give each feedback against the code at index i (see compute_partitions).
+        The CodeSets are shared, so they should not be changed.
+
+        Parameters:
+        i -- the index of the guess
+        """
+
+        if i in self.partitions:
+            self.hits += 1
+            self.partitions.move_to_end(i)  # mark this guess as the most recently used
+            return self.partitions[i]
+
+        self.misses += 1
+        partitions = self.compute_partitions(i)
+
+        self.partitions[i] = partitions
+        self.num_of_bytes += self.get_num_of_bytes(partitions)
+        while self.num_of_bytes > self.max_bytes and len(self.partitions) > 1:
+            (_, evicted) = self.partitions.popitem(last=False)  # evict the least recently used guess
+            self.num_of_bytes -= self.get_num_of_bytes(evicted)
+
+        return partitions
+
+    def get(self, i: int, feedback: int) -> CodeSet:
+        """Return the CodeSet of the codes which give the feedback against the code at index i
+
+        Parameters:
+        i -- the index of the guess
+        feedback -- the encoded pegs
+        """
+
+        partitions = self.get_partitions(i)
+        if feedback not in partitions:
+            return CodeSet(self.num_of_codes)
+
+        return partitions[feedback]
+
+    def get_partition_sizes(self, i: int, codes: CodeSet) -> dict[int, int]:
+        """Return the number of codes in a CodeSet which give each feedback against the code at index i,
+        for every feedback which at least one code in the CodeSet gives
+
+        Parameters:
+        i -- the index of the guess
+        codes -- the codes to partition
+        """
+
+        partition_sizes = {}
+        for (feedback, partition) in self.get_partitions(i).items():
+            size = partition.count_intersection(codes)
+            if size > 0:
+                partition_sizes[feedback] = size
+
+        return partition_sizes
+
+    @staticmethod
+    def get_num_of_bytes(partitions: dict[int, CodeSet]) -> int:
+        """Return the number of bytes used by the bitsets of the partitions of a guess
+
+        Parameters:
+        partitions -- the CodeSet of each feedback
+        """
+
+        return sum(len(partition.bits) for partition in partitions.values())
@@ -0,0 +1,129 @@
+import array
+import itertools
+from collections import OrderedDict
+from solvers.Solver import np
+from utils.TableSnapshot import TableSnapshot
+
+
+class FeedbackTable:
+    """Stores the encoded feedback (see Solver.encode_pegs) of every code against every other code,
+    so feedback can be looked up by the index of the codes instead of being recomputed.
+
+    If the full matrix fits within max_bytes then it is precomputed, or memory-mapped from a TableSnapshot
+    if one has stored it (and stored in a TableSnapshot after it is precomputed). Otherwise, rows are computed
+    when they are first needed and the least recently used rows are evicted to stay within max_bytes.
+    Each feedback uses one byte, or two bytes for codes of more than 15 pegs (see Solver.get_feedback_typecode).
+    Rows are NumPy arrays of that type if NumPy is installed, otherwise see Solver.create_feedback_array.
+
+    Attributes:
+    algorithm -- the algorithm used to score two codes, a code's index in the table is its index (see Algorithm.get_index)
+    code_array -- all codes as a NumPy array with one code per row, if NumPy is installed
+    num_of_codes -- the number of codes in the table
+    typecode -- the typecode of each feedback (see Solver.get_feedback_typecode)
+    max_bytes -- the maximum number of bytes the table can use
+    is_precomputed -- whether the full matrix has been precomputed
+    matrix -- every row stored one after another, if the table is precomputed
+    rows -- the rows currently in memory stored against their index, if the table is not precomputed
+    max_rows -- the maximum number of rows kept in rows
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64MB is enough to precompute the table for up to 8192 codes
+
+    def __init__(self, algorithm: 'Algorithm', max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Precompute the table if it fits within max_bytes.
+
+        Parameters:
+        algorithm -- the algorithm used to score two codes
+        max_bytes -- the maximum number of bytes the table can use (default: DEFAULT_MAX_BYTES)
+        """
+
+        self.algorithm = algorithm
+        self.num_of_codes = pow(self.algorithm.num_of_colours, self.algorithm.code_length)
+        self.typecode = self.algorithm.get_feedback_typecode()
+        self.max_bytes = max_bytes
+
+        item_size = array.array(self.typecode).itemsize
+        self.is_precomputed = self.num_of_codes * self.num_of_codes * item_size <= self.max_bytes
+
+        if np is not None:
+            self.code_array = self.algorithm.generate_code_array()
+
+        # a TableSnapshot stores one byte per feedback, so the matrix of codes of more than 15 pegs is not stored
+        uses_snapshot = self.is_precomputed and self.typecode == "B"
+        snapshot = TableSnapshot.open(self.algorithm.code_length, self.algorithm.num_of_colours) if uses_snapshot else None
+
+        if snapshot is not None and snapshot.has_matrix:
+            self.matrix = snapshot.get_matrix()
+        elif self.is_precomputed:
+            if np is not None:
+                self.matrix = np.empty((self.num_of_codes, self.num_of_codes), dtype=self.typecode)
+                for i in range(self.num_of_codes):
+                    self.matrix[i] = self.compute_row(i)
+            else:
+                num_of_items = self.num_of_codes * self.num_of_codes
+                self.matrix = bytearray(num_of_items) if self.typecode == "B" else array.array(self.typecode, [0]) * num_of_items
+                for i in range(self.num_of_codes):
+                    start = i * self.num_of_codes
+                    self.matrix[start:start + self.num_of_codes] = self.compute_row(i)
+
+            if uses_snapshot:
+                codes = self.code_array if np is not None else bytes(itertools.chain.from_iterable(self.algorithm.generate_codes()))
+                TableSnapshot.save(self.algorithm.code_length, self.algorithm.num_of_colours, codes, self.matrix)
+        else:
+            self.rows = OrderedDict()
+            self.max_rows = max(1, self.max_bytes // max(1, self.num_of_codes * item_size))
+
+    def compute_row(self, i: int) -> 'np.ndarray':
+        """Return the encoded feedback of the code at index i against every code
+
+        Parameters:
+        i -- the index of the code
+        """
+
+        guess = self.algorithm.get_code(i)
+
+        if np is not None:
+            return self.algorithm.get_pegs_batch(guess, self.code_array)
+
+        return self.algorithm.get_pegs_batch(guess, self.algorithm.generate_codes())
+
+    def get_row(self, i: int) -> 'np.ndarray':
+        """Return the encoded feedback of the code at index i against every code, where the
+        feedback against the code at index j is row[j]
+
+        Parameters:
+        i -- the index of the code
+        """
+
+        if self.is_precomputed:
+            if np is not None:
+                return self.matrix[i]
+
+            start = i * self.num_of_codes
+            return memoryview(self.matrix)[start:start + self.num_of_codes]
+
+        if i in self.rows:
+            self.rows.move_to_end(i)  # mark this row as the most recently used
+            return self.rows[i]
+
+        row = self.compute_row(i)
+        self.rows[i] = row
+        if len(self.rows) > self.max_rows:
+            self.rows.popitem(last=False)  # evict the least recently used row
+
+        return row
+
+    def get(self, i: int, j: int) -> int:
+        """Return the encoded feedback of the code at index i against the code at index j
+
+        Parameters:
+        i, j -- the indexes of the codes
+        """
+
+        if self.is_precomputed:
+            if np is not None:
+                return int(self.matrix[i, j])
+
+            return self.matrix[i * self.num_of_codes + j]
+
+        return self.get_row(i)[j]
@@ -0,0 +1,20 @@
+from constants.enums import ExitCodes
+
+
+class GameExit(Exception):
+    """Raised to stop a game of Mastermind with an exit code, so that a batch of games can continue after one has stopped.
+
+    Attributes:
+    exit_code -- the enum value of the exit code
+    """
+
+    def __init__(self, exit_code: ExitCodes) -> None:
+        """Store the exit code
+
+        Parameters:
+        exit_code -- the enum value of the exit code
+        """
+
+        super().__init__(exit_code.name)
+
+        self.exit_code = exit_code
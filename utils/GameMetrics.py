@@ -0,0 +1,200 @@
+import copy
+import json
+import sys
+import time
+from typing import Callable, Union
+from solvers.Solver import np
+from utils.WorkerPool import WorkerPool
+
+
+class CountedFeedbackRow:
+    """A row of a FeedbackTable (see FeedbackTable.get_row) which counts every feedback looked up in it, for GameMetrics
+
+    Attributes:
+    row -- the row
+    counter -- a list whose only item is the number of peg evaluations
+    """
+
+    def __init__(self, row: 'np.ndarray', counter: list[int]) -> None:
+        self.row = row
+        self.counter = counter
+
+    def __getitem__(self, key: Union[int, slice, 'np.ndarray']) -> Union[int, 'np.ndarray']:
+        feedback = self.row[key]
+        self.counter[0] += len(feedback) if hasattr(feedback, "__len__") else 1  # a single feedback is an int or a NumPy scalar
+        return feedback
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+
+class GameMetrics:
+    """Measures every guess the computer makes in a game, so it can be seen where the game spends its time.
+    It is only created when metrics are requested (see ComputerSolver.record_metrics), so games without it are not slowed down.
+
+    Every guess is recorded as:
+    guess_num -- the number of the guess
+    wall_time -- the seconds taken to make and score the guess
+    cpu_time -- the CPU seconds used by this process to make and score the guess (not including worker processes)
+    remaining_before, remaining_after -- the number of codes which could be the answer code before and after the pegs
+                                         of the previous guess were used to filter them (None if the algorithm does not store them)
+    peg_evaluations -- the number of times the pegs of a guess and a code were found or looked up in a FeedbackTable by this process
+    pool_start_time -- the seconds spent starting worker processes
+    pool_wait_time -- the seconds spent waiting for tasks sent to worker processes to finish
+    peak_memory_kb -- the peak resident memory of the process (and its worker processes which have stopped) in kilobytes,
+                      or None if it cannot be measured on this platform (see get_peak_memory_kb)
+    search_finished -- whether the search for the guess finished, rather than stopping at a deadline (see Algorithm.is_search_finished)
+
+    If the algorithm has a GuessCache, the report also has the number of guesses of the game which were found in it
+    (guess_cache_hits) and which were not (guess_cache_misses).
+
+    Attributes:
+    algorithm -- the algorithm being measured
+    guesses -- the record of every guess, in order
+    peg_counter -- a list whose only item is the number of peg evaluations (see count_peg_evaluations)
+    guess_cache -- the GuessCache of the algorithm, or None if it does not have one
+    guess_cache_counts -- the (hits, misses) of guess_cache before the game
+    """
+
+    def __init__(self, algorithm: 'Algorithm') -> None:
+        """Start measuring an algorithm which has not made any guesses
+
+        Parameters:
+        algorithm -- the algorithm to measure
+        """
+
+        self.algorithm = algorithm
+        self.guesses = []
+        self.peg_counter = self.count_peg_evaluations(algorithm)
+
+        self.guess_cache = getattr(algorithm, "guess_cache", None)
+        if self.guess_cache is not None:
+            self.guess_cache_counts = (self.guess_cache.hits, self.guess_cache.misses)
+
+    def get_next_guess(self) -> tuple[int, int]:
+        """Make the algorithm's next guess, record it and return its (black_pegs, white_pegs)"""
+
+        remaining_before = self.algorithm.get_num_of_remaining_codes()
+        (peg_evaluations, pool_start_time, pool_wait_time) = (self.peg_counter[0], WorkerPool.start_time, WorkerPool.wait_time)
+
+        (wall_start, cpu_start) = (time.perf_counter(), time.process_time())
+        pegs = self.algorithm.get_next_guess()
+        (wall_time, cpu_time) = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+        self.guesses.append({
+            "guess_num": self.algorithm.guess_num,
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "remaining_before": remaining_before,
+            "remaining_after": self.algorithm.get_num_of_remaining_codes(),
+            "peg_evaluations": self.peg_counter[0] - peg_evaluations,
+            "pool_start_time": WorkerPool.start_time - pool_start_time,
+            "pool_wait_time": WorkerPool.wait_time - pool_wait_time,
+            "peak_memory_kb": self.get_peak_memory_kb(),
+            "search_finished": self.algorithm.is_search_finished
+        })
+
+        return pegs
+
+    @staticmethod
+    def get_peak_memory_kb() -> Union[int, None]:
+        """Return the peak resident memory of this process (and its worker processes which have stopped) in kilobytes,
+        or None if the resource module is not available (e.g. on Windows)
+        """
+
+        try:
+            import resource  # only imported when metrics are recorded, since it only exists on Unix
+        except ImportError:
+            return None
+
+        peak_memory = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+        # ru_maxrss is in bytes on macOS, but in kilobytes on Linux
+        return peak_memory // 1024 if sys.platform == "darwin" else peak_memory
+
+    def get_report(self) -> dict:
+        """Return the report of the game, containing the parameters of the algorithm, its totals and every guess"""
+
+        report = {
+            "algorithm": type(self.algorithm).__name__,
+            "code_length": self.algorithm.code_length,
+            "num_of_colours": self.algorithm.num_of_colours,
+            "use_multiple_processes": self.algorithm.use_multiple_processes,
+            "num_of_guesses": len(self.guesses),
+            "wall_time": sum(guess["wall_time"] for guess in self.guesses),
+            "cpu_time": sum(guess["cpu_time"] for guess in self.guesses),
+            "peg_evaluations": sum(guess["peg_evaluations"] for guess in self.guesses),
+            "peak_memory_kb": max((guess["peak_memory_kb"] for guess in self.guesses if guess["peak_memory_kb"] is not None), default=None),
+            "search_finished": all(guess["search_finished"] for guess in self.guesses),
+            "guesses": self.guesses
+        }
+
+        if self.guess_cache is not None:
+            report["guess_cache_hits"] = self.guess_cache.hits - self.guess_cache_counts[0]
+            report["guess_cache_misses"] = self.guess_cache.misses - self.guess_cache_counts[1]
+
+        return report
+
+    def save(self, file_name: str) -> None:
+        """Write the report of the game to a file as JSON
+
+        Parameters:
+        file_name -- the path of the file
+        """
+
+        with open(file_name, "w") as file:
+            json.dump(self.get_report(), file, indent=2)
+
+    @staticmethod
+    def count_peg_evaluations(algorithm: 'Algorithm') -> list[int]:
+        """Replace the scoring methods of an algorithm with methods which count every evaluation of pegs, including the
+        feedback looked up in its FeedbackTable. Return a list whose only item is the count, which increases as the algorithm is used.
+
+        Parameters:
+        algorithm -- the algorithm to count the evaluations of
+        """
+
+        counter = [0]
+        (get_pegs, get_pegs_batch, get_scorer) = (algorithm.get_pegs, algorithm.get_pegs_batch, algorithm.get_scorer)
+        get_batch_partition_sizes = algorithm.get_batch_partition_sizes
+
+        def counted_get_pegs(guess: tuple[int, ...], code: tuple[int, ...]) -> tuple[int, int]:
+            counter[0] += 1
+            return get_pegs(guess, code)
+
+        def counted_get_pegs_batch(guess: tuple[int, ...], codes: 'np.ndarray') -> 'np.ndarray':
+            counter[0] += len(codes)
+            return get_pegs_batch(guess, codes)
+
+        def counted_get_batch_partition_sizes(guesses: 'np.ndarray', codes: 'np.ndarray', code_counts: 'np.ndarray') -> 'np.ndarray':
+            counter[0] += len(guesses) * len(codes)  # every guess is scored against every code
+            return get_batch_partition_sizes(guesses, codes, code_counts)
+
+        def counted_get_scorer(code: tuple[int, ...], encoded: bool = False) -> Callable[[tuple[int, ...]], tuple[int, int]]:
+            score = get_scorer(code, encoded)
+
+            def counted_score(guess: tuple[int, ...]) -> tuple[int, int]:
+                counter[0] += 1
+                return score(guess)
+
+            return counted_score
+
+        algorithm.get_pegs = counted_get_pegs
+        algorithm.get_scorer = counted_get_scorer
+        if np is not None:  # without NumPy, get_pegs_batch uses get_scorer so it is already counted
+            algorithm.get_pegs_batch = counted_get_pegs_batch
+            # the sampled and hybrid algorithms score many guesses at once (only with NumPy) without using get_pegs_batch
+            algorithm.get_batch_partition_sizes = counted_get_batch_partition_sizes
+
+        if algorithm.feedback_table is not None:
+            get_row = algorithm.feedback_table.get_row
+
+            def counted_get_row(i: int) -> CountedFeedbackRow:
+                return CountedFeedbackRow(get_row(i), counter)
+
+            # the table is shared with the copies of the algorithm (see Algorithm.copy), so only this algorithm's copy 
+            # of it counts, which still shares its rows
+            algorithm.feedback_table = copy.copy(algorithm.feedback_table)
+            algorithm.feedback_table.get_row = counted_get_row
+
+        return counter
@@ -0,0 +1,155 @@
+import collections
+import hashlib
+import os
+import struct
+from typing import Union
+
+
+class GuessCache:
+    """Stores the guess an algorithm chose for each state of a game, so a state which comes up again (in the same game
+    or in a later game) does not need to be searched. The least recently used state is removed when the cache is full.
+
+    A state is stored as a hash of everything the guess depends on (see get_key), so two games which reach the same
+    remaining codes with the same guesses share an entry, whatever the order of their guesses was.
+
+    File format (little-endian):
+    header -- MAGIC, VERSION, num_of_entries (see HEADER)
+    entries -- for each entry, from the least to the most recently used, its key followed by its guess index as a uint64
+
+    Attributes:
+    file_name -- the path of the file the cache is loaded from and saved to, or None if it is only stored in memory
+    max_size -- the largest number of entries which are stored
+    entries -- the guess index of each entry stored against its key, from the least to the most recently used
+    hits, misses -- the number of states which were and were not found by get
+    is_changed -- whether an entry has been added since the cache was loaded or saved
+    """
+
+    MAGIC = b"MMGC"
+    VERSION = 1
+    HEADER = struct.Struct("<4sII")
+    ENTRY = struct.Struct("<16sQ")
+
+    DEFAULT_MAX_SIZE = 100000
+
+    opened_files = {}  # every GuessCache opened by this process, stored against its file_name
+
+    def __init__(self, file_name: Union[str, None] = None, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Create the cache, loading the entries of its file if it exists and is valid
+
+        Parameters:
+        file_name -- the path of the file the cache is loaded from and saved to (default: None, only store it in memory)
+        max_size -- the largest number of entries which are stored (default: DEFAULT_MAX_SIZE)
+        """
+
+        self.file_name = file_name
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.file_name is not None:
+            self.load()
+
+        self.is_changed = False
+
+    @classmethod
+    def open(cls, file_name: Union[str, None] = None) -> 'GuessCache':
+        """Return the GuessCache for file_name, which is only loaded once per process
+
+        Parameters:
+        file_name -- the path of the file (default: None, the cache which is only stored in memory)
+        """
+
+        if file_name not in cls.opened_files:
+            cls.opened_files[file_name] = cls(file_name)
+
+        return cls.opened_files[file_name]
+
+    @staticmethod
+    def get_key(*parts: Union[str, int, bytes]) -> bytes:
+        """Return a 16 byte hash of every part of a state, e.g. the parameters of the algorithm,
+        the indexes of the guesses and the bytes of the indexes of the remaining codes
+
+        Parameters:
+        parts -- the parts of the state
+        """
+
+        key = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            elif isinstance(part, int):
+                part = part.to_bytes(8, "little")
+
+            key.update(len(part).to_bytes(8, "little"))  # so the parts cannot be split differently to give the same hash
+            key.update(part)
+
+        return key.digest()
+
+    def get(self, key: bytes) -> Union[int, None]:
+        """Return the guess index stored for a key, or None if it is not stored
+
+        Parameters:
+        key -- the key returned by get_key
+        """
+
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+        return self.entries[key]
+
+    def put(self, key: bytes, guess_index: int) -> None:
+        """Store the guess index for a key, removing the least recently used entry if the cache is full
+
+        Parameters:
+        key -- the key returned by get_key
+        guess_index -- the index of the guess (see Algorithm.get_index)
+        """
+
+        self.entries[key] = guess_index
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+        self.is_changed = True
+
+    def load(self) -> None:
+        """Add the entries of the file to the cache, if the file exists and is valid"""
+
+        try:
+            with open(self.file_name, "rb") as file:
+                data = file.read()
+        except OSError:
+            return
+
+        if len(data) < self.HEADER.size:
+            return
+
+        (magic, version, num_of_entries) = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION or len(data) != self.HEADER.size + num_of_entries * self.ENTRY.size:
+            return
+
+        for (key, guess_index) in self.ENTRY.iter_unpack(data[self.HEADER.size:]):
+            self.put(key, guess_index)
+
+    def save(self) -> None:
+        """Write the cache to its file, if it has a file and an entry has been added since it was loaded or saved.
+        The file is replaced in one step, so a process loading it never reads a partly written file.
+        """
+
+        if self.file_name is None or not self.is_changed:
+            return
+
+        temporary_file_name = f"{self.file_name}.{os.getpid()}.tmp"
+        with open(temporary_file_name, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(self.entries)))
+            for key, guess_index in self.entries.items():
+                file.write(self.ENTRY.pack(key, guess_index))
+
+        os.replace(temporary_file_name, self.file_name)
+        self.is_changed = False
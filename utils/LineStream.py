@@ -1,31 +1,46 @@
 class LineStream:
     """Stores a file and allows you to access one line after another, in the order they appear in the file.
-    All whitespace in the line is removed and split by spaces. 
+    All whitespace in the line is removed and split by spaces.
+    Lines are read from the file when they are needed, so only the current line and the line after it are stored.
 
     Attributes:
     file -- the file to get lines from
-    lines -- all the lines in the file
-    i -- index of the current line
+    next_line -- the next line in the file, read ahead so is_eof can be answered, or "" if there are no more lines
     """
 
+    READ_SIZE = 65536
+
     def __init__(self, file) -> None:
-        """Store the file as an attribute"""
-        
+        """Store the file as an attribute and read its first line"""
+
         self.file = file
-        self.lines = self.file.readlines()
-        self.i = 0
+        self.next_line = self.file.readline()
 
     def is_eof(self) -> bool:
         """Return if there are any more lines to read"""
 
-        return self.i == len(self.lines)
+        return self.next_line == ""  # readline only returns an empty string at the end of the file, other lines end with \n
 
     def get_next_line(self) -> list[str]:
         """Return the cleaned version of the next line in the file.
         The "cleaned version" of the line contains no \n nor spaces. The line is split by spaces.
         """
 
-        line = self.lines[self.i]
-        self.i += 1
+        line = self.next_line
+        self.next_line = self.file.readline()
+
+        return line.strip().split(" ")
+
+    def read_to_end(self) -> None:
+        """Read the rest of the file without storing it, READ_SIZE characters at a time, so an error decoding 
+        any part of it is raised as if the whole file had been read at once
+        """
+
+        self.next_line = ""
+        while self.file.read(self.READ_SIZE) != "":
+            pass
+
+    def close(self) -> None:
+        """Close the file"""
 
-        return line.strip().split(" ")
\ No newline at end of file
+        self.file.close()
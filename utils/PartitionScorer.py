@@ -0,0 +1,56 @@
+import math
+from typing import Iterable, Union
+
+
+class PartitionScorer:
+    """Scores a guess from the sizes of the partitions it splits the remaining codes into (see DonaldKnuthAlgorithm.get_partition_sizes),
+    where the guess with the lowest score is the best guess. Every scorer uses the same partition sizes, so they all
+    benefit from the same ways of finding them (NumPy, a FeedbackTable, symmetry and multiple processes).
+
+    Scorers:
+    minimax -- the size of the largest partition (Knuth, 1976)
+    expected_size -- the expected size of the partition of the answer code (Irving, 1978), scored as the sum of the
+                     squares of the sizes, since every guess of a turn is divided by the same number of remaining codes
+    entropy -- the negative entropy of the partitions (Neuwirth, 1982), scored as the sum of size * log2(size) which orders guesses the same way
+    most_parts -- the negative number of partitions (Kooi, 2005)
+
+    Attributes:
+    name -- the name of the scorer
+    is_prunable -- whether the score is the size of the largest partition, so a guess can stop being scored as soon as
+                   any partition is larger than the lowest score found so far
+    """
+
+    NAMES = ("minimax", "expected_size", "entropy", "most_parts")
+
+    def __init__(self, name: str) -> None:
+        """Create the scorer. Raise a ValueError if there is no scorer with the name.
+
+        Parameters:
+        name -- the name of the scorer, one of NAMES
+        """
+
+        if name not in self.NAMES:
+            raise ValueError(f"There is no partition scorer called {name}")
+
+        self.name = name
+        self.is_prunable = name == "minimax"
+
+    def score(self, partition_sizes: Iterable[int]) -> Union[int, float]:
+        """Return the score of the partition sizes of a guess, where a lower score is better.
+        Guesses with the same partition sizes in a different order get exactly the same score.
+
+        Parameters:
+        partition_sizes -- the size of every partition, which can include partitions of size 0
+        """
+
+        # This would be better using match ... case but its not available in required the Python version
+        if self.name == "minimax":
+            return int(max(partition_sizes))
+        elif self.name == "expected_size":
+            return sum(int(size) * int(size) for size in partition_sizes)
+        elif self.name == "entropy":
+            # the sizes are sorted so floating point rounding is the same for partitions in any order
+            return sum(size * math.log2(size) for size in sorted(int(size) for size in partition_sizes if size > 1))
+
+        return -sum(1 for size in partition_sizes if size > 0)
+
@@ -0,0 +1,107 @@
+import linecache
+from typing import Callable
+
+
+class PegScorer:
+    """Creates scoring functions which are specialised to one fixed code, so the pegs of many other codes against it
+    can be found without counting the colours of the fixed code again (see Solver.get_scorer).
+
+    The body of a scoring function is compiled once for each code length and number of distinct colours in the fixed code,
+    with a comparison for every position and a count for every colour written out instead of looped over. Creating a
+    scoring function for a fixed code then only stores its colours and their counts. Scoring codes this way is up to
+    twice as fast as a closure which loops over the positions and colours (see get_source for an example of the body).
+
+    The source of every compiled function is added to linecache, so it is shown in tracebacks and by inspect.getsource.
+
+    Attributes:
+    factories -- the compiled functions which create scoring functions, stored against (code_length, num_of_distinct_colours, encoded)
+    """
+
+    factories = {}
+
+    @classmethod
+    def create(cls, fixed_code: tuple[int, ...], encoded: bool = False) -> Callable[[tuple[int, ...]], tuple[int, int]]:
+        """Return a function which returns the (black_pegs, white_pegs) of any code against fixed_code,
+        or the pegs encoded as a single integer (see Solver.encode_pegs) if encoded is True
+
+        Parameters:
+        fixed_code -- the code every code is compared to
+        encoded -- whether the function should return encoded pegs (default: False)
+        """
+
+        colour_counts = [(colour, fixed_code.count(colour)) for colour in dict.fromkeys(fixed_code)]
+
+        key = (len(fixed_code), len(colour_counts), encoded)
+        if key not in cls.factories:
+            cls.factories[key] = cls.compile_factory(*key)
+
+        return cls.factories[key](fixed_code, [value for pair in colour_counts for value in pair])
+
+    @classmethod
+    def compile_factory(cls, code_length: int, num_of_distinct_colours: int, encoded: bool) -> Callable:
+        """Compile and return a function which takes a fixed code and the (colour, count) of each of its distinct colours
+        (flattened into one list) and returns its scoring function
+
+        Parameters:
+        code_length -- the length of the fixed code
+        num_of_distinct_colours -- the number of distinct colours in the fixed code
+        encoded -- whether the scoring function should return encoded pegs
+        """
+
+        source = cls.get_source(code_length, num_of_distinct_colours, encoded)
+        file_name = f"<PegScorer {code_length} {num_of_distinct_colours}{' encoded' if encoded else ''}>"
+        linecache.cache[file_name] = (len(source), None, source.splitlines(keepends=True), file_name)
+
+        namespace = {}
+        exec(compile(source, file_name, "exec"), namespace)
+
+        return namespace["create_scorer"]
+
+    @staticmethod
+    def get_source(code_length: int, num_of_distinct_colours: int, encoded: bool) -> str:
+        """Return the source of the function compile_factory compiles. For example, for 2 pegs and 2 distinct colours:
+
+        def create_scorer(fixed_code, colour_counts):
+            (fixed_0, fixed_1, ) = fixed_code
+            (colour_0, count_0, colour_1, count_1, ) = colour_counts
+            def score(code):
+                count = code.count
+                black_pegs = (code[0] == fixed_0) + (code[1] == fixed_1)
+                pegs = 0
+                n = count(colour_0)
+                pegs += n if n < count_0 else count_0
+                n = count(colour_1)
+                pegs += n if n < count_1 else count_1
+                return (black_pegs, pegs - black_pegs)
+            return score
+
+        Parameters:
+        code_length -- the length of the fixed code
+        num_of_distinct_colours -- the number of distinct colours in the fixed code
+        encoded -- whether the scoring function should return encoded pegs
+        """
+
+        fixed_names = "".join(f"fixed_{i}, " for i in range(code_length))
+        colour_names = "".join(f"colour_{j}, count_{j}, " for j in range(num_of_distinct_colours))
+
+        # black_pegs * (code_length + 1) + white_pegs, where white_pegs = pegs - black_pegs
+        result = f"black_pegs * {code_length} + pegs" if encoded else "(black_pegs, pegs - black_pegs)"
+
+        # the number of pegs of either colour is the sum of the minimum count of each colour in both codes.
+        # A comparison is a bool, so 0 is added to a single comparison to make black_pegs an int
+        lines = [
+            f"def create_scorer(fixed_code, colour_counts):",
+            f"    ({fixed_names}) = fixed_code",
+            f"    ({colour_names}) = colour_counts",
+            f"    def score(code):",
+            f"        count = code.count",
+            f"        black_pegs = " + " + ".join(f"(code[{i}] == fixed_{i})" for i in range(code_length)) + (" + 0" if code_length == 1 else ""),
+            f"        pegs = 0"
+        ]
+        for j in range(num_of_distinct_colours):
+            lines.append(f"        n = count(colour_{j})")
+            lines.append(f"        pegs += n if n < count_{j} else count_{j}")
+        lines.append(f"        return {result}")
+        lines.append(f"    return score")
+
+        return "\n".join(lines) + "\n"
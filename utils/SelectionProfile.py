@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+from typing import Union
+
+
+class SelectionProfile:
+    """The times and guesses of every algorithm measured on this machine by Calibrate.py, used by ComputerSolver
+    to pick the algorithm which makes the fewest guesses while meeting a latency target.
+
+    File format (JSON):
+    version -- VERSION
+    cpu_count -- the number of CPU cores of the machine which was calibrated
+    latency_target -- the default number of seconds a game should take
+    measurements -- a list of {code_length, num_of_colours, algorithm, use_multiple_processes, mean_time, mean_guesses}
+
+    Attributes:
+    file_name -- the path of the file
+    cpu_count -- the number of CPU cores of the machine which was calibrated
+    latency_target -- the default number of seconds a game should take
+    measurements -- the measurements, stored against the number of codes they were measured for
+    """
+
+    VERSION = 1
+
+    opened_files = {}  # every SelectionProfile loaded by this process (or None if it could not be used), stored against its file_name
+
+    def __init__(self, file_name: str, cpu_count: int, latency_target: float, measurements: list[dict]) -> None:
+        """Store the measurements of a profile
+
+        Parameters:
+        file_name -- the path of the file
+        cpu_count -- the number of CPU cores of the machine which was calibrated
+        latency_target -- the default number of seconds a game should take
+        measurements -- a list of measurements (see the file format)
+        """
+
+        self.file_name = file_name
+        self.cpu_count = cpu_count
+        self.latency_target = latency_target
+
+        self.measurements = {}
+        for measurement in measurements:
+            num_of_codes = pow(measurement["num_of_colours"], measurement["code_length"])
+            self.measurements.setdefault(num_of_codes, []).append(measurement)
+
+    @classmethod
+    def open(cls, file_name: str) -> Union['SelectionProfile', None]:
+        """Return the SelectionProfile stored in a file, which is only loaded once per process.
+        Return None if the file does not exist, is not valid or was calibrated with a different number of CPU cores.
+
+        Parameters:
+        file_name -- the path of the file
+        """
+
+        if file_name not in cls.opened_files:
+            profile = None
+            try:
+                with open(file_name, "r") as file:
+                    data = json.load(file)
+
+                if data["version"] == cls.VERSION and data["cpu_count"] == multiprocessing.cpu_count():
+                    profile = cls(file_name, data["cpu_count"], data["latency_target"], data["measurements"])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+            cls.opened_files[file_name] = profile
+
+        return cls.opened_files[file_name]
+
+    def save(self) -> None:
+        """Write this profile to its file"""
+
+        measurements = [measurement for num_of_codes in sorted(self.measurements) for measurement in self.measurements[num_of_codes]]
+
+        with open(self.file_name, "w") as file:
+            json.dump({
+                "version": self.VERSION,
+                "cpu_count": self.cpu_count,
+                "latency_target": self.latency_target,
+                "measurements": measurements
+            }, file, indent=2)
+
+    def select(self, code_length: int, num_of_colours: int, latency_target: Union[float, None] = None) -> Union[tuple[str, bool], None]:
+        """Return the (algorithm, use_multiple_processes) which took the fewest guesses, and then the least time,
+        of those which met the latency target for the closest number of codes which is not smaller than the game's.
+        If none met the latency target, the fastest is returned. Return None if no measurements are large enough.
+
+        Parameters:
+        code_length -- the length of the answer code
+        num_of_colours -- the number of available colours
+        latency_target -- the number of seconds a game should take (default: the profile's latency target)
+        """
+
+        if latency_target is None:
+            latency_target = self.latency_target
+
+        num_of_codes = pow(num_of_colours, code_length)
+        sizes = [size for size in self.measurements if size >= num_of_codes]
+        if len(sizes) == 0:
+            return None
+
+        measurements = self.measurements[min(sizes)]
+        fast_measurements = [measurement for measurement in measurements if measurement["mean_time"] <= latency_target]
+
+        if len(fast_measurements) > 0:
+            best = min(fast_measurements, key=lambda measurement: (measurement["mean_guesses"], measurement["mean_time"]))
+        else:
+            best = min(measurements, key=lambda measurement: measurement["mean_time"])
+
+        return (best["algorithm"], best["use_multiple_processes"])
@@ -0,0 +1,226 @@
+import time
+from typing import Union
+from constants.Text import Text
+from solvers.ComputerSolver import ComputerSolver
+from solvers.HumanSolver import HumanSolver
+
+
+class ServerSession:
+    """A game of Mastermind played through MastermindServer.py, which lasts for many requests.
+    A human can guess an answer code given when the session was opened, and the computer can guess it (or a code
+    only the client knows, by being told the pegs of each guess).
+
+    Attributes:
+    code_length -- the length of the answer code
+    max_guesses -- the number of guesses the computer can make, by next_guess or play_computer_game
+    colours -- the available colours, without duplicates
+    colours_map -- stores each colour against its index in colours
+    code -- the answer code, or None if only the client knows it
+    human_solver -- the HumanSolver which scores human guesses, or None if there is no answer code
+    computer_solver -- the ComputerSolver which makes the computer's guesses, created by the first computer guess
+    computer_won -- whether the computer has guessed the answer code
+    deadline -- the number of seconds the computer may take to find each guess, or None if there is no limit
+    last_used -- the time.monotonic() of the last request which used this session
+    """
+
+    DEFAULT_COLOURS = ["red", "blue", "yellow", "green", "orange"]
+
+    def __init__(
+        self, 
+        code_length: int, 
+        max_guesses: int, 
+        colours: list[str], 
+        code: Union[list[str], None], 
+        deadline: Union[float, None] = None
+    ) -> None:
+        """Create the session. Raise a ValueError if the answer code is not valid.
+
+        Parameters:
+        code_length -- the length of the answer code
+        max_guesses -- the number of guesses a full computer game can take
+        colours -- the available colours (duplicates are ignored)
+        code -- the answer code as colour names, or None if only the client knows it
+        deadline -- the number of seconds the computer may take to find each guess (default: None, no limit)
+        """
+
+        self.code_length = code_length
+        self.max_guesses = max_guesses
+
+        # avoid duplicate colours
+        self.colours = []
+        self.colours_map = {}
+        for colour in colours:
+            if colour not in self.colours_map:
+                self.colours_map[colour] = len(self.colours)  # store colour against its index in self.colours
+                self.colours.append(colour)
+
+        self.code = None
+        self.human_solver = None
+        if code is not None:
+            self.code = self.format_code(code)
+            if self.code is None:
+                raise ValueError("No or ill-formed code provided")
+
+            self.human_solver = HumanSolver(self.code)
+
+        self.computer_solver = None
+        self.computer_won = False
+        self.deadline = deadline
+        self.last_used = time.monotonic()
+
+    def format_code(self, code: list[str]) -> Union[tuple[int, ...], None]:
+        """Convert a list of colour names into a tuple of integers, if the colours are valid.
+        Otherwise, return None.
+        """
+
+        if not isinstance(code, list) or len(code) != self.code_length:
+            return None
+
+        formatted_code = []
+
+        for colour in code:
+            if colour not in self.colours_map:  # determine if the colour exists
+                return None
+            formatted_code.append(self.colours_map[colour])
+
+        return tuple(formatted_code)
+
+    def code_to_list(self, code: tuple[int, ...]) -> list[str]:
+        """Convert the code (as a tuple of integers) into a list of colour names."""
+
+        return [self.colours[colour_index] for colour_index in code]
+
+    def create_computer_solver(self) -> None:
+        """Create self.computer_solver, if it has not been created. Its algorithm is copied from an earlier session
+        with the same code length and number of colours (see ComputerSolver.reuse_algorithm), so the codes and tables
+        are only generated once by the server.
+        """
+
+        if self.computer_solver is None:
+            # a computer game without an answer code is scored by the client, so any code of the right length will do
+            code = self.code if self.code is not None else tuple([0] * self.code_length)
+            self.computer_solver = ComputerSolver(code, len(self.colours), reuse_algorithm=True, deadline=self.deadline)
+
+    def score_guess(self, guess: list[str]) -> dict:
+        """Score a human's guess of the answer code using the HumanSolver and return the response of the server.
+        Raise a ValueError if the session has no answer code.
+
+        Parameters:
+        guess -- the guess as colour names
+        """
+
+        if self.human_solver is None:
+            raise ValueError("The session has no code to score guesses against")
+
+        guess_num = self.human_solver.inc_guess_num()
+
+        formatted_guess = self.format_code(guess)
+        if formatted_guess is None:
+            return {"guess_num": guess_num, "error": Text.ILL_FORMED_GUESS(guess_num)}
+
+        (black_pegs, white_pegs) = self.human_solver.get_next_guess(formatted_guess)
+
+        return {"guess_num": guess_num, "pegs": [black_pegs, white_pegs], "won": black_pegs == self.code_length}
+
+    def next_guess(self, pegs: Union[list[int], None]) -> dict:
+        """Make the computer's next guess and return the response of the server. If the session has an answer code,
+        the guess is scored against it. Otherwise, the client must give the pegs of the computer's previous guess.
+        Raise a ValueError if the pegs are not valid or not consistent with any code, in which case the session
+        is not changed, so the client can send the request again with the right pegs.
+        Once the computer has made max_guesses guesses without guessing the code, the response only has "lost", 
+        as in play_computer_game.
+
+        Parameters:
+        pegs -- the [black_pegs, white_pegs] of the previous guess, or None if the session has an answer code
+        """
+
+        if self.computer_won:
+            raise ValueError("The code has already been guessed")
+
+        self.create_computer_solver()
+
+        if self.code is None and len(self.computer_solver.get_guesses()) > 0:
+            if (
+                not isinstance(pegs, list) or len(pegs) != 2 or not all(isinstance(peg, int) and peg >= 0 for peg in pegs)
+                or sum(pegs) > self.code_length or pegs == [self.code_length - 1, 1]
+            ):
+                raise ValueError("The pegs of the previous guess must be [black_pegs, white_pegs]")
+
+            if pegs[0] == self.code_length:
+                self.computer_won = True
+                raise ValueError("The code has already been guessed")
+
+        if len(self.computer_solver.get_guesses()) >= self.max_guesses:
+            return {"lost": True}
+
+        if self.code is not None:
+            guess_num = self.computer_solver.inc_guess_num()
+            (black_pegs, white_pegs) = self.computer_solver.get_next_guess()
+            guess = self.computer_solver.get_guesses()[-1]
+            self.computer_won = black_pegs == self.code_length
+
+            return {
+                "guess_num": guess_num,
+                "guess": self.code_to_list(guess),
+                "search_finished": self.computer_solver.algorithm.is_search_finished,
+                "pegs": [black_pegs, white_pegs],
+                "won": self.computer_won,
+                "lost": not self.computer_won and guess_num == self.max_guesses
+            }
+
+        # the algorithm before this guess, which is put back if the pegs are not consistent with any code
+        # (see Algorithm.copy, the attributes each guess changes are replaced so they are not shared with the copy)
+        algorithm = self.computer_solver.algorithm.copy()
+        guess_num = self.computer_solver.inc_guess_num()
+
+        try:
+            guess = self.computer_solver.make_guess(tuple(pegs) if pegs is not None else None)
+
+            # some algorithms still make a guess without any remaining codes, the others raise an error
+            if self.computer_solver.algorithm.get_num_of_remaining_codes() == 0:
+                raise ValueError("There are no remaining codes")
+        except (ValueError, IndexError):
+            self.computer_solver.algorithm = algorithm
+            raise ValueError("The pegs are not consistent with any code")
+
+        # the pegs of this guess are not known yet, so the computer has only lost once they are sent
+        return {
+            "guess_num": guess_num, 
+            "guess": self.code_to_list(guess), 
+            "search_finished": self.computer_solver.algorithm.is_search_finished,
+            "lost": False
+        }
+
+    def play_computer_game(self) -> dict:
+        """Play a full computer game for the answer code, from the computer's next guess, and return the response of the server.
+        Raise a ValueError if the session has no answer code.
+        """
+
+        if self.code is None:
+            raise ValueError("The session has no code for the computer to guess")
+
+        if self.computer_won:
+            raise ValueError("The code has already been guessed")
+
+        self.create_computer_solver()
+
+        lines = []
+        guesses = []
+
+        while True:
+            guess_num = self.computer_solver.inc_guess_num()
+            if guess_num > self.max_guesses:
+                lines.append(Text.LOST)
+                break
+
+            (black_pegs, white_pegs) = self.computer_solver.get_next_guess()
+            guesses.append(self.code_to_list(self.computer_solver.get_guesses()[-1]))
+
+            lines.append(Text.GUESS(guess_num, black_pegs, white_pegs))
+
+            if black_pegs == self.code_length:
+                lines.append(Text.WON(guess_num))
+                self.computer_won = True
+                break
+
+        return {"guesses": guesses, "lines": lines, "won": self.computer_won}
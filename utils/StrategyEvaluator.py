@@ -0,0 +1,199 @@
+import itertools
+import time
+from typing import Union
+from solvers.ComputerSolver import ComputerSolver
+from utils.WorkerPool import WorkerPool
+
+
+class StrategyEvaluator:
+    """Plays every possible answer code with an algorithm at once, to find how many guesses the algorithm takes for each of them.
+
+    The games are played together by walking the algorithm's strategy tree (as in StrategyTreeFile.compile): every game
+    with the same guesses and pegs so far is at the same node, so the next guess of a node is only found once for all of its
+    games. The answer codes of a node are then split by the pegs they give the guess, and each split is a node of its own.
+    Nodes after the first guess are independent of each other, so they can be walked by worker processes of the WorkerPool.
+
+    Attributes:
+    algorithm_class -- the class of the algorithm
+    code_length -- the length of every code
+    num_of_colours -- the number of available colours
+    args, kwargs -- the other arguments of algorithm_class, which should not enable multiple processes since the nodes
+                    are walked by worker processes instead
+    max_guesses -- the number of guesses after which a game is lost
+    num_of_processes -- the number of worker processes which walk the nodes after the first guess
+    """
+
+    DEFAULT_MAX_GUESSES = 12
+
+    def __init__(
+        self,
+        algorithm_class: type,
+        code_length: int,
+        num_of_colours: int,
+        args: tuple = (),
+        kwargs: Union[dict, None] = None,
+        max_guesses: int = DEFAULT_MAX_GUESSES,
+        num_of_processes: int = 1
+    ) -> None:
+        """Store the parameters of the evaluation, which is run by calling evaluate.
+
+        Parameters:
+        algorithm_class -- the class of the algorithm
+        code_length -- the length of every code
+        num_of_colours -- the number of available colours
+        args, kwargs -- the other arguments of algorithm_class, after code and num_of_colours (default: no other arguments)
+        max_guesses -- the number of guesses after which a game is lost (default: DEFAULT_MAX_GUESSES)
+        num_of_processes -- the number of worker processes to use, or 1 to walk every node in this process (default: 1)
+        """
+
+        self.algorithm_class = algorithm_class
+        self.code_length = code_length
+        self.num_of_colours = num_of_colours
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.max_guesses = max_guesses
+        self.num_of_processes = num_of_processes
+
+    def evaluate(self) -> dict:
+        """Play every answer code and return the result, containing:
+        num_of_secrets -- the number of answer codes
+        guesses -- the number of answer codes solved in each number of guesses
+        mean_guesses, max_guesses -- the mean and most guesses taken to solve an answer code (not including lost games)
+        num_of_lost -- the number of answer codes which were not solved within max_guesses
+        num_of_nodes -- the number of guesses which were found, one per node of the strategy tree
+        total_time -- the seconds taken to play every answer code
+        """
+
+        start = time.perf_counter()
+
+        secrets = list(itertools.product(range(self.num_of_colours), repeat=self.code_length))
+
+        algorithm = self.create_algorithm(self.algorithm_class, self.code_length, self.num_of_colours, self.args, self.kwargs)
+        algorithm.inc_guess_num()
+        algorithm.make_guess()
+
+        # the first guess is made here, then every split of the answer codes by its pegs is walked as a separate task
+        subtrees = self.split_secrets(algorithm, secrets)
+        guesses = {1: len(subtrees.pop((self.code_length, 0), []))}
+        num_of_lost = 0
+        num_of_nodes = 1
+
+        if self.max_guesses == 1:
+            num_of_lost = sum(len(subtree) for subtree in subtrees.values())
+            subtrees = {}
+
+        # the largest subtrees are sent first, so a worker is not left walking a large subtree after the others have finished
+        tasks = []
+        for pegs in sorted(subtrees, key=lambda pegs: len(subtrees[pegs]), reverse=True):
+            tasks.append((
+                self.algorithm_class,
+                self.code_length,
+                self.num_of_colours,
+                self.args,
+                self.kwargs,
+                self.max_guesses,
+                pegs,
+                subtrees[pegs]
+            ))
+
+        if self.num_of_processes > 1 and len(tasks) > 1:
+            results = WorkerPool.map(self.num_of_processes, StrategyEvaluator.evaluate_worker, tasks)
+        else:
+            results = [StrategyEvaluator.evaluate_worker(task) for task in tasks]
+
+        for (subtree_guesses, subtree_num_of_lost, subtree_num_of_nodes) in results:
+            for guess_num, count in subtree_guesses.items():
+                guesses[guess_num] = guesses.get(guess_num, 0) + count
+            num_of_lost += subtree_num_of_lost
+            num_of_nodes += subtree_num_of_nodes
+
+        guesses = {guess_num: guesses[guess_num] for guess_num in sorted(guesses) if guesses[guess_num] > 0}
+        num_of_solved = sum(guesses.values())
+
+        return {
+            "algorithm": self.algorithm_class.__name__,
+            "code_length": self.code_length,
+            "num_of_colours": self.num_of_colours,
+            "num_of_secrets": len(secrets),
+            "guesses": guesses,
+            "mean_guesses": sum(num * count for num, count in guesses.items()) / num_of_solved if num_of_solved > 0 else None,
+            "max_guesses": max(guesses, default=None),
+            "num_of_lost": num_of_lost,
+            "num_of_nodes": num_of_nodes,
+            "total_time": time.perf_counter() - start
+        }
+
+    @staticmethod
+    def create_algorithm(algorithm_class: type, code_length: int, num_of_colours: int, args: tuple, kwargs: dict) -> 'Algorithm':
+        """Return an algorithm which has not made any guesses, copied from the one created by this process
+        for the same parameters (see ComputerSolver.create_algorithm). Its answer code is a placeholder, since
+        the pegs of every guess are set by the evaluation.
+
+        Parameters:
+        algorithm_class -- the class of the algorithm
+        code_length -- the length of every code
+        num_of_colours -- the number of available colours
+        args, kwargs -- the other arguments of algorithm_class
+        """
+
+        return ComputerSolver.create_algorithm(True, algorithm_class, tuple([0] * code_length), num_of_colours, *args, **kwargs)
+
+    @staticmethod
+    def split_secrets(algorithm: 'Algorithm', secrets: list[tuple[int, ...]]) -> dict[tuple[int, int], list[tuple[int, ...]]]:
+        """Return the answer codes stored against the (black_pegs, white_pegs) they give the algorithm's guess
+
+        Parameters:
+        algorithm -- an algorithm which has made its guess
+        secrets -- the answer codes of the algorithm's node
+        """
+
+        score = algorithm.get_scorer(algorithm.guess)
+
+        subtrees = {}
+        for secret in secrets:
+            pegs = score(secret)
+            if pegs not in subtrees:
+                subtrees[pegs] = []
+            subtrees[pegs].append(secret)
+
+        return subtrees
+
+    @staticmethod
+    def evaluate_worker(task: tuple) -> tuple[dict[int, int], int, int]:
+        """Walk the nodes of the answer codes which gave the first guess the same pegs, in this process or a worker
+        process of the WorkerPool, and return (guesses, num_of_lost, num_of_nodes) of those answer codes (see evaluate)
+
+        Parameters:
+        task -- tuple of (algorithm_class, code_length, num_of_colours, args, kwargs, max_guesses, pegs, secrets)
+        """
+
+        (algorithm_class, code_length, num_of_colours, args, kwargs, max_guesses, pegs, secrets) = task
+
+        algorithm = StrategyEvaluator.create_algorithm(algorithm_class, code_length, num_of_colours, args, kwargs)
+        algorithm.inc_guess_num()
+        algorithm.make_guess()
+
+        guesses = {}
+        num_of_lost = 0
+        num_of_nodes = 0
+        winning_pegs = (code_length, 0)
+
+        # each node is the algorithm before it is given the pegs of its previous guess, and the answer codes which gave them
+        nodes = [(algorithm, pegs, secrets)]
+        while len(nodes) > 0:
+            (algorithm, pegs, secrets) = nodes.pop()
+
+            algorithm.pegs = pegs
+            guess_num = algorithm.inc_guess_num()
+            algorithm.make_guess()
+            num_of_nodes += 1
+
+            for (pegs, subtree) in StrategyEvaluator.split_secrets(algorithm, secrets).items():
+                if pegs == winning_pegs:
+                    guesses[guess_num] = guesses.get(guess_num, 0) + len(subtree)
+                elif guess_num == max_guesses:
+                    num_of_lost += len(subtree)
+                else:
+                    nodes.append((algorithm.copy(), pegs, subtree))
+
+        return (guesses, num_of_lost, num_of_nodes)
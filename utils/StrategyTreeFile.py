@@ -0,0 +1,160 @@
+import collections
+import contextlib
+import mmap
+import os
+import struct
+
+
+class StrategyTreeFile:
+    """A compiled strategy tree, stored in a binary file which is memory-mapped so it can be shared by processes.
+
+    Every node of the tree stores the index of a guess (see Algorithm.get_index) and the index of the next node for
+    each possible encoded pegs of the guess (see Solver.encode_pegs), where 0 means the game is over.
+    The root node is node 0.
+
+    File format (little-endian):
+    header -- MAGIC, VERSION, code_length, num_of_colours, num_of_nodes (see HEADER)
+    nodes -- for each node, the guess index followed by (code_length + 1)^2 next node indexes, all as uint32
+
+    Attributes:
+    file_name -- the path of the file
+    code_length -- the length of every code in the tree
+    num_of_colours -- the number of colours of every code in the tree
+    num_of_nodes -- the number of nodes in the tree
+    num_of_children -- the number of next node indexes stored in each node
+    node_size -- the number of bytes of each node
+    file -- the opened file
+    map -- the memory-map of the file
+    """
+
+    MAGIC = b"MMST"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIIII")
+
+    opened_files = {}  # every StrategyTreeFile opened by this process, stored against its file_name
+
+    def __init__(self, file_name: str) -> None:
+        """Open and memory-map a file created by compile. Raise a ValueError if it is not a valid file.
+
+        Parameters:
+        file_name -- the path of the file
+        """
+
+        self.file_name = file_name
+        self.file = open(self.file_name, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # the file is empty
+            self.file.close()
+            raise
+
+        try:
+            self.validate()
+        except ValueError:
+            self.map.close()
+            self.file.close()
+            raise
+
+    def validate(self) -> None:
+        """Read the header of the file and raise a ValueError if it is not a complete file of this VERSION"""
+
+        if len(self.map) < self.HEADER.size:
+            raise ValueError(f"{self.file_name} is not a strategy tree file")
+
+        (magic, version, self.code_length, self.num_of_colours, self.num_of_nodes) = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.file_name} is not a strategy tree file of version {self.VERSION}")
+
+        self.num_of_children = pow(self.code_length + 1, 2)
+        self.node_size = 4 * (1 + self.num_of_children)
+
+        if len(self.map) != self.HEADER.size + self.num_of_nodes * self.node_size:
+            raise ValueError(f"{self.file_name} is incomplete")
+
+    @classmethod
+    def open(cls, file_name: str) -> 'StrategyTreeFile':
+        """Return the StrategyTreeFile for file_name, which is only opened once per process
+
+        Parameters:
+        file_name -- the path of the file
+        """
+
+        if file_name not in cls.opened_files:
+            cls.opened_files[file_name] = cls(file_name)
+
+        return cls.opened_files[file_name]
+
+    def get_guess(self, node: int) -> int:
+        """Return the index of the guess of a node
+
+        Parameters:
+        node -- the index of the node
+        """
+
+        return struct.unpack_from("<I", self.map, self.HEADER.size + node * self.node_size)[0]
+
+    def get_next_node(self, node: int, feedback: int) -> int:
+        """Return the index of the node which should be used after a node's guess gets the feedback, or 0 if there is none
+
+        Parameters:
+        node -- the index of the node
+        feedback -- the encoded pegs of the node's guess
+        """
+
+        return struct.unpack_from("<I", self.map, self.HEADER.size + node * self.node_size + 4 * (1 + feedback))[0]
+
+    @classmethod
+    def compile(cls, algorithm: 'Algorithm', file_name: str) -> int:
+        """Build the strategy tree of a deterministic algorithm, by making every guess it could make for every answer code,
+        and write it to a file. Return the number of nodes in the tree. The file is replaced in one step, so a file
+        which was not completely written (e.g. because the compilation was interrupted) is never left in its place.
+
+        Parameters:
+        algorithm -- an algorithm which has not made any guesses, its answer code is not used
+        file_name -- the path of the file to write
+        """
+
+        num_of_children = pow(algorithm.code_length + 1, 2)
+        winning_pegs = (algorithm.code_length, 0)
+
+        algorithm.inc_guess_num()
+        algorithm.make_guess()
+
+        nodes = []
+        num_of_nodes = 1  # the number of nodes which have been given an index
+        algorithms = collections.deque([algorithm])  # the algorithm of every node, in the order of their index
+
+        while len(algorithms) > 0:
+            algorithm = algorithms.popleft()
+            next_nodes = [0] * num_of_children
+
+            for pegs in sorted(algorithm.get_possible_pegs()):
+                if pegs == winning_pegs:
+                    continue
+
+                next_algorithm = algorithm.copy()
+                next_algorithm.pegs = pegs
+                next_algorithm.inc_guess_num()
+                next_algorithm.make_guess()
+
+                next_nodes[algorithm.encode_pegs(pegs)] = num_of_nodes
+                num_of_nodes += 1
+                algorithms.append(next_algorithm)
+
+            nodes.append(struct.pack(f"<{1 + num_of_children}I", algorithm.get_index(algorithm.guess), *next_nodes))
+
+        temporary_file_name = f"{file_name}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_file_name, "wb") as file:
+                file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, algorithm.code_length, algorithm.num_of_colours, len(nodes)))
+                file.writelines(nodes)
+
+            os.replace(temporary_file_name, file_name)
+        except BaseException:  # including KeyboardInterrupt, the partly written file is removed
+            with contextlib.suppress(OSError):
+                os.remove(temporary_file_name)
+            raise
+
+        cls.opened_files.pop(file_name, None)  # the next open maps the new file
+
+        return len(nodes)
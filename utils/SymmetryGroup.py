@@ -0,0 +1,250 @@
+import copy
+import itertools
+from typing import Union
+from solvers.Solver import np
+
+
+class SymmetryGroup:
+    """Stores the symmetries of the codes which are left by the guesses made so far.
+
+    A symmetry moves the colour at every position k of a code to position_map[k] and replaces each colour c
+    with colour_map[c]. The pegs of two codes are unchanged if the same symmetry is applied to both codes,
+    so if a symmetry leaves every guess unchanged then it also leaves the remaining codes unchanged and
+    any two codes which it maps to each other would partition the remaining codes into partitions of the same sizes.
+    Therefore, only one code from each group of codes which are mapped to each other (called an "orbit") needs to be scored.
+
+    Attributes:
+    algorithm -- the algorithm whose codes the symmetries apply to
+    position_maps -- every (position_map, colour_map) which leaves every guess unchanged, where colour_map
+                     only contains the colours used in the guesses
+    used_colours -- the colours used in the guesses
+    labels -- the index of the first code of the orbit of every code, found by the last call to get_representatives
+              (or None if every code is in its own orbit)
+    last_indices -- the index of the last code of every orbit, stored against the index of its first code
+    """
+
+    MAX_CODE_LENGTH = 8  # the longest code length for which every position_map is checked (8! = 40320)
+
+    def __init__(self, algorithm: 'Algorithm') -> None:
+        """Initalise the group as every symmetry, since no guesses have been made.
+
+        Parameters:
+        algorithm -- the algorithm whose codes the symmetries apply to
+        """
+
+        self.algorithm = algorithm
+
+        if self.algorithm.code_length <= self.MAX_CODE_LENGTH:
+            self.position_maps = [(position_map, {}) for position_map in itertools.permutations(range(self.algorithm.code_length))]
+        else:
+            self.position_maps = [(tuple(range(self.algorithm.code_length)), {})]
+
+        self.used_colours = set()
+
+        self.labels = None
+        self.last_indices = None
+
+    def copy(self, algorithm: 'Algorithm') -> 'SymmetryGroup':
+        """Return a copy of this group for a copy of its algorithm
+
+        Parameters:
+        algorithm -- the copy of the algorithm
+        """
+
+        symmetry_group = copy.copy(self)
+        symmetry_group.algorithm = algorithm
+        symmetry_group.used_colours = set(self.used_colours)
+
+        return symmetry_group
+
+    def add_guess(self, guess: tuple[int, ...]) -> None:
+        """Remove every symmetry which does not leave the guess unchanged
+
+        Parameters:
+        guess -- the guess which has been made
+        """
+
+        self.used_colours.update(guess)
+
+        position_maps = []
+        for (position_map, colour_map) in self.position_maps:
+            colour_map = self.extend_colour_map(position_map, colour_map, guess)
+            if colour_map is not None:
+                position_maps.append((position_map, colour_map))
+
+        self.position_maps = position_maps
+
+    def extend_colour_map(self, position_map: tuple[int, ...], colour_map: dict[int, int], guess: tuple[int, ...]) -> Union[dict[int, int], None]:
+        """Return colour_map extended so that the symmetry leaves the guess unchanged, or None if this is not possible
+
+        Parameters:
+        position_map -- where the colour at each position is moved to
+        colour_map -- the colour each colour used in the previous guesses is replaced with
+        guess -- the guess which should be left unchanged
+        """
+
+        colour_map = dict(colour_map)
+        mapped_colours = set(colour_map.values())
+
+        for k, colour in enumerate(guess):
+            new_colour = guess[position_map[k]]
+            if colour in colour_map:
+                if colour_map[colour] != new_colour:
+                    return None
+            elif new_colour in mapped_colours:  # two colours cannot be replaced with the same colour
+                return None
+            else:
+                colour_map[colour] = new_colour
+                mapped_colours.add(new_colour)
+
+        return colour_map
+
+    def get_generators(self) -> list[tuple[tuple[int, ...], list[int]]]:
+        """Return a small list of (position_map, colour_map) which can be combined to make every symmetry.
+        Each colour_map contains every colour.
+        """
+
+        code_length = self.algorithm.code_length
+        num_of_colours = self.algorithm.num_of_colours
+        colour_maps = {position_map: colour_map for (position_map, colour_map) in self.position_maps}
+
+        generators = []
+
+        # greedily pick position_maps which cannot be made from the position_maps already picked
+        identity = tuple(range(code_length))
+        group = {identity}
+        for position_map in colour_maps:
+            if position_map in group:
+                continue
+
+            generators.append(position_map)
+
+            # extend the group with every position_map made by combining it with the generators
+            new_maps = list(group)
+            while len(new_maps) > 0:
+                combined_maps = []
+                for new_map in new_maps:
+                    for generator in generators:
+                        combined_map = tuple(generator[new_map[k]] for k in range(code_length))
+                        if combined_map not in group:
+                            group.add(combined_map)
+                            combined_maps.append(combined_map)
+                new_maps = combined_maps
+
+        symmetries = []
+        for position_map in generators:
+            colour_map = list(range(num_of_colours))  # colours which have not been used are not replaced
+            for colour, new_colour in colour_maps[position_map].items():
+                colour_map[colour] = new_colour
+            symmetries.append((position_map, colour_map))
+
+        # colours which have not been used can be swapped with each other
+        unused_colours = [colour for colour in range(num_of_colours) if colour not in self.used_colours]
+        for i in range(len(unused_colours) - 1):
+            colour_map = list(range(num_of_colours))
+            colour_map[unused_colours[i]], colour_map[unused_colours[i + 1]] = unused_colours[i + 1], unused_colours[i]
+            symmetries.append((identity, colour_map))
+
+        return symmetries
+
+    def get_representatives(self) -> 'np.ndarray':
+        """Return the index of the first code (see Algorithm.get_index) of every orbit, in ascending order.
+        This is a NumPy array if NumPy is installed, otherwise it is a list.
+        """
+
+        generators = self.get_generators()
+        num_of_codes = self.algorithm.num_of_codes
+
+        if len(generators) == 0:
+            self.labels = None
+        elif np is not None:
+            self.labels = self.get_array_labels(generators)
+        else:
+            self.labels = self.get_labels(generators)
+        self.last_indices = None
+
+        if self.labels is None:
+            return np.arange(num_of_codes) if np is not None else list(range(num_of_codes))
+
+        if np is not None:
+            return np.flatnonzero(self.labels == np.arange(num_of_codes))
+
+        return [i for i in range(num_of_codes) if self.labels[i] == i]
+
+    def get_last_index(self, first_index: int) -> int:
+        """Return the index of the last code of an orbit, using the orbits found by the last call to get_representatives
+
+        Parameters:
+        first_index -- the index of the first code of the orbit
+        """
+
+        if self.labels is None:
+            return first_index
+
+        if self.last_indices is None:
+            if np is not None:
+                self.last_indices = np.arange(len(self.labels))
+                np.maximum.at(self.last_indices, self.labels, np.arange(len(self.labels)))
+            else:
+                self.last_indices = list(range(len(self.labels)))
+                for i, label in enumerate(self.labels):
+                    self.last_indices[label] = max(self.last_indices[label], i)
+
+        return int(self.last_indices[first_index])
+
+    def get_labels(self, generators: list[tuple[tuple[int, ...], list[int]]]) -> list[int]:
+        """Return the index of the first code of the orbit of every code, using union-find
+
+        Parameters:
+        generators -- the list returned by get_generators
+        """
+
+        roots = list(range(self.algorithm.num_of_codes))  # the root of each orbit is its first code
+
+        def find(i: int) -> int:
+            while roots[i] != i:
+                roots[i] = roots[roots[i]]
+                i = roots[i]
+            return i
+
+        for (position_map, colour_map) in generators:
+            for i, code in enumerate(self.algorithm.generate_codes()):
+                new_code = [0] * len(code)
+                for k, colour in enumerate(code):
+                    new_code[position_map[k]] = colour_map[colour]
+
+                root, new_root = find(i), find(self.algorithm.get_index(new_code))
+                roots[max(root, new_root)] = min(root, new_root)
+
+        return [find(i) for i in range(self.algorithm.num_of_codes)]
+
+    def get_array_labels(self, generators: list[tuple[tuple[int, ...], list[int]]]) -> 'np.ndarray':
+        """Same as get_labels, but every code is mapped at once using NumPy
+
+        Parameters:
+        generators -- the list returned by get_generators
+        """
+
+        code_array = self.algorithm.code_array
+
+        # the index of the code each code is mapped to, by each generator
+        mapped_indices = []
+        for (position_map, colour_map) in generators:
+            inverse_position_map = [0] * len(position_map)
+            for k, new_k in enumerate(position_map):
+                inverse_position_map[new_k] = k
+
+            mapped_codes = np.array(colour_map, dtype=np.uint8)[code_array][:, inverse_position_map]
+            mapped_indices.append(self.algorithm.get_array_indices(mapped_codes))
+
+        # every code is labelled with the first code of its orbit by repeatedly taking the lowest label of the
+        # codes it is mapped to, and the label of its label, until no labels change
+        labels = np.arange(len(code_array))
+        while True:
+            previous_labels = labels
+            for indices in mapped_indices:
+                labels = np.minimum(labels, labels[indices])
+            labels = labels[labels]
+
+            if np.array_equal(labels, previous_labels):
+                return labels
@@ -0,0 +1,194 @@
+import mmap
+import os
+import struct
+from typing import Union
+from solvers.Solver import np
+
+
+class TableSnapshot:
+    """The code tables of a code length and number of colours, stored in a binary file which is memory-mapped when it is
+    opened, so a new process uses the tables without generating them again or copying them into its memory
+    (see Algorithm.generate_code_array and FeedbackTable). Processes which map the same file share its memory.
+
+    Snapshots are only used once a directory is set (see use_directory). The snapshot of a code length and number of
+    colours is written the first time its tables are generated, and written again when a FeedbackTable is precomputed
+    for it, so it also stores the matrix.
+
+    File format (little-endian):
+    header -- MAGIC, VERSION, code_length, num_of_colours, has_matrix (see HEADER), padded to HEADER_SIZE bytes
+    codes -- every code in the order of Algorithm.generate_codes, one byte per colour
+    matrix -- if has_matrix, every row of the FeedbackTable one after another, one byte per encoded feedback
+
+    A file of another VERSION is ignored and replaced, so VERSION must change whenever the order of the codes,
+    the encoding of feedback (see Solver.encode_pegs) or the format changes.
+
+    Attributes:
+    file_name -- the path of the file
+    code_length -- the length of every code
+    num_of_colours -- the number of colours of every code
+    num_of_codes -- the number of codes
+    has_matrix -- whether the file stores the matrix of a FeedbackTable
+    file -- the opened file
+    map -- the memory-map of the file
+    """
+
+    MAGIC = b"MMTS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIIII")
+    HEADER_SIZE = 64  # the tables start on a cache line
+
+    directory = None  # the directory of the snapshots, or None if they are not used
+    opened_files = {}  # every TableSnapshot opened by this process, stored against its file_name
+    num_of_loads = 0  # the number of snapshots opened by this process
+    num_of_saves = 0  # the number of snapshots written by this process
+
+    def __init__(self, file_name: str) -> None:
+        """Open and memory-map a file written by save. Raise a ValueError if it is not a valid file.
+
+        Parameters:
+        file_name -- the path of the file
+        """
+
+        self.file_name = file_name
+        self.file = open(self.file_name, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # the file is empty
+            self.file.close()
+            raise
+
+        try:
+            self.validate()
+        except ValueError:
+            self.map.close()
+            self.file.close()
+            raise
+
+    def validate(self) -> None:
+        """Read the header of the file and raise a ValueError if it is not a valid file of this VERSION"""
+
+        if len(self.map) < self.HEADER_SIZE:
+            raise ValueError(f"{self.file_name} is not a table snapshot")
+
+        (magic, version, self.code_length, self.num_of_colours, has_matrix) = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.file_name} is not a table snapshot of version {self.VERSION}")
+
+        self.num_of_codes = pow(self.num_of_colours, self.code_length)
+        self.has_matrix = has_matrix == 1
+
+        size = self.HEADER_SIZE + self.num_of_codes * self.code_length
+        if self.has_matrix:
+            size += self.num_of_codes * self.num_of_codes
+        if len(self.map) != size:
+            raise ValueError(f"{self.file_name} is incomplete")
+
+    @classmethod
+    def use_directory(cls, directory: Union[str, None]) -> None:
+        """Set the directory the snapshots of this process are opened from and written to
+
+        Parameters:
+        directory -- the path of the directory, which is created when the first snapshot is written, or None to stop using snapshots
+        """
+
+        cls.directory = directory
+
+    @classmethod
+    def get_file_name(cls, code_length: int, num_of_colours: int) -> str:
+        """Return the path of the snapshot of a code length and number of colours in cls.directory
+
+        Parameters:
+        code_length -- the length of every code
+        num_of_colours -- the number of colours of every code
+        """
+
+        return os.path.join(cls.directory, f"tables-{code_length}-{num_of_colours}.mmts")
+
+    @classmethod
+    def open(cls, code_length: int, num_of_colours: int) -> Union['TableSnapshot', None]:
+        """Return the TableSnapshot of a code length and number of colours, which is only opened once per process,
+        or None if snapshots are not used or the snapshot does not exist or is not valid
+
+        Parameters:
+        code_length -- the length of every code
+        num_of_colours -- the number of colours of every code
+        """
+
+        if cls.directory is None:
+            return None
+
+        file_name = cls.get_file_name(code_length, num_of_colours)
+        if file_name not in cls.opened_files:
+            try:
+                snapshot = cls(file_name)
+            except (OSError, ValueError):  # the snapshot has not been written, or was written by another version
+                return None
+
+            if (snapshot.code_length, snapshot.num_of_colours) != (code_length, num_of_colours):
+                return None
+
+            cls.opened_files[file_name] = snapshot
+
+            cls.num_of_loads += 1
+
+        return cls.opened_files[file_name]
+
+    @classmethod
+    def save(cls, code_length: int, num_of_colours: int, codes: bytes, matrix: Union[bytes, None] = None) -> None:
+        """Write the snapshot of a code length and number of colours, if snapshots are used. The file is replaced
+        in one step, so a process opening it never reads a partly written file, and processes which have mapped
+        the old file keep using it. A snapshot which cannot be written is not used, since the tables can be generated.
+
+        Parameters:
+        code_length -- the length of every code
+        num_of_colours -- the number of colours of every code
+        codes -- every code in the order of Algorithm.generate_codes, e.g. the array of Algorithm.generate_code_array
+        matrix -- every row of the FeedbackTable one after another (default: None, the snapshot does not store the matrix)
+        """
+
+        if cls.directory is None:
+            return
+
+        file_name = cls.get_file_name(code_length, num_of_colours)
+        temporary_file_name = f"{file_name}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cls.directory, exist_ok=True)
+            with open(temporary_file_name, "wb") as file:
+                header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, code_length, num_of_colours, int(matrix is not None))
+                file.write(header.ljust(cls.HEADER_SIZE, b"\0"))
+                file.write(codes)
+                if matrix is not None:
+                    file.write(matrix)
+
+            os.replace(temporary_file_name, file_name)
+        except OSError:
+            return
+
+        cls.opened_files.pop(file_name, None)  # the next open maps the new file
+        cls.num_of_saves += 1
+
+    def get_code_array(self) -> 'np.ndarray':
+        """Return every code as a read-only NumPy array with one code per row, which is a view of the memory-map"""
+
+        return np.frombuffer(
+            self.map,
+            dtype=np.uint8,
+            count=self.num_of_codes * self.code_length,
+            offset=self.HEADER_SIZE
+        ).reshape(self.num_of_codes, self.code_length)
+
+    def get_matrix(self) -> 'np.ndarray':
+        """Return the matrix of the FeedbackTable, which is a view of the memory-map: a read-only NumPy array with one row per code
+        if NumPy is installed, otherwise a memoryview of every row one after another. Only call this if self.has_matrix is True.
+        """
+
+        start = self.HEADER_SIZE + self.num_of_codes * self.code_length
+        if np is not None:
+            return np.frombuffer(
+                self.map,
+                dtype=np.uint8,
+                count=self.num_of_codes * self.num_of_codes,
+                offset=start
+            ).reshape(self.num_of_codes, self.num_of_codes)
+
+        return memoryview(self.map)[start:start + self.num_of_codes * self.num_of_codes]
@@ -0,0 +1,199 @@
+import array
+import math
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Union
+from solvers.Solver import np
+
+
+class SharedArray:
+    """An array of integers stored in shared memory, so worker processes can read and write it without it being copied.
+
+    Attributes:
+    shared_memory -- the block of shared memory which stores the array
+    name -- the name of the block of shared memory, used by worker processes to attach to the array
+    length -- the number of integers in the array
+    typecode -- the type of each integer, using the typecodes of the array module ("q" for int64 or "B" for uint8)
+    """
+
+    ITEM_SIZES = {"q": 8, "B": 1}
+
+    def __init__(self, length: int, typecode: str = "q", name: Union[str, None] = None) -> None:
+        """Create a new block of shared memory, or attach to an existing block if a name is given.
+
+        Parameters:
+        length -- the number of integers in the array
+        typecode -- the type of each integer, "q" or "B" (default: "q")
+        name -- the name of an existing block of shared memory (default: None)
+        """
+
+        size = max(1, length * self.ITEM_SIZES[typecode])  # shared memory cannot have a size of 0
+        self.shared_memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+
+        self.name = self.shared_memory.name
+        self.length = length
+        self.typecode = typecode
+
+    def get_view(self) -> 'np.ndarray':
+        """Return a view of the array which reads and writes directly to the shared memory.
+        This is a NumPy array if NumPy is installed, otherwise it is a memoryview.
+        The view must be deleted before the array is closed.
+        """
+
+        if np is not None:
+            dtype = np.int64 if self.typecode == "q" else np.uint8
+            return np.ndarray((self.length,), dtype=dtype, buffer=self.shared_memory.buf)
+
+        return self.shared_memory.buf.cast(self.typecode)[:self.length]
+
+    def read(self, start: int = 0, end: Union[int, None] = None) -> 'np.ndarray':
+        """Return a copy of the integers in the index range [start, end) 
+        as a NumPy array if NumPy is installed, otherwise as a list.
+
+        Parameters:
+        start -- the index to start reading from (default: 0)
+        end -- the index to stop reading at (default: the length of the array)
+        """
+
+        view = self.get_view()[start:end]
+        return view.copy() if np is not None else view.tolist()
+
+    def write(self, values: 'np.ndarray', start: int = 0) -> None:
+        """Write the values into the array, starting at the given index
+
+        Parameters:
+        values -- the integers to write
+        start -- the index to start writing at (default: 0)
+        """
+
+        if np is None:
+            values = array.array(self.typecode, values)
+
+        self.get_view()[start:start + len(values)] = values
+
+    def close(self, unlink: bool = False) -> None:
+        """Close this process' access to the array and free the shared memory, if unlink is True.
+
+        Parameters:
+        unlink -- whether the shared memory should be freed, which should only be done by the process which created it (default: False)
+        """
+
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
+
+
+class WorkerPool:
+    """A pool of worker processes which is created once and reused by every algorithm, so that processes
+    do not need to be started every turn. Tasks are sent to the pool with only small arguments (e.g. the
+    names of SharedArrays) and return only small results.
+
+    Attributes:
+    pool -- the multiprocessing.Pool shared by this process, or None if it has not been created yet
+    attached_arrays -- the SharedArrays a worker process has attached to, stored against their (name, length, typecode)
+    worker_algorithms -- the algorithms a worker process has created, stored against (class, code_length, num_of_colours)
+    start_time -- the seconds this process has spent starting worker processes
+    wait_time -- the seconds this process has spent waiting for the tasks it sent to finish (see map)
+    """
+
+    # work is split into this many chunks per process, which idle workers pick up as they finish their previous chunk,
+    # so a worker whose chunks are quick to score does not wait for a worker whose chunks are slow
+    CHUNKS_PER_PROCESS = 4
+
+    pool = None
+    attached_arrays = {}
+    worker_algorithms = {}
+    start_time = 0
+    wait_time = 0
+
+    @classmethod
+    def get_pool(cls, num_of_processes: int) -> 'multiprocessing.pool.Pool':
+        """Return the pool of worker processes, starting it if it has not been started yet
+
+        Parameters:
+        num_of_processes -- the number of worker processes to start the pool with
+        """
+
+        if cls.pool is None:
+            start = time.perf_counter()
+            cls.pool = multiprocessing.Pool(num_of_processes)
+            cls.start_time += time.perf_counter() - start
+
+        return cls.pool
+
+    @classmethod
+    def map(cls, num_of_processes: int, function: Callable, tasks: list[tuple]) -> list:
+        """Perform function on every task in the pool, sending one task to a worker at a time, and return the results in order
+
+        Parameters:
+        num_of_processes -- the number of worker processes to start the pool with, if it has not been started yet
+        function -- a staticmethod which performs a task
+        tasks -- the tasks
+        """
+
+        pool = cls.get_pool(num_of_processes)
+
+        start = time.perf_counter()
+        results = pool.map(function, tasks, chunksize=1)
+        cls.wait_time += time.perf_counter() - start
+
+        return results
+
+    @classmethod
+    def get_chunks(cls, num_of_items: int, num_of_processes: int, min_chunk_size: int = 1) -> list[tuple[int, int]]:
+        """Return the [start, end) index range of every chunk that num_of_items should be split into
+
+        Parameters:
+        num_of_items -- the number of items to split
+        num_of_processes -- the number of processes which will work on the chunks
+        min_chunk_size -- the minimum number of items in each chunk (default: 1)
+        """
+
+        chunk_size = max(min_chunk_size, math.ceil(num_of_items / (num_of_processes * cls.CHUNKS_PER_PROCESS)))
+        return [(start, min(start + chunk_size, num_of_items)) for start in range(0, num_of_items, chunk_size)]
+
+    @classmethod
+    def close(cls) -> None:
+        """Stop every worker process in the pool, if it has been started"""
+
+        if cls.pool is not None:
+            cls.pool.close()
+            cls.pool.join()
+            cls.pool = None
+
+    @classmethod
+    def attach(cls, arrays: list[tuple[str, int, str]]) -> list[SharedArray]:
+        """Return the SharedArrays used by a task, attaching to any which this worker process has not attached to already.
+        Arrays are only used for a single turn, so any other previously attached arrays are closed.
+
+        Parameters:
+        arrays -- the (name, length, typecode) of each SharedArray
+        """
+
+        for key in list(cls.attached_arrays):
+            if key not in arrays:
+                cls.attached_arrays.pop(key).close()
+
+        for (name, length, typecode) in arrays:
+            if (name, length, typecode) not in cls.attached_arrays:
+                cls.attached_arrays[(name, length, typecode)] = SharedArray(length, typecode, name)
+
+        return [cls.attached_arrays[array] for array in arrays]
+
+    @classmethod
+    def get_worker_algorithm(cls, algorithm_class: type, code_length: int, num_of_colours: int) -> 'Algorithm':
+        """Return an instance of algorithm_class for the given parameters, which is created once per worker process.
+        Its answer code is a placeholder, so it should only be used to score codes.
+
+        Parameters:
+        algorithm_class -- the class of the algorithm
+        code_length -- the length of each code
+        num_of_colours -- the number of available colours
+        """
+
+        key = (algorithm_class, code_length, num_of_colours)
+        if key not in cls.worker_algorithms:
+            cls.worker_algorithms[key] = algorithm_class(tuple([0] * code_length), num_of_colours)
+
+        return cls.worker_algorithms[key]